@@ -1,4 +1,5 @@
-from codemash_mcp.server import server
-
 if __name__ == "__main__":
+    # imported here so worker processes that re-import this module don't build a server
+    from codemash_mcp.server import server
+
     server.run()
@@ -0,0 +1,101 @@
+"""Benchmark response compression: bytes on the wire and CPU per MCP tool call.
+
+Calls each tool over the streamable-http app (in process, through the same middleware
+as a deployed server) once per encoding, and reports the wire size and the time spent
+compressing. brotli and zstd are only measured when their packages are installed.
+
+    uv run --frozen python scripts/bench_compression.py --calls 20
+"""
+
+import argparse
+import os
+import statistics
+
+CALLS = [
+    ("sessions", {}),
+    ("sessions", {"include_descriptions": False}),
+    ("speakers", {}),
+    ("sessions", {"day_of_week": "THURSDAY", "track_name": "AI/ML"}),
+    ("event", {}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--data-file", default="data/endpoint-3.json")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["CODEMASH_DATA_FILE"] = args.data_file
+    os.environ["CODEMASH_COMPRESSION_MIN_BYTES"] = "1024"
+
+    from starlette.testclient import TestClient
+
+    from codemash_mcp.compression import available_encodings
+    from codemash_mcp.server import _init_mcp_server
+
+    runner = _init_mcp_server()
+    assert runner.metrics is not None
+    encodings = ["identity", *available_encodings()]
+    headers = {
+        "accept": "application/json, text/event-stream",
+        "content-type": "application/json",
+    }
+
+    def compress_ms() -> float:
+        return runner.metrics.collect()["compression"]["compress_ms"]  # pyright: ignore[reportOptionalMemberAccess]
+
+    with TestClient(runner.host()) as client:
+        response = client.post(
+            "/mcp",
+            headers=headers,
+            json={
+                "jsonrpc": "2.0",
+                "id": 0,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-06-18",
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench", "version": "0"},
+                },
+            },
+        )
+        headers["mcp-session-id"] = response.headers["mcp-session-id"]
+        client.post(
+            "/mcp",
+            headers=headers,
+            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+        )
+
+        print(f"{'call':<44}{'encoding':<10}{'wire KB':>10}{'ratio':>8}{'cpu ms':>9}")
+        for tool, arguments in CALLS:
+            label = f"{tool}({', '.join(f'{k}={v!r}' for k, v in arguments.items())})"
+            identity_bytes = 0
+            for encoding in encodings:
+                sizes, times = [], []
+                for i in range(args.calls):
+                    before = compress_ms()
+                    with client.stream(
+                        "POST",
+                        "/mcp",
+                        headers={**headers, "accept-encoding": encoding},
+                        json={
+                            "jsonrpc": "2.0",
+                            "id": i + 1,
+                            "method": "tools/call",
+                            "params": {"name": tool, "arguments": arguments},
+                        },
+                    ) as response:
+                        sizes.append(sum(len(chunk) for chunk in response.iter_raw()))
+                    times.append(compress_ms() - before)
+                size = statistics.median(sizes)
+                identity_bytes = identity_bytes or size
+                print(
+                    f"{label[:43]:<44}{encoding:<10}{size / 1024:>10.1f}"
+                    f"{identity_bytes / size:>8.2f}{statistics.median(times):>9.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
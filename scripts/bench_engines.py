@@ -0,0 +1,74 @@
+"""Benchmark the sessions query backends on synthetic exports of increasing size.
+
+For each size, reports the first call, which builds the backend's index, and the median
+time of a few typical sessions() calls. The columnar backend is only measured when
+numpy is installed.
+
+    uv run --frozen python scripts/bench_engines.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from synthetic import synthesize
+
+from codemash_mcp import columnar
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.snapshot import Snapshot
+
+QUERIES = [
+    ("Thursday AI/ML", {"day_of_week": "THURSDAY", "track_name": "AI/ML"}),
+    (
+        "Salon A 0900-1200",
+        {"room_name": "Salon A", "start_time_range": "0900", "end_time_range": "1200"},
+    ),
+    ("speaker 'an'", {"speaker_name": "an"}),
+    ("60 minutes", {"duration": 60}),
+]
+
+
+def timed(reader: CodeMashDataReader, filters: dict, calls: int) -> float:
+    """The median milliseconds of a compact sessions() call with `filters`."""
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        reader.sessions(include_descriptions=False, **filters)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--data-file", default="data/endpoint-3.json")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.data_file).read_text())
+    backends = ["python", "sqlite", *(["columnar"] if columnar.available() else [])]
+    print(
+        f"{'sessions':>9}  {'backend':<9}{'first ms':>10}  "
+        + "".join(f"{label:>20}" for label, _ in QUERIES)
+    )
+    for size in args.sizes:
+        data = synthesize(base, size)
+        for backend in backends:
+            snapshot = Snapshot(data)
+            snapshot.build_indexes()
+            reader = CodeMashDataReader(Path(args.data_file), snapshot, backend=backend)
+            # the first call also builds the backend's index
+            build = timed(reader, {"day_of_week": "MONDAY"}, 1)
+            results = [timed(reader, filters, args.calls) for _, filters in QUERIES]
+            print(
+                f"{size:>9}  {backend:<9}{build:>10.1f}  "
+                + "".join(f"{ms:>17.2f} ms" for ms in results)
+            )
+
+
+if __name__ == "__main__":
+    main()
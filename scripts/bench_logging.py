@@ -0,0 +1,86 @@
+"""Benchmark MCP tool call latency under each logging configuration.
+
+Each configuration runs in its own interpreter, because logging is configured once
+per process. Logs are written to a temporary file so the I/O cost is real but the
+terminal is not flooded.
+
+    uv run --frozen python scripts/bench_logging.py --calls 300 --tool event
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+CONFIGS = [
+    ("sync", "DEBUG"),
+    ("sync", "INFO"),
+    ("queue", "DEBUG"),
+    ("queue", "INFO"),
+]
+
+WORKER = """
+import asyncio, statistics, sys, time
+from fastmcp import Client
+from codemash_mcp.server import _init_mcp_server
+
+calls, tool = int(sys.argv[1]), sys.argv[2]
+args = {"track_name": "AI"} if tool == "sessions" else {}
+server = _init_mcp_server()
+
+async def main():
+    async with Client(server.test()) as client:
+        for _ in range(20):
+            await client.call_tool(tool, args)
+        timings = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await client.call_tool(tool, args)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{p50:.3f} {p95:.3f}")
+
+asyncio.run(main())
+"""
+
+
+def run(
+    pipeline: str, level: str, calls: int, tool: str, data_file: str
+) -> tuple[float, float]:
+    with tempfile.TemporaryFile() as log_file:
+        env = {
+            **os.environ,
+            "LOG_PIPELINE": pipeline,
+            "LOG_LEVEL": level,
+            "CODEMASH_DATA_FILE": data_file,
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", WORKER, str(calls), tool],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=log_file,
+            check=True,
+            text=True,
+        )
+    p50, p95 = result.stdout.split()[-2:]
+    return float(p50), float(p95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--tool", default="event", choices=["event", "sessions"])
+    parser.add_argument("--data-file", default="data/endpoint-3.json")
+    args = parser.parse_args()
+
+    print(f"{'pipeline':<10}{'level':<8}{'p50 ms':>10}{'p95 ms':>10}")
+    for pipeline, level in CONFIGS:
+        p50, p95 = run(pipeline, level, args.calls, args.tool, args.data_file)
+        print(f"{pipeline:<10}{level:<8}{p50:>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark applying a small data drop incrementally against rebuilding every index.
+
+For each size, a synthetic export is loaded and warmed up the way a serving reader is,
+and then the "small delta" drop from `synthetic.py` is applied both ways:
+
+- full: the new snapshot's lookups, groups and derived structures (facets, timelines,
+  name indexes, the change log's records and, for sqlite, the database) are built
+  from scratch
+- incremental: the same, after `Snapshot.carry_over` takes over the old snapshot's
+  indexes and applies the delta to them
+
+Parsing the file is the same for both and reported on its own. "extra MB" is the memory
+the new snapshot holds that isn't shared with the old one, while both are alive.
+
+    uv run --frozen python scripts/bench_reload.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import small_delta, synthesize
+
+from codemash_mcp.changes import records_of
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.facets import facets_of
+from codemash_mcp.memory import deep_size, warm_up_reader
+from codemash_mcp.names import resolve_room, resolve_track
+from codemash_mcp.server import WARM_UP_ARGUMENTS
+from codemash_mcp.snapshot import Snapshot, load_snapshot, validate_snapshot
+from codemash_mcp.sqlite_engine import sqlite_of
+from codemash_mcp.timeline import timelines_of
+
+
+def build_derived(reader: CodeMashDataReader):
+    """Build what the tools build on first use, or get it if it's been carried over."""
+    data = reader.data
+    data.build_indexes()
+    facets_of(data)
+    timelines_of(data)
+    resolve_room(data, "salon a")
+    resolve_track(data, "ai")
+    records_of(data)
+    if reader.backend == "sqlite":
+        sqlite_of(data)
+
+
+def apply(previous: Snapshot, path: Path, backend: str, incremental: bool):
+    """Milliseconds to parse and to index the new drop, and the new snapshot."""
+    start = time.perf_counter()
+    snapshot = load_snapshot(path)
+    parsed = time.perf_counter()
+    validate_snapshot(snapshot)
+    if incremental:
+        snapshot.carry_over(previous)
+    build_derived(CodeMashDataReader(path, snapshot, backend=backend))
+    done = time.perf_counter()
+    return (parsed - start) * 1000, (done - parsed) * 1000, snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", default=["python", "sqlite"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--data-file", default="data/endpoint-3.json")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.data_file).read_text())
+    print(
+        f"{'sessions':>9}  {'backend':<8}{'parse ms':>10}{'full ms':>10}"
+        f"{'incr ms':>10}{'speedup':>9}{'full extra MB':>15}{'incr extra MB':>15}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            data = synthesize(base, size)
+            first, second = Path(directory, "first.json"), Path(directory, "next.json")
+            first.write_text(json.dumps(data))
+            second.write_text(json.dumps(small_delta(data)))
+            for backend in args.backends:
+                reader = CodeMashDataReader(first, backend=backend)
+                warm_up_reader(reader, WARM_UP_ARGUMENTS)
+                build_derived(reader)
+                previous = reader.data
+                seen: set[int] = set()
+                deep_size(previous, seen)
+
+                results = {}
+                for incremental in [False, True]:
+                    runs = [
+                        apply(previous, second, backend, incremental)
+                        for _ in range(args.runs)
+                    ]
+                    extra = deep_size(runs[-1][2], set(seen)) / 1024 / 1024
+                    results[incremental] = (
+                        statistics.median(parse for parse, _, _ in runs),
+                        statistics.median(index for _, index, _ in runs),
+                        extra,
+                    )
+                parse = statistics.median([results[False][0], results[True][0]])
+                full, incremental = results[False][1], results[True][1]
+                print(
+                    f"{size:>9}  {backend:<8}{parse:>10.1f}{full:>10.1f}"
+                    f"{incremental:>10.1f}{full / incremental:>8.1f}x"
+                    f"{results[False][2]:>15.1f}{results[True][2]:>15.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark serializing sessions() and speakers() results, before and after ToolOutputs.
+
+Each call goes through the SDK's tools/call handler, which runs the tool, serializes the
+result through FastMCP and validates it. "before" is FastMCP's default path, where the
+SDK checks the result against the output schema with jsonschema. "after" adds the
+ToolOutputs middleware and `encode` serializer, as the server does. The tool's own time
+is reported separately; the rest is serialization and validation.
+
+    uv run --frozen python scripts/bench_serialization.py --data-file data/endpoint-3.json
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from fastmcp import FastMCP
+from mcp import types
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.serialization import ToolOutputs, encode, encoder
+from codemash_mcp.server import PREBUILT_OUTPUTS
+from codemash_mcp.snapshot import load_snapshot
+
+CALLS = [
+    ("sessions", {}),
+    ("sessions", {"include_descriptions": False}),
+    ("sessions", {"day_of_week": "THURSDAY"}),
+    ("speakers", {}),
+    ("speakers", {"include_descriptions": False}),
+]
+
+
+def build(reader: CodeMashDataReader, fast: bool):
+    mcp = FastMCP("bench", tool_serializer=encode if fast else None)
+    tools = [mcp.tool(reader.sessions), mcp.tool(reader.speakers)]
+    if fast:
+        mcp.add_middleware(
+            ToolOutputs(tools, PREBUILT_OUTPUTS, version=lambda: reader.data.version)
+        )
+    return mcp._mcp_server.request_handlers[types.CallToolRequest]
+
+
+async def timed(handler, name: str, arguments: dict, calls: int) -> float:
+    """The median milliseconds of the tools/call handler, result encoded as sent."""
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=name, arguments=arguments),
+    )
+    times = []
+    for _ in range(calls + 1):
+        start = time.perf_counter()
+        result = await handler(request)
+        result.model_dump_json(by_alias=True, exclude_none=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times[1:]) * 1000
+
+
+def tool_ms(reader: CodeMashDataReader, name: str, arguments: dict, calls: int):
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        getattr(reader, name)(**arguments)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-file", type=Path, default=Path("data/endpoint-3.json"))
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    reader = CodeMashDataReader(args.data_file, load_snapshot(args.data_file))
+    before, after = build(reader, fast=False), build(reader, fast=True)
+    print(f"encoder: {encoder()}")
+    print(
+        f"{'call':<42}{'results':>8}{'tool ms':>9}{'before ms':>11}{'after ms':>10}"
+        f"{'speedup':>9}"
+    )
+    for name, arguments in CALLS:
+        results = len(getattr(reader, name)(**arguments))
+        slow = await timed(before, name, arguments, args.calls)
+        fast = await timed(after, name, arguments, args.calls)
+        label = f"{name}({', '.join(f'{k}={v!r}' for k, v in arguments.items())})"
+        print(
+            f"{label:<42}{results:>8}{tool_ms(reader, name, arguments, args.calls):>9.2f}"
+            f"{slow:>11.2f}{fast:>10.2f}{slow / fast:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""Drive a running server with many short-lived MCP clients and watch its footprint.
+
+Each client initializes a session, makes a few tool calls and, unless it's one of the
+`--abandon` fraction, closes its session. Every `--report` seconds the harness prints
+the server's session table from /metrics, and its resident memory if `--pid` is given.
+For a soak test, run it for hours against a server started with a short idle timeout:
+
+    CODEMASH_SESSION_IDLE_TIMEOUT=60 CODEMASH_RATE_LIMIT_PER_SECOND=0 \\
+        uvicorn --factory codemash_mcp:server.host &
+    uv run --frozen python scripts/load_harness.py --pid $! --duration 86400
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from pathlib import Path
+
+import httpx
+
+HEADERS = {
+    "accept": "application/json, text/event-stream",
+    "content-type": "application/json",
+}
+CALLS = [
+    ("venue", {}),
+    ("sessions", {"day_of_week": "THURSDAY", "track_name": "AI/ML"}),
+    ("speakers", {"speaker_name": "an", "include_descriptions": False}),
+    ("now_and_next", {"at": "2026-01-15T10:30"}),
+]
+
+
+def rss_mb(pid: int) -> float | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+async def client_session(http: httpx.AsyncClient, calls: int, abandon: bool):
+    response = await http.post(
+        "/mcp",
+        headers=HEADERS,
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "load-harness", "version": "0"},
+            },
+        },
+    )
+    headers = {**HEADERS, "mcp-session-id": response.headers["mcp-session-id"]}
+    await http.post(
+        "/mcp",
+        headers=headers,
+        json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+    )
+    for i in range(calls):
+        name, arguments = random.choice(CALLS)
+        await http.post(
+            "/mcp",
+            headers=headers,
+            json={
+                "jsonrpc": "2.0",
+                "id": i + 1,
+                "method": "tools/call",
+                "params": {"name": name, "arguments": arguments},
+            },
+        )
+    if not abandon:
+        await http.delete("/mcp", headers=headers)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=300, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=3, help="tool calls per client")
+    parser.add_argument("--abandon", type=float, default=0.5)
+    parser.add_argument("--report", type=float, default=10, help="seconds")
+    parser.add_argument("--pid", type=int, help="the server's pid, to report its RSS")
+    args = parser.parse_args()
+
+    clients = errors = 0
+    deadline = time.monotonic() + args.duration
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as http:
+
+        async def worker():
+            nonlocal clients, errors
+            while time.monotonic() < deadline:
+                try:
+                    await client_session(
+                        http, args.calls, random.random() < args.abandon
+                    )
+                    clients += 1
+                except (httpx.HTTPError, KeyError):
+                    errors += 1
+
+        async def reporter():
+            start = time.monotonic()
+            print(
+                f"{'seconds':>8}{'clients':>10}{'errors':>8}{'sessions':>10}{'rss MB':>9}"
+            )
+            while time.monotonic() < deadline:
+                await asyncio.sleep(args.report)
+                sessions = (await http.get("/metrics")).json().get("sessions", {})
+                rss = rss_mb(args.pid) if args.pid else None
+                print(
+                    f"{time.monotonic() - start:>8.0f}{clients:>10}{errors:>8}"
+                    f"{sessions.get('active', '-'):>10}"
+                    f"{f'{rss:.1f}' if rss is not None else '-':>9}",
+                    flush=True,
+                )
+
+        await asyncio.gather(reporter(), *(worker() for _ in range(args.concurrency)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""Generate a synthetic CodeMash export with many more sessions than a real one.
+
+Sessions are copies of a real export's, with new ids and the same days, tracks, rooms,
+times and speakers, so every filter selects about the same share of them as it would
+of the real data.
+
+    uv run --frozen python scripts/synthetic.py --sessions 100000 -o /tmp/synthetic.json
+
+`--small-delta` also writes the next data drop after that one, with a few sessions
+retitled, moved, cancelled and added, and a speaker's profile edited:
+
+    uv run --frozen python scripts/synthetic.py -o /tmp/synthetic.json \
+        --small-delta /tmp/synthetic-delta.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def synthesize(base: dict, sessions: int) -> dict:
+    """A copy of `base` with `sessions` sessions, and their translations and speakers."""
+    originals = base["sessions"]
+    translations = {t["session"]: t for t in base.get("sessionTranslations", [])}
+    session_speakers: dict[str, list[dict]] = {}
+    for item in base.get("sessionSpeakers", []):
+        session_speakers.setdefault(item["session"], []).append(item)
+
+    data = dict(base)
+    data["sessions"], data["sessionTranslations"], data["sessionSpeakers"] = [], [], []
+    for i in range(sessions):
+        original = originals[i % len(originals)]
+        copy = i // len(originals)
+        session_id = original["id"] if copy == 0 else f"{original['id']}-{copy}"
+        data["sessions"].append({**original, "id": session_id})
+        if original["id"] in translations:
+            translation = translations[original["id"]]
+            data["sessionTranslations"].append(
+                {
+                    **translation,
+                    "id": _copy_id(translation, copy),
+                    "session": session_id,
+                }
+            )
+        for item in session_speakers.get(original["id"], []):
+            data["sessionSpeakers"].append(
+                {**item, "id": _copy_id(item, copy), "session": session_id}
+            )
+    return data
+
+
+def _copy_id(item: dict, copy: int) -> str:
+    return item["id"] if copy == 0 else f"{item['id']}-{copy}"
+
+
+def small_delta(data: dict, changes: int = 10) -> dict:
+    """The next data drop after `data`, as organizers publish during an event.
+
+    `changes` sessions each are retitled, moved to another time, cancelled and added
+    (after the session they copy), and one speaker's profile is edited. The changes
+    are spread evenly over the sessions. Collections that don't change are shared with
+    `data`.
+    """
+    sessions = data["sessions"]
+    step = max(len(sessions) // (changes * 4), 1)
+    picked = [sessions[i]["id"] for i in range(0, len(sessions), step)]
+    retitled = set(picked[0::4][:changes])
+    moved = set(picked[1::4][:changes])
+    cancelled = set(picked[2::4][:changes])
+    copied = set(picked[3::4][:changes])
+
+    new = dict(data)
+    new["sessions"] = []
+    for session in sessions:
+        if session["id"] in cancelled:
+            continue
+        if session["id"] in moved:
+            session = {
+                **session,
+                "startTime": "1630" if session.get("startTime") != "1630" else "0800",
+            }
+        new["sessions"].append(session)
+        if session["id"] in copied:
+            new["sessions"].append({**session, "id": f"{session['id']}-added"})
+
+    new["sessionTranslations"] = []
+    for translation in data["sessionTranslations"]:
+        session = translation["session"]
+        if session in cancelled:
+            continue
+        if session in retitled:
+            translation = {**translation, "title": f"{translation['title']} (updated)"}
+        new["sessionTranslations"].append(translation)
+        if session in copied:
+            new["sessionTranslations"].append(
+                {
+                    **translation,
+                    "id": f"{translation['id']}-added",
+                    "session": f"{session}-added",
+                }
+            )
+
+    new["sessionSpeakers"] = []
+    for item in data["sessionSpeakers"]:
+        session = item["session"]
+        if session in cancelled:
+            continue
+        new["sessionSpeakers"].append(item)
+        if session in copied:
+            new["sessionSpeakers"].append(
+                {**item, "id": f"{item['id']}-added", "session": f"{session}-added"}
+            )
+
+    new["userProfiles"] = list(data["userProfiles"])
+    if new["userProfiles"]:
+        profile = new["userProfiles"][0]
+        new["userProfiles"][0] = {
+            **profile,
+            "company": f"{profile.get('company')} (new)",
+        }
+    return new
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--data-file", default="data/endpoint-3.json")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--small-delta", metavar="OUTPUT")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.data_file).read_text())
+    data = synthesize(base, args.sessions)
+    Path(args.output).write_text(json.dumps(data))
+    if args.small_delta:
+        Path(args.small_delta).write_text(json.dumps(small_delta(data)))
+
+
+if __name__ == "__main__":
+    main()
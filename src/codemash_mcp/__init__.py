@@ -1 +1,8 @@
-from codemash_mcp.server import server as server
+def __getattr__(name: str):
+    # the server is built on first access, so importing the package stays cheap
+    if name == "server":
+        from codemash_mcp.server import server
+
+        globals()["server"] = server
+        return server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
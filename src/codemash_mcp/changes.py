@@ -0,0 +1,258 @@
+import logging
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, Literal, NamedTuple
+
+from codemash_mcp.delta import SnapshotDelta
+from codemash_mcp.helpers import (
+    SPEAKER_INPUTS,
+    event_id_of,
+    is_codemash_event,
+    map_to_session,
+    map_to_speaker,
+    sessions_linked_to,
+    speakers_changed_in,
+)
+from codemash_mcp.snapshot import Snapshot, find_items
+from codemash_mcp.types import Session, Speaker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50
+KINDS = ("sessions", "speakers")
+# The collections records are mapped from. Changes to the ones in REMAPPED_BY reach
+# most records, so they're all mapped again.
+RECORD_INPUTS = [
+    "events",
+    "sessions",
+    "sessionTranslations",
+    "trackTranslations",
+    "sessionVenueTranslations",
+    *SPEAKER_INPUTS,
+]
+REMAPPED_BY = ["events", "trackTranslations", "sessionVenueTranslations"]
+
+Change = Literal["added", "modified", "removed"]
+# A session or speaker as the tools return it
+Record = Session | Speaker
+# kind to item id to record
+Records = dict[str, dict[str, Record]]
+
+
+class ChangeSet(NamedTuple):
+    """What one reload changed, with the new records of added and modified items."""
+
+    previous: str
+    version: str
+    at: datetime
+    # kind to item id to (change, record), the record is None when removed
+    items: dict[str, dict[str, tuple[Change, Record | None]]]
+
+
+def records_of(data: Snapshot) -> Records:
+    """Every session and event speaker as the tools return them, by id.
+
+    The records are kept with the snapshot, and a reload maps again only those its
+    changes reach.
+    """
+    if isinstance(data, Snapshot):
+        return data.derived(
+            "records", _map_records, inputs=RECORD_INPUTS, update=_update_records
+        )
+    return _map_records(data)
+
+
+def _map_records(data: Snapshot) -> Records:
+    event_id = event_id_of(data)
+    records: Records = {kind: {} for kind in KINDS}
+    for session in data.get("sessions", []):
+        records["sessions"].setdefault(session["id"], map_to_session(data, session))
+    for speaker in data.get("speakers", []):
+        if is_codemash_event(speaker, event_id=event_id):
+            records["speakers"].setdefault(speaker["id"], map_to_speaker(data, speaker))
+    return records
+
+
+def _update_records(
+    records: Records, data: Snapshot, delta: SnapshotDelta
+) -> Records | None:
+    if any(name in delta for name in REMAPPED_BY) or any(
+        name in delta and delta[name] is None for name in RECORD_INPUTS
+    ):
+        return None
+    # sessions embed their translation and speakers, and speakers their sessions
+    sessions = sessions_linked_to(data, delta)
+    for name, key in [("sessions", "id"), ("sessionTranslations", "session")]:
+        if (changes := delta.get(name)) is not None:
+            sessions |= changes.keys(key)
+    speakers = speakers_changed_in(data, delta)
+    if (changes := delta.get("sessionSpeakers")) is not None:
+        speakers |= changes.keys("speaker")
+    for session_id in sessions:
+        for item in find_items(data, "sessionSpeakers", "session", session_id):
+            speakers.add(item.get("speaker"))
+
+    event_id = event_id_of(data)
+    updated: Records = {kind: dict(records[kind]) for kind in KINDS}
+    for session_id in sessions:
+        session = data.lookup("sessions").get(session_id)
+        if session is None:
+            updated["sessions"].pop(session_id, None)
+        else:
+            updated["sessions"][session_id] = map_to_session(data, session)
+    for speaker_id in speakers:
+        speaker = data.lookup("speakers").get(speaker_id)
+        if speaker is None or not is_codemash_event(speaker, event_id=event_id):
+            updated["speakers"].pop(speaker_id, None)
+        else:
+            updated["speakers"][speaker_id] = map_to_speaker(data, speaker)
+    return updated
+
+
+def diff_records(
+    old: dict[str, Record], new: dict[str, Record]
+) -> dict[str, tuple[Change, Record | None]]:
+    """The items added, removed or returned differently, comparing mapped records.
+
+    Comparing what the tools return, rather than the export's rows, means a change to
+    anything a record includes (i.e. a speaker's name in their sessions, or a room's
+    name) marks it as modified, and changes clients can't see don't.
+    """
+    changes: dict[str, tuple[Change, Record | None]] = {}
+    for item_id, record in new.items():
+        if item_id not in old:
+            changes[item_id] = ("added", record)
+        elif old[item_id] is not record and old[item_id] != record:
+            changes[item_id] = ("modified", record)
+    for item_id in old.keys() - new.keys():
+        changes[item_id] = ("removed", None)
+    return changes
+
+
+class ChangeLog:
+    """The sessions and speakers each reload changed, for the last `max_entries` reloads.
+
+    Clients ask for the changes since a snapshot version they've seen, or since a time.
+    Changes over several reloads are merged, so an item added and then modified is
+    reported once, as added, with its current record. A version or time older than the
+    log remembers can't be answered with a delta, and the client must refetch.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: list[ChangeSet] = []
+        # the oldest version, and time, the log has every change since
+        self._base_version = version
+        self._base_time = clock()
+
+    def _current(self) -> str:
+        return self._entries[-1].version if self._entries else self._base_version
+
+    @property
+    def version(self) -> str:
+        with self._lock:
+            return self._current()
+
+    def record(self, old: Snapshot, new: Snapshot) -> ChangeSet | None:
+        """Diff two snapshots and log the changes, as a reload from `old` to `new`."""
+        if new.version == self.version:
+            return None
+        try:
+            before, after = records_of(old), records_of(new)
+            items = {kind: diff_records(before[kind], after[kind]) for kind in KINDS}
+        except Exception:
+            # without this reload's changes no delta across it is right, start over
+            logger.exception("Diffing snapshots failed, clients will refetch")
+            self.reset(new.version)
+            return None
+        entry = ChangeSet(old.version, new.version, self._clock(), items)
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) > self.max_entries:
+                dropped = self._entries.pop(0)
+                self._base_version, self._base_time = dropped.version, dropped.at
+        counts = {kind: len(changes) for kind, changes in items.items() if len(changes)}
+        logger.info(f"Snapshot {old.version} -> {new.version} changed {counts}")
+        return entry
+
+    def reset(self, version: str):
+        with self._lock:
+            self._entries.clear()
+            self._base_version = version
+            self._base_time = self._clock()
+
+    def _entries_since(self, since: str) -> list[ChangeSet] | None:
+        if since == self._base_version:
+            return list(self._entries)
+        for i, entry in enumerate(self._entries):
+            if entry.version == since:
+                return self._entries[i + 1 :]
+        try:
+            at = datetime.fromisoformat(since)
+        except ValueError:
+            return None
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=UTC)
+        if at < self._base_time:
+            return None
+        return [entry for entry in self._entries if entry.at > at]
+
+    def since(self, since: str) -> tuple[str, dict[str, dict[str, tuple]] | None]:
+        """The current version, and each item changed since `since`, merged.
+
+        `since` is a snapshot version or an ISO 8601 time. The changes are None when the
+        log doesn't go back that far, or doesn't know the version.
+        """
+        with self._lock:
+            version = self._current()
+            entries = self._entries_since(since)
+        if entries is None:
+            return version, None
+
+        merged: dict[str, dict[str, tuple]] = {kind: {} for kind in KINDS}
+        for entry in entries:
+            for kind, changes in entry.items.items():
+                for item_id, (change, record) in changes.items():
+                    first = merged[kind].get(item_id, (change,))[0]
+                    merged[kind][item_id] = (first, change, record)
+        return version, {
+            kind: {
+                item_id: (net, record)
+                for item_id, (first, last, record) in items.items()
+                if (net := _net_change(first, last)) is not None
+            }
+            for kind, items in merged.items()
+        }
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._current(),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "oldest_version": self._base_version,
+                "oldest_time": self._base_time.isoformat(),
+            }
+
+
+def _net_change(first: Change, last: Change) -> Change | None:
+    """The change over several reloads, from an item's first and last change."""
+    existed = first != "added"
+    exists = last != "removed"
+    if existed and exists:
+        return "modified"
+    if exists:
+        return "added"
+    if existed:
+        return "removed"
+    return None
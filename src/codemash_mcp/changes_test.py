@@ -0,0 +1,181 @@
+import shutil
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Dict, cast
+
+import pytest
+
+from codemash_mcp.changes import ChangeLog, diff_records
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.snapshot import Snapshot
+
+DATA_DIRECTORY = Path(__file__).parents[2] / "data"
+START = datetime(2026, 1, 13, 8, 0, tzinfo=UTC)
+
+
+class Clock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _snapshot(version: str, sessions: dict[str, str]) -> Snapshot:
+    return Snapshot(
+        {
+            "sessions": [
+                {"id": sid, "title": title} for sid, title in sessions.items()
+            ],
+            "sessionTranslations": [
+                {"session": sid, "title": title} for sid, title in sessions.items()
+            ],
+        },
+        version=version,
+    )
+
+
+def _titles(changes: dict) -> dict:
+    return {
+        sid: (change, record and record["title"])
+        for sid, (change, record) in changes["sessions"].items()
+    }
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def log(clock):
+    return ChangeLog("v1", max_entries=3, clock=clock)
+
+
+def test_diff_records():
+    changes = diff_records(
+        {"a": {"title": "A"}, "b": {"title": "B"}, "c": {"title": "C"}},
+        {"a": {"title": "A"}, "b": {"title": "B2"}, "d": {"title": "D"}},
+    )
+    assert changes == {
+        "b": ("modified", {"title": "B2"}),
+        "c": ("removed", None),
+        "d": ("added", {"title": "D"}),
+    }
+
+
+def test_since_the_current_version_is_empty(log):
+    assert log.since("v1") == ("v1", {"sessions": {}, "speakers": {}})
+
+
+def test_since_a_version(log):
+    log.record(_snapshot("v1", {"a": "A", "b": "B"}), _snapshot("v2", {"a": "A2"}))
+
+    version, changes = log.since("v1")
+    assert version == "v2"
+    assert _titles(changes) == {"a": ("modified", "A2"), "b": ("removed", None)}
+
+
+def test_changes_are_merged_across_reloads(log):
+    v1 = _snapshot("v1", {"a": "A", "b": "B"})
+    v2 = _snapshot("v2", {"a": "A", "c": "C", "d": "D"})
+    v3 = _snapshot("v3", {"a": "A3", "b": "B", "c": "C3"})
+    log.record(v1, v2)
+    log.record(v2, v3)
+
+    _, changes = log.since("v1")
+    assert _titles(changes) == {
+        # modified
+        "a": ("modified", "A3"),
+        # removed, then added back
+        "b": ("modified", "B"),
+        # added, then modified
+        "c": ("added", "C3"),
+        # "d" was added, then removed
+    }
+    _, changes = log.since("v2")
+    assert _titles(changes) == {
+        "a": ("modified", "A3"),
+        "b": ("added", "B"),
+        "c": ("modified", "C3"),
+        "d": ("removed", None),
+    }
+
+
+def test_since_a_time(log, clock):
+    clock.now = START + timedelta(hours=1)
+    log.record(_snapshot("v1", {"a": "A"}), _snapshot("v2", {"a": "A2"}))
+    clock.now = START + timedelta(hours=2)
+    log.record(_snapshot("v2", {"a": "A2"}), _snapshot("v3", {"a": "A2", "b": "B"}))
+
+    _, changes = log.since("2026-01-13T09:30:00+00:00")
+    assert _titles(changes) == {"b": ("added", "B")}
+    # a time without a zone is UTC
+    _, changes = log.since("2026-01-13T08:30:00")
+    assert _titles(changes) == {"a": ("modified", "A2"), "b": ("added", "B")}
+
+
+def test_unknown_versions_and_old_times_need_a_refresh(log):
+    assert log.since("v0") == ("v1", None)
+    assert log.since("2026-01-13T07:00:00Z") == ("v1", None)
+
+
+def test_the_log_is_bounded(log, clock):
+    for i in range(1, 5):
+        clock.now = START + timedelta(hours=i)
+        log.record(
+            _snapshot(f"v{i}", {"a": f"A{i}"}),
+            _snapshot(f"v{i + 1}", {"a": f"A{i + 1}"}),
+        )
+
+    stats = log.stats()
+    assert stats["entries"] == 3
+    assert stats["oldest_version"] == "v2"
+    assert log.since("v1") == ("v5", None)
+    assert _titles(log.since("v2")[1]) == {"a": ("modified", "A5")}
+
+
+def test_the_same_version_is_not_recorded(log):
+    assert log.record(_snapshot("v1", {}), _snapshot("v1", {})) is None
+    assert log.stats()["entries"] == 0
+
+
+def test_failed_diff_resets_the_log(log):
+    log.record(_snapshot("v1", {"a": "A"}), _snapshot("v2", {"a": "A2"}))
+    broken = Snapshot({"sessions": [{"title": "no id"}]}, version="v3")
+
+    assert log.record(_snapshot("v2", {"a": "A2"}), broken) is None
+    assert log.stats()["oldest_version"] == "v3"
+    assert log.since("v1") == ("v3", None)
+
+
+def test_reader_reports_changes_between_exports(tmp_path):
+    data_file = tmp_path / "data.json"
+    shutil.copy(DATA_DIRECTORY / "endpoint-1.json", data_file)
+    reader = CodeMashDataReader(data_file)
+    first = reader.data.version
+
+    shutil.copy(DATA_DIRECTORY / "endpoint-3.json", data_file)
+    reader.reload()
+    changes = cast(Dict, reader.changes_since(first))
+
+    assert changes["version"] == reader.data.version
+    assert not changes["full_refresh"]
+    sessions, speakers = changes["sessions"], changes["speakers"]
+    assert len(sessions["added"]) == 8
+    assert len(speakers["added"]) == 13
+    added = {session["id"] for session in sessions["added"]}
+    assert added <= {session.get("id") for session in reader.sessions()}
+    assert not added & {session["id"] for session in sessions["modified"]}
+    assert reader.changes_since(changes["version"]).get("sessions") == {
+        "added": [],
+        "modified": [],
+        "removed": [],
+    }
+
+
+def test_reader_asks_for_a_refresh_when_it_cant_tell():
+    reader = CodeMashDataReader(DATA_DIRECTORY / "endpoint-1.json")
+    changes = reader.changes_since("unknown")
+    assert changes.get("full_refresh")
+    assert changes.get("version") == reader.data.version
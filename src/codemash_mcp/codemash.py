@@ -1,39 +1,204 @@
-import json
+import functools
+import logging
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Annotated, Literal
 from pydantic import Field
 
 from codemash_mcp.types import (
+    Changes,
     Event,
     Hotel,
     Speaker,
     Session,
     Track,
     Venue,
+    Sponsor,
+    ExpoBooth,
     ConferenceDay,
+    EventName,
+    ScheduleDay,
+    ScheduleSlot,
+    SimilarSession,
+    NowAndNext,
+    RoomNowAndNext,
+    SessionDuration,
+    SessionFacets,
 )
 from codemash_mcp.helpers import (
     map_to_session,
     map_to_speaker,
     find_matching_id,
+    session_in_event,
+    map_event,
+    map_hotels,
+    map_tracks,
+    map_rooms,
+    map_venue,
     is_codemash_event,
     filters,
     speaker_filters,
     sessions_validations,
+    event_id_of,
+    agenda_map_of,
 )
+from codemash_mcp.schedule import (
+    Interests,
+    alternates_for,
+    best_schedule,
+    parse_hhmm,
+    schedule_candidates,
+)
+from codemash_mcp import columnar
+from codemash_mcp.changes import DEFAULT_MAX_ENTRIES, ChangeLog
+from codemash_mcp.expo import booths_of, sponsors_of
+from codemash_mcp.facets import facets_of
+from codemash_mcp.names import resolve_room, resolve_track
+from codemash_mcp.progress import reported
+from codemash_mcp.shadow import ShadowComparator
+from codemash_mcp.similar import MAX_SIMILAR, similarity_of
+from codemash_mcp.sqlite_engine import sqlite_of
+from codemash_mcp.timeline import agenda_for_date, local_time, timelines_of
+from codemash_mcp.snapshot import (
+    EventSnapshots,
+    Snapshot,
+    load_snapshot,
+    validate_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_NAME = "codemash-2026"
+DEFAULT_EVENT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# How the sessions and speakers filters run: scanning the snapshot's dictionaries, as
+# one query against an in-memory SQLite copy of it, or (sessions only) as masks over
+# numpy columns
+QueryBackend = Literal["python", "sqlite", "columnar"]
+# The tools each backend answers, the rest always run on python
+BACKEND_TOOLS: dict[str, set[str]] = {
+    "sqlite": {"sessions", "speakers"},
+    "columnar": {"sessions"},
+}
 
 
 # STEP: 2 - Plain old Python code
 class CodeMashDataReader:
     """A class to read CodeMash data from JSON files."""
 
-    def __init__(self, data_directory: Path):
+    backend: QueryBackend = "python"
+
+    def __init__(
+        self,
+        data_directory: Path,
+        snapshot: Snapshot | None = None,
+        event_name: str = DEFAULT_EVENT_NAME,
+        event_files: dict[str, Path] | None = None,
+        event_memory_budget: int = DEFAULT_EVENT_MEMORY_BUDGET,
+        backend: QueryBackend | None = None,
+        shadow_sample_rate: float = 0,
+        change_log_size: int = DEFAULT_MAX_ENTRIES,
+    ):
         self.data_directory = data_directory
-        self.data = json.load(open(data_directory, "r"))
+        if backend is not None:
+            self.backend = backend
+        if self.backend == "columnar" and not columnar.available():
+            logger.warning("numpy isn't installed, using the python query backend")
+            self.backend = "python"
+        self.data = snapshot if snapshot is not None else load_snapshot(data_directory)
+        self.event_name = event_name
+        self.changes = ChangeLog(self.data.version, change_log_size)
+        self.other_events = EventSnapshots(event_files or {}, event_memory_budget)
+        # checks a sample of the backend's results against the python backend's
+        self.shadow = (
+            ShadowComparator(shadow_sample_rate, self.backend)
+            if shadow_sample_rate and self.backend != "python"
+            else None
+        )
+
+    def snapshot(self, event: str | None = None) -> Snapshot:
+        """The snapshot for `event`, loading it if it isn't already."""
+        if event is None or event == self.event_name:
+            return self.data
+        try:
+            return self.other_events.get(event)
+        except KeyError:
+            raise ValueError(
+                f"Unknown event '{event}'. Use one of: {', '.join(self.event_names())}"
+            ) from None
+
+    def reload(self) -> Snapshot:
+        """Load the data file again and swap it in, if it's valid.
+
+        The new snapshot is validated and indexed before it replaces the current one, so
+        calls in flight finish on the old snapshot and new calls never see a partial one.
+        Raises `SnapshotValidationError` and keeps the current snapshot if it's invalid.
+
+        Indexes are carried over from the current snapshot and updated for what changed,
+        rather than built again, and unchanged items are shared between the two.
+        """
+        snapshot = load_snapshot(self.data_directory)
+        validate_snapshot(snapshot)
+        start = time.perf_counter()
+        delta = snapshot.carry_over(self.data)
+        snapshot.build_indexes()
+        logger.info(
+            f"Carried indexes over to {snapshot.version} in "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms, "
+            f"{len(delta)} collections changed"
+        )
+        # logged before the swap, so a client that sees the new version in
+        # changes_since never gets the old data from the other tools
+        self.changes.record(self.data, snapshot)
+        self.data = snapshot
+        return snapshot
+
+    def _query(
+        self,
+        tool: str,
+        query: Callable[..., list],
+        data: Snapshot,
+        include_descriptions: bool,
+        **arguments,
+    ) -> list:
+        """Run `query` on the configured backend, shadowed by the python one if sampled.
+
+        The shadow run gets the same snapshot, so a reload in between can't cause a
+        false mismatch.
+        """
+        if (
+            self.shadow is None
+            or tool not in BACKEND_TOOLS.get(self.backend, set())
+            or not self.shadow.sampled()
+        ):
+            return query(self.backend, data, include_descriptions, **arguments)
+        start = time.perf_counter()
+        result = query(self.backend, data, include_descriptions, **arguments)
+        self.shadow.submit(
+            tool,
+            {**arguments, "include_descriptions": include_descriptions},
+            result,
+            time.perf_counter() - start,
+            functools.partial(query, "python", data, include_descriptions, **arguments),
+        )
+        return result
 
     # STEP: 3 - Annotated data & types
-    def event(self) -> Annotated[Event | None, "CodeMash 2026 event information"]:
-        """Retrieves information about the CodeMash 2026 event.
+    def event_names(
+        self,
+    ) -> Annotated[list[str], "Names of the events that can be queried"]:
+        """List the events this server has data for.
+
+        Tools return information about CodeMash 2026 by default. To ask about another event,
+        i.e. a previous year, pass one of these names as the `event` argument of a tool.
+        """
+        return [self.event_name, *sorted(self.other_events.files)]
+
+    def event(
+        self, event: EventName = None
+    ) -> Annotated[Event | None, "Information about the CodeMash event"]:
+        """Retrieves information about the CodeMash event.
 
         This is good information if the user is asking about the event itself. You should
         prefer this to fetching information directly from the conference website (it's the
@@ -41,92 +206,88 @@ class CodeMashDataReader:
 
         You may want to combine this information with the venue and hotels tool call as well.
         """
-        for event in self.data.get("events", []):
-            if not is_codemash_event(event, "id"):
-                continue
-
-            event_translation = find_matching_id(
-                self.data, "eventTranslations", event.get("id"), "event"
-            )
-            portal = find_matching_id(self.data, "portals", event.get("portal"))
-            socials = find_matching_id(
-                self.data, "eventSocialHandles", event.get("eventSocialHandle")
-            )
-            return Event(
-                {
-                    "name": event_translation.get("name", "Unknown"),
-                    "description": event_translation.get("description", ""),
-                    "summary": event_translation.get("summary", ""),
-                    "start_date": event.get("startDate", ""),
-                    "end_date": event.get("endDate", ""),
-                    "timezone": event.get("timezone", ""),
-                    "domain": portal.get("domain", ""),
-                    "twitter": socials.get("twitter", ""),
-                    "facebook": socials.get("facebook", ""),
-                    "linkedin": socials.get("linkedIn", ""),
-                    "youtube": socials.get("youtube", ""),
-                    "instagram": socials.get("instagram", ""),
-                    "website": socials.get("website", ""),
-                }
-            )
-        return None
+        return map_event(self.snapshot(event))
 
     def hotels(
         self,
-    ) -> Annotated[list[Hotel], "List of hotels for the CodeMash 2026 event."]:
-        """Fetch the list of hotels available for the CodeMash 2026 event.
+        event: EventName = None,
+    ) -> Annotated[list[Hotel], "List of hotels for the CodeMash event."]:
+        """Fetch the list of hotels available for the CodeMash event.
 
         This list does not include the Kalahari itself, which is also a viable hotel option.
 
         You may want to combine this information with the event and venue tool call as well.
         """
-        hotel_list = []
-        for hotel in self.data.get("hotels", []):
-            if not is_codemash_event(hotel):
-                continue
-
-            hotel_translation = find_matching_id(
-                self.data, "hotelTranslations", hotel.get("id"), "hotel"
-            )
-            hotel_list.append(
-                Hotel(
-                    {
-                        "name": hotel_translation.get("name", ""),
-                        "address": hotel_translation.get("address", ""),
-                        "website": hotel.get("websiteUrl", ""),
-                    }
-                )
-            )
-        return hotel_list
+        return map_hotels(self.snapshot(event))
 
     def speakers(
         self,
-        track_name: Annotated[str | None, "Filter speakers by track name"] = None,
+        track_name: Annotated[
+            str | None,
+            "Filter speakers by track name. Approximate names (i.e. 'machine learning' for 'AI/ML') are matched to the closest track, and a name that matches none is an error listing the tracks.",
+        ] = None,
         speaker_name: Annotated[
             str | None,
             "Filter speakers by speaker name. Name may be first, last, and may be partial (case-insensitive, contains).",
         ] = None,
-    ) -> Annotated[list[Speaker], "List of speakers for the CodeMash 2026 event"]:
-        """Fetch the list of speakers for the CodeMash 2026 event.
+        include_descriptions: Annotated[
+            bool,
+            "Include descriptions. Leave them out for a compact listing, then use get_speaker for the few you need in full.",
+        ] = True,
+        event: EventName = None,
+    ) -> Annotated[list[Speaker], "List of speakers for the CodeMash event"]:
+        """Fetch the list of speakers for the CodeMash event.
 
         Optionally filter by track name and/or speaker name.
         """
-        speaker_list = []
-        for speaker in self.data.get("speakers", []):
-            if not is_codemash_event(speaker):
-                continue
-            if not all(
-                f(self.data, speaker, track_name=track_name, speaker_name=speaker_name)
+        data = self.snapshot(event)
+        track_name = resolve_track(data, track_name)
+        return self._query(
+            "speakers",
+            self._speakers,
+            data,
+            include_descriptions,
+            track_name=track_name,
+            speaker_name=speaker_name,
+        )
+
+    def _speakers(
+        self,
+        backend: QueryBackend,
+        data: Snapshot,
+        include_descriptions: bool,
+        track_name: str | None,
+        speaker_name: str | None,
+    ) -> list[Speaker]:
+        if backend == "sqlite":
+            return [
+                map_to_speaker(data, speaker, include_descriptions)
+                for speaker in reported(
+                    sqlite_of(data).speakers(track_name, speaker_name)
+                )
+            ]
+        # a pipeline over the speakers, so the call reports how far it is as it goes
+        event_id = event_id_of(data)
+        return [
+            map_to_speaker(data, speaker, include_descriptions)
+            for speaker in reported(data.get("speakers", []))
+            if is_codemash_event(speaker, event_id=event_id)
+            and all(
+                f(data, speaker, track_name=track_name, speaker_name=speaker_name)
                 for f in speaker_filters
-            ):
-                continue
-            speaker_list.append(map_to_speaker(self.data, speaker))
-        return speaker_list
+            )
+        ]
 
     def sessions(
         self,
-        track_name: Annotated[str | None, "Filter sessions by track name"] = None,
-        room_name: Annotated[str | None, "Filter sessions by room name"] = None,
+        track_name: Annotated[
+            str | None,
+            "Filter sessions by track name. Approximate names (i.e. 'machine learning' for 'AI/ML') are matched to the closest track, which is the `track` of every result. A name that matches none is an error listing the tracks.",
+        ] = None,
+        room_name: Annotated[
+            str | None,
+            "Filter sessions by room name. Approximate names (i.e. 'salon-a' for 'Salon A') are matched to the closest room, which is the `venue` of every result. A name that matches none is an error listing the rooms.",
+        ] = None,
         speaker_name: Annotated[
             str | None,
             "Filter sessions by speaker name. Name may be first, last, and may be partial (case-insensitive, contains).",
@@ -151,12 +312,16 @@ class CodeMashDataReader:
             ),
         ] = None,
         duration: Annotated[
-            Literal[30, 60, 90, 115, 120, 125, 145, 180, 210, 235, 240, 265, 295]
-            | None,
+            SessionDuration | None,
             "Filter sessions by duration in minutes.",
         ] = None,
-    ) -> Annotated[list[Session], "List of sessions for the CodeMash 2026 event"]:
-        """Fetch the list of sessions for the CodeMash 2026 event.
+        include_descriptions: Annotated[
+            bool,
+            "Include descriptions. Leave them out for a compact listing, then use get_session for the few you need in full.",
+        ] = True,
+        event: EventName = None,
+    ) -> Annotated[list[Session], "List of sessions for the CodeMash event"]:
+        """Fetch the list of sessions for the CodeMash event.
 
         This method will return all of the sessions for the event, which can be a lot of data. You should prefer filtering
         by track name, room name, speaker name, duration, day of the week, and/or time range to limit the results, if that does
@@ -166,90 +331,490 @@ class CodeMashDataReader:
         then it would be better to fetch all of the sessions without a filter to reduce the number of API calls necessary to
         retrieve the full schedule.
         """
+        data = self.snapshot(event)
         sessions_validations(start_time_range, end_time_range)
+        room_name = resolve_room(data, room_name)
+        track_name = resolve_track(data, track_name)
+        return self._query(
+            "sessions",
+            self._sessions,
+            data,
+            include_descriptions,
+            day_of_week=day_of_week,
+            track_name=track_name,
+            room_name=room_name,
+            speaker_name=speaker_name,
+            start_time_range=start_time_range,
+            end_time_range=end_time_range,
+            duration=duration,
+        )
 
-        filtered_sessions = []
-        for session in self.data.get("sessions", []):
-            if all(
-                filter(
-                    self.data,
-                    session,
-                    day_of_week=day_of_week,
-                    start_time_range=start_time_range,
-                    end_time_range=end_time_range,
-                    duration=duration,
-                    room_name=room_name,
-                    track_name=track_name,
-                    speaker_name=speaker_name,
-                )
-                for filter in filters
-            ):
-                filtered_sessions.append(map_to_session(self.data, session))
-        return filtered_sessions
+    def _sessions(
+        self,
+        backend: QueryBackend,
+        data: Snapshot,
+        include_descriptions: bool,
+        **session_filters,
+    ) -> list[Session]:
+        if backend == "sqlite":
+            return [
+                map_to_session(data, session, include_descriptions)
+                for session in reported(sqlite_of(data).sessions(**session_filters))
+            ]
+        if backend == "columnar":
+            return columnar.columnar_of(data).sessions(
+                include_descriptions, **session_filters
+            )
 
-    def tracks(
+        # a pipeline over the sessions, so the call reports how far it is as it goes
+        return [
+            map_to_session(data, session, include_descriptions)
+            for session in reported(data.get("sessions", []))
+            if all(filter(data, session, **session_filters) for filter in filters)
+        ]
+
+    def get_speaker(
         self,
-    ) -> Annotated[list[Track], "List of tracks for the CodeMash 2026 event"]:
-        """Fetch the list of tracks for the CodeMash 2026 event."""
-        track_list = []
-        for track in self.data.get("tracks", []):
-            if not is_codemash_event(track):
-                continue
+        ids: Annotated[
+            str | list[str],
+            "A speaker id, or a list of them, from the `id` of speakers or session speakers.",
+        ],
+        event: EventName = None,
+    ) -> Annotated[list[Speaker], "The speakers with these ids, in the same order"]:
+        """Fetch CodeMash speakers by id, with their full bios and sessions."""
+        data = self.snapshot(event)
+        speakers = data.lookup("speakers")
+        event_id = event_id_of(data)
+        found = []
+        for speaker_id in _id_list(ids):
+            speaker = speakers.get(speaker_id)
+            if speaker is None or not is_codemash_event(speaker, event_id=event_id):
+                raise ValueError(f"Unknown speaker id '{speaker_id}'")
+            found.append(map_to_speaker(data, speaker))
+        return found
 
-            track_translation = find_matching_id(
-                self.data, "trackTranslations", track.get("id"), "track"
+    def get_session(
+        self,
+        ids: Annotated[
+            str | list[str],
+            "A session id, or a list of them, from the `id` of sessions.",
+        ],
+        event: EventName = None,
+    ) -> Annotated[list[Session], "The sessions with these ids, in the same order"]:
+        """Fetch CodeMash sessions by id, with their full descriptions."""
+        data = self.snapshot(event)
+        sessions = data.lookup("sessions")
+        event_id = event_id_of(data)
+        found = []
+        for session_id in _id_list(ids):
+            session = sessions.get(session_id)
+            if session is None or not session_in_event(data, session, event_id):
+                raise ValueError(f"Unknown session id '{session_id}'")
+            found.append(map_to_session(data, session))
+        return found
+
+    def similar_sessions(
+        self,
+        session_id: Annotated[
+            str,
+            "The id of the session to find similar ones to, from the `id` of sessions.",
+        ],
+        exclude_conflicts_with: Annotated[
+            str | list[str] | None,
+            "Leave out sessions that overlap in time with these sessions (ids), i.e. the ones already on the attendee's schedule. Pass session_id itself for sessions that can be seen as well as it.",
+        ] = None,
+        limit: Annotated[
+            int,
+            Field(description="The most sessions to return.", ge=1, le=MAX_SIMILAR),
+        ] = 5,
+        event: EventName = None,
+    ) -> Annotated[
+        list[SimilarSession], "The most similar sessions, most similar first"
+    ]:
+        """Fetch the CodeMash sessions most like a given one, i.e. what else to see after liking a talk.
+
+        Prefer this to fetching all sessions and comparing their descriptions. Sessions are
+        compared by the words of their titles and descriptions, their track and their speakers,
+        and `similarity` goes from 0 (nothing in common) to 1. Fewer than `limit` sessions are
+        returned when few have anything in common with it, or most of those conflict.
+        """
+        data = self.snapshot(event)
+        conflicts_with = (
+            _id_list(exclude_conflicts_with) if exclude_conflicts_with else None
+        )
+        sessions = data.lookup("sessions")
+        return [
+            SimilarSession(
+                {
+                    "session": map_to_session(data, sessions[similar_id]),
+                    "similarity": round(similarity, 3),
+                }
             )
-            track_list.append(
-                Track(
+            for similar_id, similarity in similarity_of(data).similar(
+                session_id, limit, conflicts_with
+            )
+        ]
+
+    def changes_since(
+        self,
+        since: Annotated[
+            str,
+            "The `version` of the last changes_since result, or an ISO 8601 time (i.e. 2026-01-14T09:00:00Z).",
+        ],
+    ) -> Annotated[
+        Changes, "The sessions and speakers added, modified or removed since then"
+    ]:
+        """Fetch only what changed in the CodeMash 2026 sessions and speakers since a version or time.
+
+        Use this to keep a copy of the schedule current without fetching every session and speaker
+        again. Added and modified items are returned in full, removed ones by id. Pass the returned
+        `version` as `since` next time. If `full_refresh` is true the server can't tell what changed
+        since then, and the sessions and speakers tools must be used to fetch everything.
+        """
+        version, changes = self.changes.since(since)
+        if changes is None:
+            return Changes(
+                {
+                    "since": since,
+                    "version": version,
+                    "full_refresh": True,
+                    "sessions": {"added": [], "modified": [], "removed": []},
+                    "speakers": {"added": [], "modified": [], "removed": []},
+                }
+            )
+        delta: dict = {}
+        for kind, items in changes.items():
+            delta[kind] = {"added": [], "modified": [], "removed": []}
+            for item_id, (change, record) in items.items():
+                delta[kind][change].append(item_id if change == "removed" else record)
+        return Changes(
+            {
+                "since": since,
+                "version": version,
+                "full_refresh": False,
+                "sessions": delta["sessions"],
+                "speakers": delta["speakers"],
+            }
+        )
+
+    def session_facets(
+        self,
+        track_name: Annotated[
+            str | None,
+            "Count only sessions in this track. Approximate names are matched to the closest track, and a name that matches none is an error listing the tracks.",
+        ] = None,
+        room_name: Annotated[
+            str | None,
+            "Count only sessions in this room. Approximate names are matched to the closest room, and a name that matches none is an error listing the rooms.",
+        ] = None,
+        speaker_name: Annotated[
+            str | None,
+            "Count only sessions by this speaker. Name may be first, last, and may be partial (case-insensitive, contains).",
+        ] = None,
+        day_of_week: Annotated[
+            ConferenceDay | None, "Count only sessions on this day of the week"
+        ] = None,
+        start_time_range: Annotated[
+            str | None,
+            Field(
+                description="Count only sessions starting in a time range, start time. Format: 'HHMM', 24-hour clock with a leading zero.",
+                default=None,
+                pattern="^([01][0-9]|2[0-3])[0-5][0-9]$",
+            ),
+        ] = None,
+        end_time_range: Annotated[
+            str | None,
+            Field(
+                description="Count only sessions starting in a time range, end time. Format: 'HHMM', 24-hour clock with a leading zero.",
+                default="2400",
+                pattern="^([01][0-9]|2[0-3])[0-5][0-9]$",
+            ),
+        ] = None,
+        duration: Annotated[
+            SessionDuration | None,
+            "Count only sessions of this duration in minutes.",
+        ] = None,
+        event: EventName = None,
+    ) -> Annotated[
+        SessionFacets,
+        "The number of matching sessions, broken down by day, track, room, type and duration",
+    ]:
+        """Count the CodeMash sessions matching a filter, by day, track, room, type and duration.
+
+        Takes the same filters as the sessions tool. Prefer this to fetching sessions when you only
+        need to know how many there are or how they're spread out, i.e. "how many AI sessions are on
+        Thursday?" or "which rooms have the most security talks?".
+        """
+        data = self.snapshot(event)
+        sessions_validations(start_time_range, end_time_range)
+        index = facets_of(data)
+        mask = index.mask(
+            day_of_week=day_of_week,
+            track_name=resolve_track(data, track_name),
+            room_name=resolve_room(data, room_name),
+            speaker_name=speaker_name,
+            start_time_range=start_time_range,
+            end_time_range=end_time_range,
+            duration=duration,
+        )
+        return index.counts(mask)
+
+    def now_and_next(
+        self,
+        at: Annotated[
+            str | None,
+            "ISO 8601 timestamp to look at, i.e. 2026-01-15T10:30. Without an offset it's in the event's local time. Defaults to now.",
+        ] = None,
+        window_minutes: Annotated[
+            int,
+            Field(
+                description="How far ahead to look for sessions starting soon, in minutes.",
+                ge=0,
+                le=720,
+            ),
+        ] = 30,
+        room_name: Annotated[
+            str | None,
+            "Only this room. Approximate names are matched to the closest room, and a name that matches none is an error listing the rooms.",
+        ] = None,
+        event: EventName = None,
+    ) -> Annotated[
+        NowAndNext,
+        "Sessions in progress and starting soon at the given time, grouped by room",
+    ]:
+        """What's happening now and up next at CodeMash, by room.
+
+        Prefer this to the sessions tool for questions like "what's on right now?" or "what's
+        next in the Kalahari?": it includes sessions that are already in progress, which a
+        time range search misses.
+        """
+        data = self.snapshot(event)
+        room_name = resolve_room(data, room_name)
+        moment = local_time(data, at)
+        result = NowAndNext(
+            {
+                "at": moment.isoformat(timespec="minutes"),
+                "day": moment.strftime("%A").upper(),
+                "rooms": [],
+            }
+        )
+        agenda = agenda_for_date(data, moment.date())
+        timeline = timelines_of(data).get(agenda) if agenda else None
+        if timeline is None:
+            return result
+
+        minute = moment.hour * 60 + moment.minute
+        rooms: dict[str, RoomNowAndNext] = {}
+        for key, sessions in (
+            ("in_progress", timeline.in_progress(minute)),
+            ("up_next", timeline.starting(minute, window_minutes)),
+        ):
+            for session in sessions:
+                # the room is looked up first, so sessions in other rooms aren't mapped
+                room = find_matching_id(
+                    data,
+                    "sessionVenueTranslations",
+                    session.get("venue"),
+                    "sessionVenue",
+                ).get("name", "Unknown")
+                if room_name and room != room_name:
+                    continue
+                mapped = map_to_session(data, session)
+                entry = rooms.setdefault(
+                    room,
+                    RoomNowAndNext({"room": room, "in_progress": [], "up_next": []}),
+                )
+                entry[key].append(mapped)
+        result["rooms"] = [rooms[room] for room in sorted(rooms)]
+        return result
+
+    def build_schedule(
+        self,
+        tracks: Annotated[
+            list[str] | None,
+            "Tracks the attendee is interested in (case-insensitive, contains).",
+        ] = None,
+        keywords: Annotated[
+            list[str] | None,
+            "Topics the attendee is interested in, matched as whole words against session titles and descriptions (case-insensitive).",
+        ] = None,
+        speakers: Annotated[
+            list[str] | None,
+            "Speakers the attendee wants to see. Names may be first, last, or partial (case-insensitive, contains).",
+        ] = None,
+        days: Annotated[
+            list[ConferenceDay] | None,
+            "Only schedule sessions on these days. Defaults to every day of the event.",
+        ] = None,
+        start_time: Annotated[
+            str | None,
+            Field(
+                description="The earliest time a session may start. Format: 'HHMM', 24-hour clock with a leading zero.",
+                default=None,
+                pattern="^([01][0-9]|2[0-3])[0-5][0-9]$",
+            ),
+        ] = None,
+        end_time: Annotated[
+            str | None,
+            Field(
+                description="The latest time a session may end. Format: 'HHMM', 24-hour clock with a leading zero.",
+                default=None,
+                pattern="^([01][0-9]|2[0-3])[0-5][0-9]$",
+            ),
+        ] = None,
+        preferred_durations: Annotated[
+            list[int] | None,
+            "Session lengths in minutes the attendee prefers. These are favored, not required.",
+        ] = None,
+        alternates: Annotated[
+            int, Field(description="Alternates to suggest for each slot.", ge=0, le=10)
+        ] = 2,
+        event: EventName = None,
+    ) -> Annotated[
+        list[ScheduleDay],
+        "The best non-overlapping schedule for each day, with alternates for each slot",
+    ]:
+        """Build a personal CodeMash agenda with no time conflicts.
+
+        Prefer this to fetching all sessions and working out the schedule yourself. Sessions are
+        scored by how well they match the attendee's interests (tracks, speakers and keywords), and
+        the schedule for each day is the set of non-overlapping sessions with the highest total
+        score. Each slot also lists the best alternates that run at the same time.
+
+        If no interests are given, every session is worth the same and the schedule fits in as
+        many sessions as possible.
+        """
+        if start_time and end_time and start_time >= end_time:
+            raise ValueError("start_time must be before end_time.")
+
+        data = self.snapshot(event)
+        agenda_days = {
+            agenda: day
+            for day, agenda in agenda_map_of(data).items()
+            if not days or day in days
+        }
+        interests = Interests(
+            tracks=[t.lower() for t in tracks or []],
+            speakers=[s.lower() for s in speakers or []],
+            keywords=[k.lower() for k in keywords or []],
+            preferred_durations=preferred_durations or [],
+        )
+        candidates_by_day = schedule_candidates(
+            data,
+            agenda_days,
+            interests,
+            window_start=parse_hhmm(start_time) if start_time else 0,
+            window_end=parse_hhmm(end_time) if end_time else 24 * 60,
+        )
+
+        schedule = []
+        for day in agenda_days.values():
+            candidates = candidates_by_day.get(day)
+            if not candidates:
+                continue
+            chosen = best_schedule(candidates)
+            slots = [
+                ScheduleSlot(
                     {
-                        "name": track_translation.get("title", "Unknown"),
+                        "session": map_to_session(data, c.session),
+                        "score": c.score,
+                        "alternates": [
+                            map_to_session(data, a.session)
+                            for a in alternates_for(c, candidates, alternates)
+                        ],
+                    }
+                )
+                for c in chosen
+            ]
+            schedule.append(
+                ScheduleDay(
+                    {
+                        "day": day,
+                        "total_score": sum(c.score for c in chosen),
+                        "slots": slots,
                     }
                 )
             )
-        return track_list
+        return schedule
+
+    def tracks(
+        self,
+        event: EventName = None,
+    ) -> Annotated[list[Track], "List of tracks for the CodeMash event"]:
+        """Fetch the list of tracks for the CodeMash event."""
+        return map_tracks(self.snapshot(event))
 
     def rooms(
         self,
-    ) -> Annotated[list[str], "List of rooms names for the CodeMash 2026 event."]:
-        """Fetch the list of rooms/venues for the CodeMash 2026 event.
+        event: EventName = None,
+    ) -> Annotated[list[str], "List of rooms names for the CodeMash event."]:
+        """Fetch the list of rooms/venues for the CodeMash event.
 
         This information is primarily useful when filtering sessions by room name."""
-        room_list = []
-        for venue in self.data.get("sessionVenues", []):
-            if not is_codemash_event(venue):
-                continue
-
-            venue_translation = find_matching_id(
-                self.data, "sessionVenueTranslations", venue.get("id"), "sessionVenue"
-            )
-            room_list.append(venue_translation.get("name", "Unknown"))
-        return room_list
+        return map_rooms(self.snapshot(event))
 
     def venue(
         self,
-    ) -> Annotated[Venue | None, "Venue information for the CodeMash 2026 event"]:
-        """Fetch the venue information for the CodeMash 2026 event.
+        event: EventName = None,
+    ) -> Annotated[Venue | None, "Venue information for the CodeMash event"]:
+        """Fetch the venue information for the CodeMash event.
 
         This information is high-level information about the overall event venue. You
         may want to combine this information with the event and hotels tool call as well.
         """
-        for venue in self.data.get("venues", []):
-            if not is_codemash_event(venue):
-                continue
+        return map_venue(self.snapshot(event))
 
-            venue_translation = find_matching_id(
-                self.data, "venueTranslations", venue.get("id"), "venue"
-            )
-            return Venue(
-                {
-                    "name": venue_translation.get("name", "Unknown"),
-                    "street": venue_translation.get("street", ""),
-                    "city": venue_translation.get("townOrCity", ""),
-                    "state": venue_translation.get("state", ""),
-                    "latitude": float(venue.get("latitude")),
-                    "longitude": float(venue.get("longitude")),
-                    "zipcode": venue.get("zipcode"),
-                    "country": venue.get("country"),
-                }
-            )
-        return None
+    def sponsors(
+        self,
+        company_name: Annotated[
+            str | None,
+            "Filter sponsors by company name (case-insensitive, contains).",
+        ] = None,
+        sponsorship: Annotated[
+            str | None,
+            "Filter sponsors by sponsorship level, i.e. 'Lanyard' (case-insensitive, contains).",
+        ] = None,
+        event: EventName = None,
+    ) -> Annotated[list[Sponsor], "List of sponsors for the CodeMash event"]:
+        """Fetch the list of sponsors for the CodeMash event.
+
+        Each sponsor comes with its sponsorship level and, when the sponsorship includes
+        one, the expo booth package that comes with it. Use expo_booths for what a
+        booth package includes.
+        """
+        data = self.snapshot(event)
+        company_name = company_name.lower() if company_name else None
+        sponsorship = sponsorship.lower() if sponsorship else None
+        return [
+            sponsor
+            for sponsor in sponsors_of(data)
+            if (not company_name or company_name in sponsor["company"].lower())
+            and (not sponsorship or sponsorship in sponsor["sponsorship"].lower())
+        ]
+
+    def expo_booths(
+        self,
+        booth_name: Annotated[
+            str | None,
+            "Filter booth packages by name, i.e. 'Gold' (case-insensitive, contains).",
+        ] = None,
+        event: EventName = None,
+    ) -> Annotated[
+        list[ExpoBooth], "List of expo booth packages for the CodeMash event"
+    ]:
+        """Fetch the expo booth packages for the CodeMash event.
+
+        Each package has its price, booth size, whether it's sold out, the sponsorship
+        it comes with, and the facilities it includes (tables, chairs, badges, ...).
+        """
+        data = self.snapshot(event)
+        booth_name = booth_name.lower() if booth_name else None
+        return [
+            booth
+            for booth in booths_of(data)
+            if not booth_name or booth_name in booth["name"].lower()
+        ]
+
+
+def _id_list(ids: str | list[str]) -> list[str]:
+    return [ids] if isinstance(ids, str) else ids
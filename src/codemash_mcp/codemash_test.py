@@ -3,10 +3,13 @@ import tempfile
 import json
 import math
 
+import pytest
+
 from codemash_mcp.codemash import CodeMashDataReader
 from typing import cast, List, Dict
 
 from codemash_mcp.helpers import CODEMASH_EVENT_ID
+from codemash_mcp.snapshot import Snapshot
 
 TRACK_NAME = "Track 1"
 VENUE_NAME = "Venue 1"
@@ -193,3 +196,215 @@ def test_rooms():
     assert isinstance(rooms, list)
     assert len(rooms) == 1
     assert rooms[0] == VENUE_NAME
+
+
+def test_list_results_have_ids():
+    reader = make_reader_with_sample()
+    session = cast(Dict, reader.sessions()[0])
+    assert session["id"] == "sess1"
+    assert session["speakers"][0]["id"] == "s1"
+    speaker = cast(Dict, reader.speakers()[0])
+    assert speaker["id"] == "s1"
+    assert speaker["sessions"][0]["id"] == "sess1"
+
+
+def test_compact_listings():
+    reader = make_reader_with_sample()
+    assert "description" not in reader.sessions(include_descriptions=False)[0]
+    speaker = cast(Dict, reader.speakers(include_descriptions=False)[0])
+    assert "description" not in speaker
+    assert "description" not in speaker["sessions"][0]
+
+
+def test_get_session_and_speaker():
+    reader = make_reader_with_sample()
+    assert reader.get_session("sess1")[0].get("description") == "Session Desc"
+    assert [s.get("id") for s in reader.get_session(["sess1", "sess1"])] == [
+        "sess1",
+        "sess1",
+    ]
+    assert reader.get_speaker(["s1"])[0].get("description") == "Bio"
+    assert reader.get_session([]) == []
+    with pytest.raises(ValueError, match="nope"):
+        reader.get_session(["sess1", "nope"])
+    with pytest.raises(ValueError, match="sess1"):
+        reader.get_speaker("sess1")
+
+
+def test_get_session_and_speaker_are_scoped_to_the_event():
+    data = {
+        **SAMPLE_DATA,
+        "agendas": [{"id": "76186000008378878", "event": "other"}],
+        "speakers": [{"id": "s1", "event": "other", "userProfile": "u1"}],
+    }
+    reader = CodeMashDataReader(Path(), Snapshot(data))
+    with pytest.raises(ValueError, match="Unknown session id 'sess1'"):
+        reader.get_session("sess1")
+    with pytest.raises(ValueError, match="Unknown speaker id 's1'"):
+        reader.get_speaker("s1")
+
+
+def test_sessions_approximate_names():
+    reader = make_reader_with_sample()
+    sessions = cast(
+        List[Dict], reader.sessions(room_name="venue-1", track_name="track 1")
+    )
+    assert [s["title"] for s in sessions] == [SESSION_TITLE]
+    assert sessions[0]["venue"] == VENUE_NAME
+    assert sessions[0]["track"] == TRACK_NAME
+    with pytest.raises(
+        ValueError, match=f"Unknown room 'Nowhere'. Use one of: {VENUE_NAME}"
+    ):
+        reader.sessions(room_name="Nowhere")
+    with pytest.raises(
+        ValueError, match=f"Unknown track 'Nothing'. Use one of: {TRACK_NAME}"
+    ):
+        reader.speakers(track_name="Nothing")
+
+
+def make_reader_with_overlaps(tmp_path):
+    data = json.loads(json.dumps(SAMPLE_DATA))
+    data["sessions"] += [
+        # overlaps sess1 and sess3
+        {**data["sessions"][0], "id": "sess2", "startTime": "0930", "duration": "60"},
+        # starts as sess1 ends
+        {**data["sessions"][0], "id": "sess3", "startTime": "1000", "duration": "30"},
+    ]
+    data["sessionTranslations"] += [
+        {"session": "sess2", "title": "Rust in Production", "description": ""},
+        {"session": "sess3", "title": "More Rust", "description": "rust"},
+    ]
+    path = tmp_path / "overlaps.json"
+    path.write_text(json.dumps(data))
+    return CodeMashDataReader(path)
+
+
+def test_build_schedule_without_interests_fits_most_sessions(tmp_path):
+    reader = make_reader_with_overlaps(tmp_path)
+    schedule = cast(List[Dict], reader.build_schedule())
+    assert [day["day"] for day in schedule] == ["MONDAY"]
+    slots = schedule[0]["slots"]
+    assert [slot["session"]["title"] for slot in slots] == [SESSION_TITLE, "More Rust"]
+    assert [a["title"] for a in slots[0]["alternates"]] == ["Rust in Production"]
+
+
+def test_build_schedule_prefers_interests(tmp_path):
+    reader = make_reader_with_overlaps(tmp_path)
+    schedule = cast(List[Dict], reader.build_schedule(keywords=["rust"]))
+    slots = schedule[0]["slots"]
+    # "More Rust" scores higher (title and description) than "Rust in Production"
+    assert [slot["session"]["title"] for slot in slots] == ["More Rust"]
+    assert schedule[0]["total_score"] == 3
+
+    schedule = cast(List[Dict], reader.build_schedule(speakers=["smith"], alternates=0))
+    assert [slot["session"]["title"] for slot in schedule[0]["slots"]] == [
+        SESSION_TITLE
+    ]
+    assert schedule[0]["slots"][0]["alternates"] == []
+
+
+def test_build_schedule_filters(tmp_path):
+    reader = make_reader_with_overlaps(tmp_path)
+    assert reader.build_schedule(days=["FRIDAY"]) == []
+    schedule = cast(
+        List[Dict], reader.build_schedule(start_time="0930", end_time="1030")
+    )
+    slots = schedule[0]["slots"]
+    assert len(slots) == 1
+    assert {slots[0]["session"]["title"], slots[0]["alternates"][0]["title"]} == {
+        "Rust in Production",
+        "More Rust",
+    }
+    with pytest.raises(ValueError):
+        reader.build_schedule(start_time="1000", end_time="0900")
+
+
+def test_now_and_next():
+    reader = make_reader_with_sample()
+    # the sample session runs 0900-1000 on the Monday
+    result = cast(Dict, reader.now_and_next(at="2026-01-12T09:30"))
+    assert result["day"] == "MONDAY"
+    assert result["rooms"][0]["room"] == VENUE_NAME
+    assert [s["title"] for s in result["rooms"][0]["in_progress"]] == [SESSION_TITLE]
+    assert result["rooms"][0]["up_next"] == []
+
+    result = cast(Dict, reader.now_and_next(at="2026-01-12T08:45", window_minutes=15))
+    assert result["rooms"][0]["in_progress"] == []
+    assert [s["title"] for s in result["rooms"][0]["up_next"]] == [SESSION_TITLE]
+
+    assert (
+        reader.now_and_next(at="2026-01-12T08:45", window_minutes=10).get("rooms") == []
+    )
+    assert reader.now_and_next(at="2026-01-12T10:00").get("rooms") == []
+    with pytest.raises(ValueError, match="Unknown room 'Other'"):
+        reader.now_and_next(at="2026-01-12T09:30", room_name="Other")
+
+
+OTHER_EVENT_ID = "other-event"
+
+
+def make_other_event_file(tmp_path):
+    # a different event, whose agendas put the session on a Tuesday
+    data = json.loads(
+        json.dumps(SAMPLE_DATA).replace(CODEMASH_EVENT_ID, OTHER_EVENT_ID)
+    )
+    data["events"][0]["startDate"] = "2025-01-06T13:00:00.000Z"
+    data["agendas"] = [
+        {"id": "a0", "index": 0, "event": OTHER_EVENT_ID},
+        {"id": "a1", "index": 1, "event": OTHER_EVENT_ID},
+    ]
+    data["sessions"][0]["agenda"] = "a1"
+    data["eventTranslations"][0]["name"] = "CodeMash 2025"
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def make_multi_event_reader(tmp_path):
+    reader = make_reader_with_sample()
+    return CodeMashDataReader(
+        reader.data_directory,
+        event_files={"codemash-2025": make_other_event_file(tmp_path)},
+    )
+
+
+def test_event_names(tmp_path):
+    reader = make_multi_event_reader(tmp_path)
+    assert reader.event_names() == ["codemash-2026", "codemash-2025"]
+
+
+def test_other_event_is_loaded_on_first_use(tmp_path):
+    reader = make_multi_event_reader(tmp_path)
+    assert reader.other_events.stats()["loaded"] == []
+
+    event = reader.event(event="codemash-2025")
+    assert event is not None
+    assert event.get("name") == "CodeMash 2025"
+    assert reader.other_events.stats()["loaded"] == ["codemash-2025"]
+
+    # records are scoped to the other event's id
+    assert reader.speakers(event="codemash-2025")[0].get("name") == "Alice"
+    assert reader.rooms(event="codemash-2025") == [VENUE_NAME]
+
+
+def test_other_event_days_come_from_its_agendas(tmp_path):
+    reader = make_multi_event_reader(tmp_path)
+    assert len(reader.sessions(day_of_week="TUESDAY", event="codemash-2025")) == 1
+    assert len(reader.sessions(day_of_week="MONDAY", event="codemash-2025")) == 0
+    # the default event still uses its own agendas
+    assert len(reader.sessions(day_of_week="MONDAY")) == 1
+
+
+def test_unknown_event(tmp_path):
+    reader = make_multi_event_reader(tmp_path)
+    with pytest.raises(ValueError, match="codemash-2026, codemash-2025"):
+        reader.sessions(event="codemash-1999")
+
+
+def test_columnar_backend_falls_back_without_numpy(monkeypatch):
+    from codemash_mcp import columnar
+
+    monkeypatch.setattr(columnar, "np", None)
+    reader = CodeMashDataReader(Path(), Snapshot(SAMPLE_DATA), backend="columnar")
+    assert reader.backend == "python"
+    assert len(reader.sessions()) == 1
@@ -0,0 +1,177 @@
+from typing import Any
+
+from codemash_mcp.helpers import (
+    agenda_map_of,
+    event_id_of,
+    find_matching_id,
+    is_codemash_event,
+    map_to_session,
+    sessions_find_speakers,
+)
+from codemash_mcp.snapshot import Snapshot
+
+try:
+    import numpy as np  # pyright: ignore[reportMissingImports]
+except ImportError:
+    np = None
+
+# The code of a session that has no value for a column, i.e. a room at another event.
+# Filters never match it.
+MISSING = -1
+
+
+def available() -> bool:
+    """Whether numpy is installed, which the columnar backend needs."""
+    return np is not None
+
+
+def parse_minute(hhmm: str | None) -> int:
+    """'HHMM' as minutes after midnight, or MISSING for an untimed session."""
+    if not hhmm:
+        return MISSING
+    return int(hhmm[:2]) * 60 + int(hhmm[2:])
+
+
+class _Codes:
+    """Numbers the distinct values of a column in the order they're first seen."""
+
+    def __init__(self):
+        self.codes: dict[Any, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        return self.codes.setdefault(value, len(self.codes))
+
+    def get(self, value: Any) -> int | None:
+        return self.codes.get(value)
+
+
+class ColumnarIndex:
+    """A snapshot's sessions as numpy columns, one entry per session in export order.
+
+    Day, track and room are integer codes, start time is in minutes, so each filter is
+    one vectorized comparison and a query is the AND of a few boolean masks. The
+    matching sessions' output rows are mapped once, on first use, and gathered by
+    position. They're shared between calls, like the snapshot they come from.
+    """
+
+    def __init__(self, data: Any):
+        if np is None:
+            raise RuntimeError(
+                "The columnar backend needs numpy, which isn't installed"
+            )
+        sessions = data.get("sessions", [])
+        self.data = data
+        self.size = len(sessions)
+        self.agendas = agenda_map_of(data)
+        event_id = event_id_of(data)
+
+        self.day_codes, self.track_codes, self.room_codes = _Codes(), _Codes(), _Codes()
+        day, track, room, start, duration = [], [], [], [], []
+        # speaker name to the positions of their sessions
+        self.speakers: dict[str, list[int]] = {}
+        for i, session in enumerate(sessions):
+            day.append(self.day_codes(session.get("agenda")))
+            track.append(
+                self.track_codes(
+                    find_matching_id(
+                        data, "trackTranslations", session.get("track", ""), "track"
+                    ).get("title", "")
+                )
+            )
+            venue = find_matching_id(data, "sessionVenues", session.get("venue"))
+            if is_codemash_event(venue, event_id=event_id):
+                room.append(
+                    self.room_codes(
+                        find_matching_id(
+                            data,
+                            "sessionVenueTranslations",
+                            session.get("venue"),
+                            "sessionVenue",
+                        ).get("name", "")
+                    )
+                )
+            else:
+                room.append(MISSING)
+            start.append(parse_minute(session.get("startTime")))
+            duration.append(int(session.get("duration", "0")))
+            for speaker in sessions_find_speakers(data, session):
+                name = f"{speaker['name']} {speaker['last_name']}".lower()
+                self.speakers.setdefault(name, []).append(i)
+
+        self.day = np.array(day, dtype=np.int32)
+        self.track = np.array(track, dtype=np.int32)
+        self.room = np.array(room, dtype=np.int32)
+        self.start = np.array(start, dtype=np.int32)
+        self.duration = np.array(duration, dtype=np.int32)
+        self._rows: dict[bool, list] = {}
+
+    def _equals(self, column, codes: _Codes, value: Any):
+        code = codes.get(value)
+        if code is None:
+            return np.zeros(self.size, dtype=bool)  # pyright: ignore[reportOptionalMemberAccess]
+        return column == code
+
+    def mask(
+        self,
+        day_of_week: str | None = None,
+        track_name: str | None = None,
+        room_name: str | None = None,
+        speaker_name: str | None = None,
+        start_time_range: str | None = None,
+        end_time_range: str | None = None,
+        duration: int | None = None,
+    ):
+        """A boolean array of the sessions that pass the sessions tool's filters."""
+        assert np is not None
+        mask = np.ones(self.size, dtype=bool)
+        if day_of_week:
+            mask &= self._equals(
+                self.day, self.day_codes, self.agendas.get(day_of_week, MISSING)
+            )
+        if track_name:
+            mask &= self._equals(self.track, self.track_codes, track_name)
+        if room_name:
+            mask &= self._equals(self.room, self.room_codes, room_name)
+        if duration:
+            mask &= self.duration == duration
+        if start_time_range:
+            start = parse_minute(start_time_range)
+            end = parse_minute(end_time_range or "2400")
+            mask &= (self.start == MISSING) | (
+                (self.start >= start) & (self.start <= end)
+            )
+        if speaker_name:
+            speaker_name = speaker_name.lower()
+            by_speaker = np.zeros(self.size, dtype=bool)
+            for name, positions in self.speakers.items():
+                if speaker_name in name:
+                    by_speaker[positions] = True
+            mask &= by_speaker
+        return mask
+
+    def rows(self, include_descriptions: bool) -> list:
+        """Every session's output, mapped the first time it's asked for."""
+        rows = self._rows.get(include_descriptions)
+        if rows is None:
+            rows = [
+                map_to_session(self.data, session, include_descriptions)
+                for session in self.data.get("sessions", [])
+            ]
+            self._rows[include_descriptions] = rows
+        return rows
+
+    def sessions(self, include_descriptions: bool = True, **filters) -> list:
+        """The output rows of the sessions that pass `filters`, in export order.
+
+        The rows are shared by every call on this index and are read-only: copying them
+        would take longer than the query itself.
+        """
+        assert np is not None
+        rows = self.rows(include_descriptions)
+        return [rows[i] for i in np.flatnonzero(self.mask(**filters)).tolist()]
+
+
+def columnar_of(data: Any) -> ColumnarIndex:
+    if isinstance(data, Snapshot):
+        return data.derived("columnar", ColumnarIndex)
+    return ColumnarIndex(data)
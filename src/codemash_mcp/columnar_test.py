@@ -0,0 +1,116 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+
+# The reader tests, run again with the columnar backend
+from codemash_mcp.codemash_test import (  # noqa: F401
+    test_build_schedule_filters,
+    test_build_schedule_prefers_interests,
+    test_build_schedule_without_interests_fits_most_sessions,
+    test_columnar_backend_falls_back_without_numpy,
+    test_compact_listings,
+    test_event,
+    test_event_names,
+    test_get_session_and_speaker,
+    test_hotels,
+    test_list_results_have_ids,
+    test_now_and_next,
+    test_other_event_days_come_from_its_agendas,
+    test_other_event_is_loaded_on_first_use,
+    test_rooms,
+    test_sessions,
+    test_sessions_approximate_names,
+    test_sessions_duration,
+    test_sessions_time_range,
+    test_speakers,
+    test_tracks,
+    test_unknown_event,
+    test_venue,
+)
+from codemash_mcp.columnar import MISSING, ColumnarIndex, columnar_of, parse_minute
+from codemash_mcp.serialization import encode
+from codemash_mcp.snapshot import load_snapshot
+
+np = pytest.importorskip("numpy")
+
+DATA_DIRECTORY = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture(autouse=True)
+def columnar_backend(monkeypatch):
+    monkeypatch.setattr(CodeMashDataReader, "backend", "columnar")
+
+
+@pytest.fixture(scope="module", params=["endpoint-1.json", "endpoint-3.json"])
+def readers(request):
+    path = DATA_DIRECTORY / request.param
+    snapshot = load_snapshot(path)
+    return (
+        CodeMashDataReader(path, snapshot, backend="python"),
+        CodeMashDataReader(path, snapshot, backend="columnar"),
+    )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"day_of_week": "THURSDAY"},
+        {"day_of_week": "FRIDAY", "track_name": "AI/ML"},
+        {"room_name": "Salon A", "include_descriptions": False},
+        {"speaker_name": "an", "start_time_range": "0900", "end_time_range": "1200"},
+        {"duration": 60, "day_of_week": "WEDNESDAY"},
+        {"track_name": "AI/ML", "speaker_name": "ZZZ"},
+        {"speaker_name": "ZZZ"},
+    ],
+)
+def test_sessions_match_python_backend(readers, filters):
+    python, columnar = readers
+    assert columnar.sessions(**filters) == python.sessions(**filters)
+
+
+def test_parse_minute():
+    assert parse_minute("0000") == 0
+    assert parse_minute("1030") == 630
+    assert parse_minute("2400") == 1440
+    assert parse_minute("") == MISSING
+    assert parse_minute(None) == MISSING
+
+
+def test_untimed_sessions_pass_any_time_range():
+    index = ColumnarIndex(
+        {"sessions": [{"id": "s1", "startTime": "0800"}, {"id": "s2"}]}
+    )
+    assert index.mask(start_time_range="0900").tolist() == [False, True]
+    assert index.mask(start_time_range="0700").tolist() == [True, True]
+
+
+def test_rooms_at_other_events_never_match():
+    index = ColumnarIndex(
+        {
+            "sessions": [{"id": "s1", "venue": "v1"}],
+            "sessionVenues": [{"id": "v1", "event": "another"}],
+            "sessionVenueTranslations": [{"sessionVenue": "v1", "name": "Salon A"}],
+        }
+    )
+    assert index.room.tolist() == [MISSING]
+    assert not index.mask(room_name="Salon A").any()
+
+
+def test_index_is_built_once_per_snapshot():
+    snapshot = load_snapshot(DATA_DIRECTORY / "endpoint-1.json")
+    assert columnar_of(snapshot) is columnar_of(snapshot)
+
+
+def test_rows_are_shared_and_left_as_they_are(readers):
+    _, columnar = readers
+    rows = columnar.sessions()
+    before = copy.deepcopy(rows)
+    # the server only encodes them, so every call can be given the same rows
+    json.loads(encode(rows))
+    assert columnar.sessions()[0] is rows[0]
+    assert rows == before
@@ -0,0 +1,133 @@
+import gzip
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from codemash_mcp.compression import (
+    CompressionMiddleware,
+    CompressionStats,
+    GzipCompressor,
+    negotiate,
+)
+
+BIG = {"sessions": [{"title": f"Session {i}", "track": "AI/ML"} for i in range(200)]}
+EVENTS = [f"event: message\ndata: {{'n': {i}}}\n\n".encode() for i in range(3)]
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("br;q=0.5, gzip;q=0.9", "gzip"),
+        ("br, gzip;q=0", "br"),
+        ("*", "zstd"),
+        ("*;q=0, gzip", "gzip"),
+        ("deflate", None),
+        ("", None),
+        ("gzip;q=bad", None),
+    ],
+)
+def test_negotiate(header, expected):
+    assert negotiate(header, ["zstd", "br", "gzip"]) == expected
+
+
+def test_gzip_compressor_flushes_every_chunk():
+    compressor = GzipCompressor()
+    decompressor = zlib.decompressobj(31)
+    for event in EVENTS:
+        # each event is readable as soon as it's sent
+        assert decompressor.decompress(compressor.compress(event, final=False)) == event
+    decompressor.decompress(compressor.compress(b"", final=True))
+    assert decompressor.eof
+
+
+@pytest.fixture
+def stats():
+    return CompressionStats()
+
+
+@pytest.fixture
+def client(stats):
+    async def stream():
+        for event in EVENTS:
+            yield event
+
+    app = Starlette(
+        routes=[
+            Route("/big", lambda request: JSONResponse(BIG)),
+            Route("/small", lambda request: JSONResponse({"status": "OK"})),
+            Route(
+                "/events",
+                lambda request: StreamingResponse(
+                    stream(), media_type="text/event-stream"
+                ),
+            ),
+            Route(
+                "/image",
+                lambda request: Response(b"\x89PNG" * 1000, media_type="image/png"),
+            ),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=500, stats=stats)
+    return TestClient(app)
+
+
+def _raw(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"accept-encoding": accept_encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+class TestCompressionMiddleware:
+    def test_should_compress_large_responses(self, client, stats):
+        response, body = _raw(client, "/big", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(body)
+        assert gzip.decompress(body) == JSONResponse(BIG).body
+        assert stats.as_dict()["compressed"] == 1
+
+    def test_should_not_compress_small_responses(self, client, stats):
+        response, body = _raw(client, "/small", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body == b'{"status":"OK"}'
+        assert stats.as_dict()["skipped"] == 1
+
+    def test_should_respect_identity(self, client):
+        response, body = _raw(client, "/big", "identity")
+        assert "content-encoding" not in response.headers
+        assert body == JSONResponse(BIG).body
+
+    def test_should_stream_compressed_events(self, client, stats):
+        response, body = _raw(client, "/events", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(body) == b"".join(EVENTS)
+        assert stats.as_dict()["bytes_in"] == sum(len(e) for e in EVENTS)
+
+    def test_should_skip_binary_content(self, client):
+        response, body = _raw(client, "/image", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body == b"\x89PNG" * 1000
+
+
+def test_should_not_compress_bodyless_responses():
+    app = Starlette(
+        routes=[
+            Route(
+                "/unchanged",
+                lambda request: Response(
+                    status_code=304, media_type="application/json"
+                ),
+            ),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=0)
+    response, body = _raw(TestClient(app), "/unchanged", "gzip")
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert body == b""
@@ -0,0 +1,122 @@
+import os
+from pathlib import Path
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Config(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="codemash_",
+        env_file=os.getenv("CODEMASH_ENV_FILE", ".env.codemash"),
+        env_file_encoding="utf-8",
+    )
+
+    data_file: Path = Field(
+        default=Path("data/endpoint-3.json"),
+        description="The location of the CodeMash data file to use.",
+    )
+
+    event_name: str = Field(
+        default="codemash-2026",
+        description="The name of the event in the data file, and the event tools query by default.",
+    )
+
+    event_files: dict[str, Path] = Field(
+        default={},
+        description='Data files for additional events, by event name. Ex: {"codemash-2025": "data/2025.json"}',
+    )
+
+    event_memory_budget_mb: int = Field(
+        default=256,
+        ge=0,
+        description="The memory budget for additional events. The least recently used are unloaded to stay within it.",
+    )
+
+    query_backend: Literal["python", "sqlite", "columnar"] = Field(
+        default="python",
+        description="Run the sessions and speakers filters over the loaded export (python), as SQL queries against an in-memory SQLite copy of it (sqlite), or the sessions filters as masks over numpy arrays (columnar, needs numpy).",
+    )
+
+    shadow_sample_rate: float = Field(
+        default=0,
+        ge=0,
+        le=1,
+        description="The fraction of sessions and speakers calls to run again on the python backend in the background, logging any difference from the query backend's results. 0 disables shadowing.",
+    )
+
+    change_log_size: int = Field(
+        default=50,
+        ge=1,
+        description="The number of reloads whose changes are kept for changes_since. Clients asking about older versions must refetch everything.",
+    )
+
+    tool_executor: Literal["thread", "process"] = Field(
+        default="thread",
+        description="Run tools on a pool of worker threads or worker processes.",
+    )
+
+    tool_workers: int = Field(
+        default=4,
+        ge=1,
+        description="The maximum number of tool calls to run at the same time.",
+    )
+
+    tool_queue_depth: int = Field(
+        default=16,
+        ge=0,
+        description="The maximum number of tool calls waiting for a worker. Calls beyond this are rejected as busy.",
+    )
+
+    reload_interval: float = Field(
+        default=0,
+        ge=0,
+        description="How often, in seconds, to check the data file for changes and reload it. 0 disables reloading.",
+    )
+
+    startup_budget_ms: int = Field(
+        default=3000,
+        ge=0,
+        description="The time budget for importing and building the server. Exceeding it logs a warning and fails the startup check.",
+    )
+
+    compression: bool = Field(
+        default=True,
+        description="Compress HTTP responses (gzip, plus brotli or zstd when installed) for clients that accept it.",
+    )
+
+    compression_min_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="Complete responses smaller than this are sent uncompressed. Streamed responses are always compressed.",
+    )
+
+    rate_limit_per_second: float = Field(
+        default=0,
+        ge=0,
+        description="Tokens added to each client's bucket per second. A static lookup costs 1 token and an unfiltered sessions or speakers call 10. 0 disables rate limiting.",
+    )
+
+    rate_limit_burst: int = Field(
+        default=60,
+        ge=1,
+        description="The most tokens a client's bucket holds, i.e. the burst of calls allowed after a quiet period.",
+    )
+
+    max_sessions: int = Field(
+        default=1000,
+        ge=0,
+        description="The most MCP sessions kept at once. Beyond this the least recently used idle sessions are closed. 0 is unlimited.",
+    )
+
+    session_idle_timeout: float = Field(
+        default=1800,
+        ge=0,
+        description="Close MCP sessions with no requests for this many seconds. 0 keeps them until the client closes them.",
+    )
+
+    stateless_http: bool = Field(
+        default=False,
+        description="Serve every request with a fresh transport and keep no sessions. Clients then get no server push, i.e. resource update notifications.",
+    )
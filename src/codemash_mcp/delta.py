@@ -0,0 +1,163 @@
+from collections.abc import Hashable, Iterator
+from itertools import chain, pairwise
+from typing import NamedTuple
+
+
+class CollectionDelta(NamedTuple):
+    """How one collection changed between two snapshots, matching items by their `id`.
+
+    Items carry their position in the old collection (removed), the new one (added), or
+    both (updated), so position-numbered indexes can be updated in place.
+    """
+
+    added: list[tuple[int, dict]]
+    # old position, old item, new position, new item
+    updated: list[tuple[int, dict, int, dict]]
+    removed: list[tuple[int, dict]]
+    # whether the items in both collections are in the same order relative to each
+    # other, so the retained ones only shift by the items removed and added around them
+    in_order: bool
+
+    def old_items(self) -> Iterator[dict]:
+        return chain(
+            (item for _, item in self.removed), (item for _, item, _, _ in self.updated)
+        )
+
+    def new_items(self) -> Iterator[dict]:
+        return chain(
+            (item for _, item in self.added), (item for _, _, _, item in self.updated)
+        )
+
+    def keys(self, key: str) -> set:
+        """The values of `key` in the changed items, before and after the change."""
+        return {
+            value
+            for item in chain(self.old_items(), self.new_items())
+            if isinstance(value := item.get(key), Hashable)
+        }
+
+    def moves(self, old_length: int) -> list[tuple[int, int, int]]:
+        """How far the retained items moved, as runs (start, stop, shift) of old positions.
+
+        Only runs that moved are listed. Only meaningful when the delta is `in_order`.
+        """
+        removed = sorted(pos for pos, _ in self.removed)
+        added = sorted(pos for pos, _ in self.added)
+        runs: list[tuple[int, int, int]] = []
+        old = new = r = a = 0
+        while old < old_length:
+            if r < len(removed) and removed[r] == old:
+                old, r = old + 1, r + 1
+            elif a < len(added) and added[a] == new:
+                new, a = new + 1, a + 1
+            else:
+                run = old_length - old
+                if r < len(removed):
+                    run = min(run, removed[r] - old)
+                if a < len(added):
+                    run = min(run, added[a] - new)
+                shift = new - old
+                if shift:
+                    if runs and runs[-1][1] == old and runs[-1][2] == shift:
+                        runs[-1] = (runs[-1][0], old + run, shift)
+                    else:
+                        runs.append((old, old + run, shift))
+                old, new = old + run, new + run
+        return runs
+
+
+# Collection name to its delta, for the collections that changed. The delta is None when
+# the collection couldn't be matched by id (or isn't a list), and is replaced outright.
+SnapshotDelta = dict[str, CollectionDelta | None]
+
+
+def _positions(items: list) -> dict[Hashable, int] | None:
+    try:
+        positions = {item["id"]: pos for pos, item in enumerate(items)}
+    except (KeyError, TypeError):
+        # an item without an id, or one that isn't a dictionary
+        return None
+    if len(positions) != len(items) or None in positions:
+        return None
+    return positions
+
+
+def diff_collection(old: list, new: list) -> CollectionDelta | None:
+    """Match the items of two versions of a collection by id, and share the unchanged ones.
+
+    Items of `new` equal to the old item with the same id are replaced by the old item,
+    so the two versions share them and anything built from the old items still refers to
+    the current ones. None if an item has no id, or two have the same one.
+    """
+    old_positions, new_positions = _positions(old), _positions(new)
+    if old_positions is None or new_positions is None:
+        return None
+    added, updated = [], []
+    retained = []
+    for pos, item in enumerate(new):
+        old_pos = old_positions.get(item["id"])
+        if old_pos is None:
+            added.append((pos, item))
+            continue
+        retained.append(old_pos)
+        if old[old_pos] == item:
+            new[pos] = old[old_pos]
+        else:
+            updated.append((old_pos, old[old_pos], pos, item))
+    removed = [
+        (pos, old[pos])
+        for item_id, pos in old_positions.items()
+        if item_id not in new_positions
+    ]
+    in_order = all(a < b for a, b in pairwise(retained))
+    return CollectionDelta(added, updated, removed, in_order)
+
+
+def diff_snapshots(old: dict, new: dict) -> SnapshotDelta:
+    """The collections that changed from `old` to `new`, sharing what didn't with `old`.
+
+    Unchanged collections and values in `new` are replaced by the old ones, and so are
+    unchanged items of changed collections (see `diff_collection`).
+    """
+    delta: SnapshotDelta = {}
+    for name in old.keys() | new.keys():
+        if name not in old or name not in new:
+            delta[name] = None
+            continue
+        before, after = old[name], new[name]
+        if not isinstance(before, list) or not isinstance(after, list):
+            if before == after:
+                new[name] = before
+            else:
+                delta[name] = None
+            continue
+        changes = diff_collection(before, after)
+        if changes is None:
+            if before == after:
+                new[name] = before
+            else:
+                delta[name] = None
+        elif (
+            changes.added or changes.updated or changes.removed or not changes.in_order
+        ):
+            delta[name] = changes
+        else:
+            new[name] = before
+    return delta
+
+
+def shift_bits(mask: int, moves: list[tuple[int, int, int]]) -> int:
+    """Move the bits of `mask` by `moves`, from `CollectionDelta.moves`.
+
+    Bits of positions that were removed must already be cleared.
+    """
+    if not moves:
+        return mask
+    moved = 0
+    for start, stop, _ in moves:
+        moved |= mask & (((1 << (stop - start)) - 1) << start)
+    mask ^= moved
+    for start, stop, shift in moves:
+        run = (moved >> start) & ((1 << (stop - start)) - 1)
+        mask |= run << (start + shift)
+    return mask
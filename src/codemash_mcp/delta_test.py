@@ -0,0 +1,280 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.changes import _map_records, records_of
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.delta import diff_collection, diff_snapshots, shift_bits
+from codemash_mcp.facets import FacetIndex, facets_of
+from codemash_mcp.snapshot import Snapshot
+from codemash_mcp.sqlite_engine import GAP, _positions_after, sqlite_of
+from codemash_mcp.timeline import build_timelines, timelines_of
+
+DATA_DIRECTORY = Path(__file__).parents[2] / "data"
+
+
+def _items(*ids: str, **fields) -> list[dict]:
+    return [{"id": item_id, **fields} for item_id in ids]
+
+
+def test_diff_collection():
+    old = _items("a", "b", "c", "d")
+    new = [*_items("a", "b"), {"id": "c", "title": "C"}, *_items("e")]
+
+    changes = diff_collection(old, new)
+    assert changes is not None
+    assert changes.added == [(3, {"id": "e"})]
+    assert changes.updated == [(2, {"id": "c"}, 2, {"id": "c", "title": "C"})]
+    assert changes.removed == [(3, {"id": "d"})]
+    assert changes.in_order
+    assert changes.keys("id") == {"c", "d", "e"}
+    # unchanged items are the old ones
+    assert new[0] is old[0] and new[1] is old[1]
+
+
+def test_diff_collection_notices_reordering():
+    changes = diff_collection(_items("a", "b", "c"), _items("c", "a", "b"))
+    assert changes is not None
+    assert not changes.in_order
+    assert not changes.added and not changes.updated and not changes.removed
+
+
+@pytest.mark.parametrize(
+    "items", [[{"id": "a"}, {"id": "a"}], [{"id": "a"}, {"title": "no id"}]]
+)
+def test_diff_collection_needs_unique_ids(items):
+    assert diff_collection(_items("a"), items) is None
+
+
+def test_diff_snapshots_shares_what_did_not_change():
+    old = {
+        "sessions": _items("a", "b"),
+        "tracks": _items("t"),
+        "site": {"name": "CodeMash"},
+        "links": [{"url": "x"}],
+    }
+    new = {
+        "sessions": [*_items("a"), {"id": "b", "title": "B"}],
+        "tracks": _items("t"),
+        "site": {"name": "CodeMash"},
+        "links": [{"url": "y"}],
+        "hotels": [],
+    }
+
+    delta = diff_snapshots(old, new)
+    assert set(delta) == {"sessions", "links", "hotels"}
+    # without ids, and new, collections are replaced outright
+    assert delta["links"] is None and delta["hotels"] is None
+    assert new["tracks"] is old["tracks"]
+    assert new["site"] is old["site"]
+    assert new["sessions"][0] is old["sessions"][0]
+
+
+def test_moves_and_shift_bits_follow_the_positions():
+    rng = random.Random(7)
+    for _ in range(200):
+        old = _items(*(str(i) for i in range(rng.randint(0, 40))))
+        new = [item for item in old if rng.random() > 0.2]
+        for i in range(rng.randint(0, 5)):
+            new.insert(rng.randint(0, len(new)), {"id": f"new{i}"})
+        changes = diff_collection(old, new)
+        assert changes is not None and changes.in_order
+
+        bits = rng.getrandbits(len(old)) if old else 0
+        for pos, _ in changes.removed:
+            bits &= ~(1 << pos)
+        positions = {item["id"]: pos for pos, item in enumerate(new)}
+        expected = 0
+        for pos, item in enumerate(old):
+            if bits >> pos & 1:
+                expected |= 1 << positions[item["id"]]
+        assert shift_bits(bits, changes.moves(len(old))) == expected
+
+
+def test_carry_over_patches_lookups_and_groups():
+    old = Snapshot(
+        {
+            "sessions": _items("s1", "s2", "s3"),
+            "sessionSpeakers": [
+                {"id": "l1", "session": "s1", "speaker": "a"},
+                {"id": "l2", "session": "s2", "speaker": "a"},
+                {"id": "l3", "session": "s3", "speaker": "b"},
+            ],
+        }
+    )
+    old.lookup("sessions")
+    old.group("sessionSpeakers", "speaker")
+    old.group("sessionSpeakers", "session")
+    new = Snapshot(
+        {
+            "sessions": _items("s1", "s3", "s4"),
+            "sessionSpeakers": [
+                {"id": "l1", "session": "s1", "speaker": "a"},
+                {"id": "l3", "session": "s3", "speaker": "a"},
+                {"id": "l4", "session": "s4", "speaker": "c"},
+            ],
+        }
+    )
+    fresh = Snapshot(json.loads(json.dumps(new)))
+
+    new.carry_over(old)
+    assert new._lookups == {("sessions", "id"): fresh.lookup("sessions")}
+    assert new._groups == {
+        key: fresh.group(*key)
+        for key in [("sessionSpeakers", "speaker"), ("sessionSpeakers", "session")]
+    }
+
+
+def test_carry_over_keeps_derived_structures_whose_inputs_did_not_change():
+    def count_added(count, data, delta):
+        changes = delta["sessions"]
+        assert changes is not None
+        return count + len(changes.added)
+
+    old = Snapshot({"sessions": _items("s1"), "tracks": _items("t1")})
+    tracks = old.derived("tracks", lambda data: len(data["tracks"]), inputs=["tracks"])
+    old.derived("everything", lambda data: len(data))
+    old.derived("sessions", lambda data: len(data["sessions"]), inputs=["sessions"])
+    old.derived(
+        "updated",
+        lambda data: len(data["sessions"]),
+        inputs=["sessions"],
+        update=count_added,
+    )
+    old.derived("broken", lambda data: 0, inputs=["sessions"], update=lambda *_: 1 / 0)
+
+    new = Snapshot({"sessions": _items("s1", "s2"), "tracks": _items("t1")})
+    assert set(new.carry_over(old)) == {"sessions"}
+    assert new._derived == {"tracks": tracks, "updated": 2}
+    # the rest are built again when they're used
+    assert new.derived("sessions", lambda data: len(data["sessions"])) == 2
+
+
+def test_added_rows_are_numbered_between_their_neighbours():
+    old = _items("a", "b")
+    between = diff_collection(old, [old[0], *_items("x", "y"), old[1]])
+    assert between is not None
+    assert _positions_after([0, 90], between, 4) == [0, 30, 60, 90]
+    # no room left, the engine is built again
+    assert _positions_after([0, 1], between, 4) is None
+
+    around = diff_collection(old, [*_items("x"), old[1], *_items("y")])
+    assert around is not None
+    assert _positions_after([0, 90], around, 3) == [90 - GAP, 90, 90 + GAP]
+
+
+# Edits to the 2026 export, as a new data drop would make them
+def _small_delta(data: dict):
+    sessions = data["sessions"]
+    cancelled = sessions.pop(10)["id"]
+    data["sessionSpeakers"] = [
+        item for item in data["sessionSpeakers"] if item["session"] != cancelled
+    ]
+    sessions[20] = {**sessions[20], "startTime": "1630", "duration": "30"}
+    sessions.insert(30, {**sessions[30], "id": "new-session"})
+    data["sessionSpeakers"].append(
+        {**data["sessionSpeakers"][0], "id": "new-link", "session": "new-session"}
+    )
+    translation = next(
+        t for t in data["sessionTranslations"] if t["session"] == sessions[40]["id"]
+    )
+    translation["title"] = "Kubernetes for Cooks"
+    data["userProfiles"][0]["name"] = "Renamed"
+
+
+def _speaker_changes(data: dict):
+    speaker = data["speakers"].pop(3)
+    data["sessionSpeakers"] = [
+        item for item in data["sessionSpeakers"] if item["speaker"] != speaker["id"]
+    ]
+    link = data["sessionSpeakers"][5]
+    data["sessionSpeakers"][5] = {**link, "session": data["sessions"][100]["id"]}
+    data["speakers"].append({**data["speakers"][0], "id": "new-speaker"})
+
+
+def _appended(data: dict):
+    data["sessions"].append({**data["sessions"][0], "id": "last"})
+
+
+def _reordered(data: dict):
+    data["sessions"].reverse()
+
+
+def _track_renamed(data: dict):
+    data["trackTranslations"][0]["title"] = "Renamed Track"
+
+
+QUERIES = [
+    ("sessions", {}),
+    ("sessions", {"day_of_week": "THURSDAY", "track_name": "AI/ML"}),
+    ("sessions", {"speaker_name": "renamed"}),
+    ("sessions", {"start_time_range": "1600", "end_time_range": "1700"}),
+    ("speakers", {}),
+    ("speakers", {"track_name": "web"}),
+    ("session_facets", {}),
+    ("session_facets", {"day_of_week": "WEDNESDAY", "speaker_name": "an"}),
+    ("now_and_next", {"at": "2026-01-15T16:35"}),
+    ("build_schedule", {"keywords": ["kubernetes"], "days": ["THURSDAY"]}),
+    ("tracks", {}),
+]
+
+
+@pytest.mark.parametrize("backend", ["python", "sqlite"])
+@pytest.mark.parametrize(
+    "edit", [_small_delta, _speaker_changes, _appended, _reordered, _track_renamed]
+)
+def test_reload_matches_a_fresh_load(tmp_path, backend, edit):
+    data_file = tmp_path / "data.json"
+    data = json.loads((DATA_DIRECTORY / "endpoint-3.json").read_text())
+    data_file.write_text(json.dumps(data))
+    reader = CodeMashDataReader(data_file, backend=backend)
+    for name, arguments in QUERIES:
+        getattr(reader, name)(**arguments)
+    records_of(reader.data)
+
+    edit(data)
+    data_file.write_text(json.dumps(data))
+    reader.reload()
+    fresh = CodeMashDataReader(data_file, backend=backend)
+
+    for name, arguments in QUERIES:
+        assert getattr(reader, name)(**arguments) == getattr(fresh, name)(**arguments)
+    assert records_of(reader.data) == _map_records(fresh.data)
+    assert vars(facets_of(reader.data)) == vars(FacetIndex(fresh.data))
+    assert {
+        agenda: vars(timeline) for agenda, timeline in timelines_of(reader.data).items()
+    } == {
+        agenda: vars(timeline)
+        for agenda, timeline in build_timelines(fresh.data).items()
+    }
+    for key, index in reader.data._lookups.items():
+        assert index == fresh.data.lookup(*key)
+    for key, index in reader.data._groups.items():
+        assert index == fresh.data.group(*key)
+
+
+def test_small_delta_updates_indexes_in_place(tmp_path):
+    data_file = tmp_path / "data.json"
+    data = json.loads((DATA_DIRECTORY / "endpoint-3.json").read_text())
+    data_file.write_text(json.dumps(data))
+    reader = CodeMashDataReader(data_file, backend="sqlite")
+    reader.sessions(day_of_week="THURSDAY")
+    reader.session_facets(room_name="salon a")
+    reader.now_and_next(at="2026-01-15T10:30")
+    records_of(reader.data)
+    previous = reader.data
+
+    _small_delta(data)
+    data_file.write_text(json.dumps(data))
+    reader.reload()
+
+    derived = reader.data._derived
+    assert {"sqlite", "facets", "timelines", "records", "room_names"} <= set(derived)
+    # nothing the rooms are built from changed
+    assert derived["room_names"] is previous._derived["room_names"]
+    assert reader.data["tracks"] is previous["tracks"]
+    assert derived["sqlite"] is not previous._derived["sqlite"]
+    # the old snapshot's engine still answers for it
+    assert sqlite_of(previous).sessions() == previous["sessions"]
@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
+
+from fastmcp.exceptions import ToolError
+
+from codemash_mcp.progress import ProgressReporter, progress_reporter, run_reported
+
+logger = logging.getLogger(__name__)
+
+ExecutorKind = Literal["thread", "process"]
+
+# The object tool calls are dispatched to inside a worker process. Each worker builds
+# its own copy once, so calls only ship the method name and arguments across.
+_worker_target: Any = None
+
+
+def _init_worker(target_factory: Callable[[], Any]):
+    global _worker_target
+    _worker_target = target_factory()
+
+
+def _call_in_worker(method_name: str, args: tuple, kwargs: dict):
+    return getattr(_worker_target, method_name)(*args, **kwargs)
+
+
+class ServerBusyError(ToolError):
+    """Raised when the tool worker pool and its queue are both full."""
+
+
+class ToolExecutor:
+    """Runs synchronous tool functions on a bounded worker pool.
+
+    Tools are CPU-bound and would otherwise run on the event loop, stalling every other
+    request (including health checks) while they work. At most `max_workers` calls run
+    at once and at most `max_queue` more wait for a worker. Anything beyond that is
+    rejected immediately with a `ServerBusyError` instead of queuing without bound.
+
+    In "process" mode, `target_factory` must be a picklable callable that builds the
+    object whose methods are offloaded (i.e. the `CodeMashDataReader`).
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind = "thread",
+        max_workers: int = 4,
+        max_queue: int = 16,
+        target_factory: Callable[[], Any] | None = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue cannot be negative")
+
+        if kind == "process" and target_factory is None:
+            raise ValueError("target_factory is required for the process executor")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._target_factory = target_factory
+        self._pool = self._create_pool()
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _create_pool(self) -> Executor:
+        if self.kind == "process":
+            # checked in __init__
+            assert self._target_factory is not None
+            # forking a process that already runs threads (logging, anyio) can deadlock
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+                initargs=(self._target_factory,),
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="codemash-tool"
+        )
+
+    def restart_workers(self):
+        """Replace worker processes, so they rebuild their target (i.e. after a reload).
+
+        Calls already running finish on the old workers. Thread workers share the
+        target with the server, so there is nothing to do for them.
+        """
+        if self.kind != "process":
+            return
+        previous, self._pool = self._pool, self._create_pool()
+        previous.shutdown(wait=False)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _acquire(self, name: str):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                busy = True
+            else:
+                self._pending += 1
+                self._submitted += 1
+                busy = False
+        if busy:
+            logger.warning(f"Rejected call to {name}, tool executor is saturated")
+            raise ServerBusyError(
+                "The server is busy handling other requests. Please retry shortly."
+            )
+
+    def _release(self, future: Future):
+        # runs on the worker side when the call finishes, even if the caller went away
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def _submit(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        reporter: ProgressReporter | None = None,
+    ) -> Future:
+        if self.kind == "process":
+            return self._pool.submit(_call_in_worker, fn.__name__, args, kwargs)
+        return self._pool.submit(
+            run_reported, reporter, functools.partial(fn, *args, **kwargs)
+        )
+
+    def offload(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap `fn` in a coroutine function that runs it on the worker pool.
+
+        The wrapper keeps the name, docstring and signature of `fn`, so it can be
+        registered as a tool in place of the original. On worker threads, calls whose
+        client asked for progress report it (see `progress.reported`); worker
+        processes can't reach the client, so their calls don't.
+        """
+
+        @functools.wraps(fn)
+        async def run_in_pool(*args, **kwargs):
+            reporter = progress_reporter() if self.kind == "thread" else None
+            self._acquire(fn.__name__)
+            try:
+                future = self._submit(fn, args, kwargs, reporter)
+            except BaseException:
+                with self._lock:
+                    self._pending -= 1
+                    self._failed += 1
+                raise
+            future.add_done_callback(self._release)
+            try:
+                return await asyncio.wrap_future(future)
+            finally:
+                # so the notifications reach the client before the result
+                if reporter is not None:
+                    await reporter.flush()
+
+        return run_in_pool
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
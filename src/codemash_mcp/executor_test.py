@@ -0,0 +1,100 @@
+import asyncio
+import functools
+import inspect
+import threading
+
+import pytest
+
+from codemash_mcp.executor import ServerBusyError, ToolExecutor
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class Target:
+    def __init__(self, base: int = 0):
+        self.base = base
+
+    def add(self, value: int) -> int:
+        """Adds a value to the base."""
+        return self.base + value
+
+
+class TestToolExecutor:
+    def test_should_keep_name_and_docstring(self):
+        executor = ToolExecutor(max_workers=1, max_queue=0)
+        wrapped = executor.offload(Target().add)
+        assert wrapped.__name__ == "add"
+        assert wrapped.__doc__ == "Adds a value to the base."
+        assert inspect.iscoroutinefunction(wrapped)
+        executor.shutdown()
+
+    @pytest.mark.anyio
+    async def test_should_run_on_worker_thread(self):
+        executor = ToolExecutor(max_workers=1, max_queue=0)
+
+        def whoami():
+            return threading.current_thread().name
+
+        name = await executor.offload(whoami)()
+        assert name.startswith("codemash-tool")
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    @pytest.mark.anyio
+    async def test_should_reject_when_saturated(self):
+        executor = ToolExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        def block():
+            release.wait(5)
+            return "done"
+
+        blocked = executor.offload(block)
+        first = asyncio.ensure_future(blocked())
+        second = asyncio.ensure_future(blocked())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServerBusyError):
+            await blocked()
+
+        release.set()
+        assert await first == "done"
+        assert await second == "done"
+
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["pending"] == 0
+        executor.shutdown()
+
+    @pytest.mark.anyio
+    async def test_should_count_failures(self):
+        executor = ToolExecutor(max_workers=1, max_queue=0)
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await executor.offload(fail)()
+        assert executor.stats()["failed"] == 1
+        assert executor.stats()["pending"] == 0
+        executor.shutdown()
+
+    @pytest.mark.anyio
+    async def test_should_run_in_worker_process(self):
+        executor = ToolExecutor(
+            kind="process",
+            max_workers=1,
+            max_queue=0,
+            target_factory=functools.partial(Target, 40),
+        )
+        # the local instance is ignored, the worker uses its own Target(40)
+        assert await executor.offload(Target().add)(2) == 42
+        executor.shutdown()
+
+    def test_should_require_factory_for_process(self):
+        with pytest.raises(ValueError):
+            ToolExecutor(kind="process")
@@ -0,0 +1,141 @@
+from typing import Any
+
+from codemash_mcp.helpers import event_id_of, is_codemash_event
+from codemash_mcp.snapshot import Snapshot
+from codemash_mcp.types import BoothFacility, ExpoBooth, Sponsor
+
+# What the sponsor and booth listings are joined from. Few calls ask for them, so
+# they're built on first use rather than with the snapshot's indexes.
+SPONSOR_INPUTS = [
+    "events",
+    "sponsors",
+    "sponsorTranslations",
+    "sponsorshipTypeTranslations",
+    "boothCategories",
+    "boothCategoryTranslations",
+]
+BOOTH_INPUTS = [
+    "events",
+    "boothCategories",
+    "boothCategoryTranslations",
+    "boothCategoryFacilities",
+    "expoFacilities",
+    "expoFacilityTranslations",
+    "sponsorshipTypeTranslations",
+]
+
+
+def _sponsorship_names(data: Any) -> dict[str, str]:
+    names: dict[str, str] = {}
+    for translation in data.get("sponsorshipTypeTranslations", []):
+        names.setdefault(translation.get("sponsorshipType"), translation.get("name"))
+    return names
+
+
+def _booth_names(data: Any) -> dict[str, str]:
+    names: dict[str, str] = {}
+    for translation in data.get("boothCategoryTranslations", []):
+        names.setdefault(translation.get("boothCategory"), translation.get("name"))
+    return names
+
+
+def build_sponsors(data: Any) -> list[Sponsor]:
+    """The event's sponsors, with their sponsorship and the booth that comes with it."""
+    event_id = event_id_of(data)
+    sponsorships = _sponsorship_names(data)
+    descriptions: dict[str, str | None] = {}
+    for translation in data.get("sponsorTranslations", []):
+        descriptions.setdefault(
+            translation.get("sponsor"), translation.get("description")
+        )
+    booth_names = _booth_names(data)
+    booths: dict[str, str] = {}
+    for category in data.get("boothCategories", []):
+        if category.get("sponsorshipType") and not category.get("hidden"):
+            booths.setdefault(
+                category["sponsorshipType"],
+                booth_names.get(category.get("id")) or category.get("name", ""),
+            )
+
+    sponsor_list = []
+    for sponsor in data.get("sponsors", []):
+        if not is_codemash_event(sponsor, event_id=event_id):
+            continue
+        sponsorship = sponsor.get("sponsorshipType")
+        sponsor_list.append(
+            Sponsor(
+                {
+                    "id": sponsor.get("id"),
+                    "company": sponsor.get("companyName") or "",
+                    "sponsorship": sponsorships.get(sponsorship) or "",
+                    "website": sponsor.get("websiteUrl") or "",
+                    "description": descriptions.get(sponsor.get("id")),
+                    "booth": booths.get(sponsorship),
+                }
+            )
+        )
+    return sponsor_list
+
+
+def build_booths(data: Any) -> list[ExpoBooth]:
+    """The event's expo booth packages, in the event's order, with what each includes."""
+    event_id = event_id_of(data)
+    facility_names: dict[str, str] = {}
+    for translation in data.get("expoFacilityTranslations", []):
+        facility_names.setdefault(
+            translation.get("expoFacility"), translation.get("facilityName")
+        )
+    facilities = {}
+    for facility in data.get("expoFacilities", []):
+        if facility.get("hidden") or not is_codemash_event(facility, event_id=event_id):
+            continue
+        facilities.setdefault(
+            facility.get("id"),
+            facility_names.get(facility.get("id")) or facility.get("name", ""),
+        )
+    includes: dict[str, list[BoothFacility]] = {}
+    for item in data.get("boothCategoryFacilities", []):
+        name = facilities.get(item.get("expoFacility"))
+        # a count of 0 is a facility the package doesn't include
+        if name is not None and item.get("count"):
+            includes.setdefault(item.get("boothCategory"), []).append(
+                BoothFacility({"name": name, "count": item["count"]})
+            )
+    sponsorships = _sponsorship_names(data)
+    booth_names = _booth_names(data)
+
+    categories = [
+        category
+        for category in data.get("boothCategories", [])
+        if not category.get("hidden") and is_codemash_event(category, event_id=event_id)
+    ]
+    categories.sort(key=lambda category: category.get("index") or 0)
+    return [
+        ExpoBooth(
+            {
+                "id": category.get("id"),
+                "name": booth_names.get(category.get("id")) or category.get("name", ""),
+                "price": category.get("price") or 0,
+                # "10:20" in the export, for a 10 by 20 foot booth
+                "size": (
+                    (category.get("dimensions") or {}).get("dimensions") or ""
+                ).replace(":", "x"),
+                "sold_out": bool(category.get("isSoldOut")),
+                "sponsorship": sponsorships.get(category.get("sponsorshipType")),
+                "includes": includes.get(category.get("id"), []),
+            }
+        )
+        for category in categories
+    ]
+
+
+def sponsors_of(data: Any) -> list[Sponsor]:
+    if isinstance(data, Snapshot):
+        return data.derived("sponsors", build_sponsors, inputs=SPONSOR_INPUTS)
+    return build_sponsors(data)
+
+
+def booths_of(data: Any) -> list[ExpoBooth]:
+    if isinstance(data, Snapshot):
+        return data.derived("expo_booths", build_booths, inputs=BOOTH_INPUTS)
+    return build_booths(data)
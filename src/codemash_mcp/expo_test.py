@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.expo import build_booths, build_sponsors
+from codemash_mcp.snapshot import load_snapshot
+
+DATA_DIR = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture
+def reader():
+    return CodeMashDataReader(DATA_DIR / "endpoint-3.json")
+
+
+def test_sponsors_have_their_sponsorship(reader):
+    sponsors = reader.sponsors()
+    assert [(s["company"], s["sponsorship"]) for s in sponsors] == [
+        ("AWS", "Lanyard"),
+        ("AWS", "Table Tents (1 meal)"),
+        ("CNWR", "Waterpark Party"),
+        ("Improving", "Game Room"),
+        ("GitButler", "Waterpark Party"),
+    ]
+    assert sponsors[0]["website"] == "https://aws.amazon.com"
+
+
+@pytest.mark.parametrize(
+    "kwargs, companies",
+    [
+        ({"company_name": "aws"}, ["AWS", "AWS"]),
+        ({"sponsorship": "waterpark"}, ["CNWR", "GitButler"]),
+        ({"company_name": "git", "sponsorship": "party"}, ["GitButler"]),
+        ({"company_name": "nobody"}, []),
+    ],
+)
+def test_sponsors_filters(reader, kwargs, companies):
+    assert [s["company"] for s in reader.sponsors(**kwargs)] == companies
+
+
+def test_expo_booths_are_in_order_with_what_they_include(reader):
+    booths = reader.expo_booths()
+    assert [(b["name"], b["size"], b["price"]) for b in booths] == [
+        ("Gold Exhibitor", "10x10", 4000),
+        ("Platinum Exhibitor", "10x10", 6500),
+        ("Adamantium Exhibitor", "10x20", 10000),
+        ("Unobtanium Exhibitor", "10x30", 18000),
+        ("KidzMash Key Sponsor", "10x10", 4000),
+    ]
+    assert {"name": "Exhibitor Passes", "count": 4} in booths[0]["includes"]
+    assert all(item["count"] for booth in booths for item in booth["includes"])
+
+
+def test_expo_booths_filter(reader):
+    assert [b["name"] for b in reader.expo_booths(booth_name="gold")] == [
+        "Gold Exhibitor"
+    ]
+
+
+def test_indexes_are_built_on_first_use(reader):
+    assert not reader.data.has_derived("sponsors")
+    assert not reader.data.has_derived("expo_booths")
+
+    reader.sponsors()
+    assert reader.data.has_derived("sponsors")
+    assert not reader.data.has_derived("expo_booths")
+
+    booths = reader.data.derived("expo_booths", build_booths)
+    assert reader.expo_booths() == booths
+    assert reader.data.derived("expo_booths", build_booths) is booths
+
+
+def test_data_without_sponsors():
+    data = load_snapshot(DATA_DIR / "test-data.json")
+    assert build_sponsors(data) == []
+    assert build_booths(data) == []
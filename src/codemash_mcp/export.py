@@ -0,0 +1,107 @@
+import json
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from codemash_mcp.helpers import (
+    event_id_of,
+    find_matching_id,
+    is_codemash_event,
+    map_to_session,
+    map_to_speaker,
+)
+
+if TYPE_CHECKING:
+    from codemash_mcp.codemash import CodeMashDataReader
+
+# Lines per chunk written to the response. Big enough that per-chunk overhead (and the
+# compression flush) is amortized, small enough that memory stays flat.
+LINES_PER_CHUNK = 100
+
+
+def _sessions(data: Any) -> Iterator[dict]:
+    for session in data.get("sessions", []):
+        yield dict(map_to_session(data, session))
+
+
+def _speakers(data: Any) -> Iterator[dict]:
+    event_id = event_id_of(data)
+    for speaker in data.get("speakers", []):
+        if is_codemash_event(speaker, event_id=event_id):
+            yield dict(map_to_speaker(data, speaker))
+
+
+def _rooms(data: Any) -> Iterator[dict]:
+    event_id = event_id_of(data)
+    for venue in data.get("sessionVenues", []):
+        if is_codemash_event(venue, event_id=event_id):
+            translation = find_matching_id(
+                data, "sessionVenueTranslations", venue.get("id"), "sessionVenue"
+            )
+            yield {"id": venue.get("id"), "name": translation.get("name", "Unknown")}
+
+
+EXPORTS: dict[str, Callable[[Any], Iterator[dict]]] = {
+    "sessions": _sessions,
+    "speakers": _speakers,
+    "rooms": _rooms,
+}
+
+
+def ndjson(
+    items: Iterator[dict], lines_per_chunk: int = LINES_PER_CHUNK
+) -> Iterator[bytes]:
+    """Encode `items` as newline-delimited JSON, a chunk of lines at a time."""
+    lines = []
+    for item in items:
+        lines.append(json.dumps(item, separators=(",", ":")))
+        if len(lines) >= lines_per_chunk:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    return "*" in tags or etag.removeprefix("W/") in [
+        tag.removeprefix("W/") for tag in tags
+    ]
+
+
+async def export_response(request: Request, reader: "CodeMashDataReader") -> Response:
+    """Stream an export as NDJSON, or 304 if the client's copy is current.
+
+    The ETag is the snapshot version, so it changes exactly when the data does. It's
+    weak, because the compression middleware may send the same lines encoded. The
+    snapshot is resolved on Starlette's thread pool, as an event that isn't loaded yet
+    is read from its file, and lines are mapped from it as they're sent (on the thread
+    pool too, since the iterator is synchronous), so the body is never held in memory.
+    """
+    name = request.path_params["name"]
+    export = EXPORTS.get(name)
+    if export is None:
+        return JSONResponse(
+            {"error": f"Unknown export '{name}'. Valid exports: {', '.join(EXPORTS)}"},
+            status_code=404,
+        )
+    try:
+        data = await run_in_threadpool(
+            reader.snapshot, request.query_params.get("event")
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+
+    etag = f'W/"{data.version}-{name}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(
+        ndjson(export(data)), media_type="application/x-ndjson", headers=headers
+    )
@@ -0,0 +1,118 @@
+import json
+import threading
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.export import etag_matches, export_response, ndjson
+from codemash_mcp.snapshot import REQUIRED_COLLECTIONS
+
+
+@pytest.fixture
+def reader(tmp_path):
+    export = {name: [] for name in REQUIRED_COLLECTIONS}
+    export["events"] = [{"id": "e1"}]
+    export["sessions"] = [{"id": f"s{i}", "duration": "60"} for i in range(3)]
+    export["sessionTranslations"] = [
+        {"session": "s0", "title": "Session 0", "description": "Desc"}
+    ]
+    export["speakers"] = [
+        {"id": "sp1", "event": "e1", "userProfile": "u1"},
+        {"id": "sp2", "event": "other", "userProfile": "u1"},
+    ]
+    export["userProfiles"] = [{"id": "u1", "name": "Alice", "lastName": "Smith"}]
+    export["sessionVenues"] = [{"id": "v1", "event": "e1"}]
+    export["sessionVenueTranslations"] = [{"sessionVenue": "v1", "name": "Salon A"}]
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps(export))
+    return CodeMashDataReader(data_file)
+
+
+@pytest.fixture
+def client(reader):
+    async def export(request):
+        return await export_response(request, reader)
+
+    return TestClient(Starlette(routes=[Route("/export/{name}.ndjson", export)]))
+
+
+def test_should_resolve_the_snapshot_off_the_event_loop(reader, monkeypatch):
+    threads = []
+    snapshot = reader.snapshot
+
+    def resolve(event=None):
+        threads.append(threading.current_thread())
+        return snapshot(event)
+
+    async def export(request):
+        threads.append(threading.current_thread())
+        return await export_response(request, reader)
+
+    monkeypatch.setattr(reader, "snapshot", resolve)
+    client = TestClient(Starlette(routes=[Route("/export/{name}.ndjson", export)]))
+    assert client.get("/export/sessions.ndjson").status_code == 200
+    loop_thread, snapshot_thread = threads
+    assert snapshot_thread is not loop_thread
+
+
+def test_ndjson_chunks_lines():
+    chunks = list(ndjson(iter([{"n": i} for i in range(5)]), lines_per_chunk=2))
+    assert chunks == [b'{"n":0}\n{"n":1}\n', b'{"n":2}\n{"n":3}\n', b'{"n":4}\n']
+    assert list(ndjson(iter([]))) == []
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"v1-sessions"', True),
+        ('"v0-sessions", "v1-sessions"', True),
+        ('W/"v1-sessions"', True),
+        ("*", True),
+        ('"v0-sessions"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"v1-sessions"') is expected
+    assert etag_matches(header, 'W/"v1-sessions"') is expected
+
+
+class TestExportRoute:
+    def test_should_stream_sessions(self, client, reader):
+        response = client.get("/export/sessions.ndjson")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["etag"] == f'W/"{reader.data.version}-sessions"'
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == ["s0", "s1", "s2"]
+        assert lines[0]["description"] == "Desc"
+
+    def test_should_export_speakers_and_rooms_for_the_event(self, client):
+        speakers = client.get("/export/speakers.ndjson").text.splitlines()
+        assert [json.loads(line)["id"] for line in speakers] == ["sp1"]
+        rooms = client.get("/export/rooms.ndjson").text.splitlines()
+        assert [json.loads(line) for line in rooms] == [{"id": "v1", "name": "Salon A"}]
+
+    def test_should_return_304_when_current(self, client):
+        etag = client.get("/export/rooms.ndjson").headers["etag"]
+        response = client.get("/export/rooms.ndjson", headers={"if-none-match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_should_change_etag_on_reload(self, client, reader):
+        etag = client.get("/export/rooms.ndjson").headers["etag"]
+        reader.data_directory.write_text(
+            reader.data_directory.read_text().replace("Salon A", "Salon B")
+        )
+        reader.reload()
+        response = client.get("/export/rooms.ndjson", headers={"if-none-match": etag})
+        assert response.status_code == 200
+        assert "Salon B" in response.text
+
+    def test_should_404_unknown_exports_and_events(self, client):
+        assert client.get("/export/hotels.ndjson").status_code == 404
+        assert client.get("/export/sessions.ndjson?event=nope").status_code == 404
@@ -0,0 +1,217 @@
+import copy
+from typing import Any
+
+from codemash_mcp.delta import SnapshotDelta, shift_bits
+from codemash_mcp.helpers import (
+    SPEAKER_INPUTS,
+    agenda_map_of,
+    event_id_of,
+    find_matching_id,
+    is_codemash_event,
+    sessions_find_speakers,
+    sessions_linked_to,
+)
+from codemash_mcp.snapshot import Snapshot
+from codemash_mcp.types import SessionFacets
+
+FACETS = ["day", "track", "room", "type", "duration"]
+# The facet value of sessions without one. The sessions tool never matches these.
+UNKNOWN = "Unknown"
+# Changes to these reach every session's facets, so the index is built again
+REBUILT_BY = [
+    "agendas",
+    "events",
+    "sessionVenues",
+    "sessionVenueTranslations",
+    "trackTranslations",
+]
+
+
+class FacetIndex:
+    """Bitmask indexes over a snapshot's sessions, for counting without mapping them.
+
+    Sessions are numbered by their position in `sessions`. Every facet value and filter
+    value has an int whose bits are the sessions that have it, so a filter combination
+    is an AND of masks and a count is a popcount.
+    """
+
+    def __init__(self, data: Any):
+        sessions = data.get("sessions", [])
+        self.all = (1 << len(sessions)) - 1
+        self.facets: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        # the sessions without a start time, which pass any time range
+        self.untimed = 0
+        self.start_times: dict[str, int] = {}
+        self.speakers: dict[str, int] = {}
+
+        days = {agenda: day for day, agenda in agenda_map_of(data).items()}
+        event_id = event_id_of(data)
+        for i, session in enumerate(sessions):
+            self._add(data, days, event_id, i, session)
+        self._order_days(days)
+
+    def _add(
+        self, data: Any, days: dict[str, str], event_id: str, i: int, session: dict
+    ):
+        bit = 1 << i
+        room = UNKNOWN
+        venue = find_matching_id(data, "sessionVenues", session.get("venue"))
+        if is_codemash_event(venue, event_id=event_id):
+            room = find_matching_id(
+                data,
+                "sessionVenueTranslations",
+                session.get("venue"),
+                "sessionVenue",
+            ).get("name", UNKNOWN)
+        track = find_matching_id(
+            data, "trackTranslations", session.get("track", ""), "track"
+        ).get("title", UNKNOWN)
+        values = {
+            "day": days.get(session.get("agenda", ""), UNKNOWN),
+            "track": track,
+            "room": room,
+            "type": session.get("sessionType", ""),
+            "duration": str(int(session.get("duration", "0"))),
+        }
+        for facet, value in values.items():
+            masks = self.facets[facet]
+            masks[value] = masks.get(value, 0) | bit
+
+        start_time = session.get("startTime")
+        if start_time:
+            self.start_times[start_time] = self.start_times.get(start_time, 0) | bit
+        else:
+            self.untimed |= bit
+
+        for speaker in sessions_find_speakers(data, session):
+            name = f"{speaker['name']} {speaker['last_name']}".lower()
+            self.speakers[name] = self.speakers.get(name, 0) | bit
+
+    def _order_days(self, days: dict[str, str]):
+        self.facets["day"] = {
+            day: self.facets["day"][day]
+            for day in [*days.values(), UNKNOWN]
+            if day in self.facets["day"]
+        }
+
+    def updated(self, data: Any, delta: SnapshotDelta) -> "FacetIndex | None":
+        """A copy of the index with the sessions that changed, or whose speakers did,
+        indexed again. None if the changes reach further than that."""
+        if any(name in delta for name in REBUILT_BY) or any(
+            name in delta and delta[name] is None
+            for name in ["sessions", *SPEAKER_INPUTS]
+        ):
+            return None
+        changes = delta.get("sessions")
+        if changes is not None and not changes.in_order:
+            return None
+        sessions = data.get("sessions", [])
+        index = copy.copy(self)
+
+        # bits move to the sessions' new positions, leaving out the removed sessions,
+        # and the sessions that changed are cleared and added again
+        removed, moves, positions = 0, [], set()
+        if changes is not None:
+            removed = sum(1 << pos for pos, _ in changes.removed)
+            moves = changes.moves(self.all.bit_length())
+            positions = {pos for pos, _ in changes.added}
+            positions.update(pos for _, _, pos, _ in changes.updated)
+        if linked := sessions_linked_to(data, delta):
+            positions.update(
+                pos
+                for pos, session in enumerate(sessions)
+                if session.get("id") in linked
+            )
+        cleared = ~sum(1 << pos for pos in positions)
+
+        def moved(mask: int) -> int:
+            return shift_bits(mask & ~removed, moves)
+
+        def update(masks: dict[str, int]) -> dict[str, int]:
+            return {
+                value: bits
+                for value, mask in masks.items()
+                if (bits := moved(mask) & cleared)
+            }
+
+        index.facets = {facet: update(masks) for facet, masks in self.facets.items()}
+        index.start_times = update(self.start_times)
+        index.speakers = update(self.speakers)
+        index.untimed = moved(self.untimed) & cleared
+        index.all = (1 << len(sessions)) - 1
+
+        days = {agenda: day for day, agenda in agenda_map_of(data).items()}
+        event_id = event_id_of(data)
+        for pos in sorted(positions):
+            index._add(data, days, event_id, pos, sessions[pos])
+        index._order_days(days)
+        return index
+
+    def mask(
+        self,
+        day_of_week: str | None = None,
+        track_name: str | None = None,
+        room_name: str | None = None,
+        speaker_name: str | None = None,
+        start_time_range: str | None = None,
+        end_time_range: str | None = None,
+        duration: int | None = None,
+    ) -> int:
+        """The sessions that pass the same filters as the sessions tool."""
+        mask = self.all
+        for facet, value in [
+            ("day", day_of_week),
+            ("track", track_name),
+            ("room", room_name),
+            ("duration", str(duration) if duration else None),
+        ]:
+            if value:
+                mask &= self.facets[facet].get(value, 0) if value != UNKNOWN else 0
+        if start_time_range:
+            end = end_time_range or "2400"
+            in_range = self.untimed
+            for start_time, bits in self.start_times.items():
+                if start_time_range <= start_time <= end:
+                    in_range |= bits
+            mask &= in_range
+        if speaker_name:
+            speaker_name = speaker_name.lower()
+            by_speaker = 0
+            for name, bits in self.speakers.items():
+                if speaker_name in name:
+                    by_speaker |= bits
+            mask &= by_speaker
+        return mask
+
+    def counts(self, mask: int) -> SessionFacets:
+        """Count the sessions in `mask` by facet. Days are in event order, other values
+        most common first."""
+        by_facet: dict[str, dict[str, int]] = {}
+        for facet, masks in self.facets.items():
+            counts = [
+                (value, count)
+                for value, bits in masks.items()
+                if (count := (bits & mask).bit_count())
+            ]
+            if facet != "day":
+                counts.sort(key=lambda item: (-item[1], item[0]))
+            by_facet[facet] = dict(counts)
+        return SessionFacets(
+            total=mask.bit_count(),
+            day=by_facet["day"],
+            track=by_facet["track"],
+            room=by_facet["room"],
+            type=by_facet["type"],
+            duration=by_facet["duration"],
+        )
+
+
+def facets_of(data: Any) -> FacetIndex:
+    if isinstance(data, Snapshot):
+        return data.derived(
+            "facets",
+            FacetIndex,
+            inputs=["sessions", *SPEAKER_INPUTS, *REBUILT_BY],
+            update=lambda index, data, delta: index.updated(data, delta),
+        )
+    return FacetIndex(data)
@@ -0,0 +1,60 @@
+from collections import Counter
+from pathlib import Path
+from typing import Dict, cast
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.facets import FacetIndex
+from codemash_mcp.snapshot import Snapshot
+
+DATA_FILE = Path(__file__).parents[2] / "data" / "endpoint-1.json"
+
+
+@pytest.fixture(scope="module")
+def reader():
+    return CodeMashDataReader(DATA_FILE)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"day_of_week": "THURSDAY"},
+        {"day_of_week": "FRIDAY", "track_name": "AI/ML"},
+        {"room_name": "Salon A"},
+        {"speaker_name": "an", "start_time_range": "0900", "end_time_range": "1200"},
+        {"duration": 60, "day_of_week": "WEDNESDAY"},
+        {"track_name": "AI/ML", "speaker_name": "ZZZ"},
+    ],
+)
+def test_facets_match_sessions(reader, filters):
+    sessions = reader.sessions(**filters)
+    facets = reader.session_facets(**filters)
+    assert facets["total"] == len(sessions)
+    assert Counter(facets["track"]) == Counter(s["track"] for s in sessions)
+    assert Counter(facets["room"]) == Counter(s["venue"] for s in sessions)
+    assert Counter(facets["type"]) == Counter(s["type"] for s in sessions)
+    assert Counter(facets["duration"]) == Counter(str(s["duration"]) for s in sessions)
+    assert sum(facets["day"].values()) == len(sessions)
+
+
+def test_counts_order():
+    index = FacetIndex(
+        Snapshot(
+            {
+                "sessions": [
+                    {"id": "1", "sessionType": "Talk", "duration": "60"},
+                    {"id": "2", "sessionType": "Workshop", "duration": "240"},
+                    {"id": "3", "sessionType": "Workshop", "duration": "240"},
+                ]
+            }
+        )
+    )
+    counts = cast(Dict, index.counts(index.all))
+    assert counts["total"] == 3
+    assert list(counts["type"].items()) == [("Workshop", 2), ("Talk", 1)]
+    assert counts["day"] == {"Unknown": 3}
+    # sessions without a value never match a filter on it
+    assert index.mask(day_of_week="Unknown") == 0
+    assert index.counts(index.mask(duration=60)).get("type") == {"Talk": 1}
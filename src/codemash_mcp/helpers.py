@@ -1,5 +1,13 @@
+from collections.abc import Hashable
 from typing import Any, Dict, cast
+
+from codemash_mcp.delta import SnapshotDelta
+from codemash_mcp.snapshot import Snapshot, find_items
 from codemash_mcp.types import (
+    Event,
+    Hotel,
+    Track,
+    Venue,
     Speaker,
     SpeakerSession,
     Session,
@@ -7,6 +15,7 @@ from codemash_mcp.types import (
 )
 
 
+# The defaults for exports that don't describe their own event and agendas
 CODEMASH_EVENT_ID = "76186000006678002"
 CONFERENCE_DAY_AGENDA_MAP: Dict[ConferenceDay, str] = {
     "MONDAY": "76186000008378878",
@@ -18,13 +27,40 @@ CONFERENCE_DAY_AGENDA_MAP: Dict[ConferenceDay, str] = {
 
 
 # --- Generic helper functions ---
-def is_codemash_event(item: Dict, key="event") -> bool:
-    return item.get(key) == CODEMASH_EVENT_ID
+def is_codemash_event(item: Dict, key="event", event_id=CODEMASH_EVENT_ID) -> bool:
+    return item.get(key) == event_id
+
+
+def event_id_of(data) -> str:
+    """The event an export is for, derived from its `events` when it's a Snapshot."""
+    if isinstance(data, Snapshot) and data.event_id:
+        return data.event_id
+    return CODEMASH_EVENT_ID
+
+
+def session_in_event(data, session: Any, event_id: str) -> bool:
+    """Whether `session` is part of the event. Sessions don't say which event they're
+    for, their agenda does, so one without an agenda in the export is taken to be the
+    export's."""
+    agenda = find_matching_id(data, "agendas", session.get("agenda"))
+    return not agenda or is_codemash_event(agenda, event_id=event_id)
+
+
+def agenda_map_of(data) -> Dict[str, str]:
+    """Day name to agenda id, derived from the export's `agendas` when it's a Snapshot."""
+    if isinstance(data, Snapshot) and data.agenda_days:
+        return data.agenda_days
+    return cast(Dict[str, str], CONFERENCE_DAY_AGENDA_MAP)
 
 
 def find_matching_id(
     data, list_name: str, id_value: str | None, item_key="id", default={}
 ):
+    if isinstance(data, Snapshot) and isinstance(id_value, Hashable):
+        return cast(
+            Dict[str, str],
+            data.lookup(list_name, item_key).get(id_value, default),
+        )
     return cast(
         Dict[str, str],
         next(
@@ -55,8 +91,9 @@ def speakers_filter_by_track_name(data, speaker, **kwargs):
     if not track_name:
         return True
     speaker_id = speaker.get("id")
-    for item in data.get("sessionSpeakers", []):
-        if item.get("speaker") == speaker_id and is_codemash_event(item):
+    event_id = event_id_of(data)
+    for item in find_items(data, "sessionSpeakers", "speaker", speaker_id):
+        if is_codemash_event(item, event_id=event_id):
             session = find_matching_id(data, "sessions", item.get("session"))
             track = find_matching_id(
                 data, "trackTranslations", session.get("track", ""), "track"
@@ -73,12 +110,13 @@ speaker_filters = [
 ]
 
 
-def map_to_speaker(data, speaker):
+def map_to_speaker(data, speaker, include_descriptions: bool = True):
     user_profile = find_matching_id(data, "userProfiles", speaker.get("userProfile"))
     speaker_id = speaker.get("id")
     sessions = []
-    for item in data.get("sessionSpeakers", []):
-        if item.get("speaker") == speaker_id and is_codemash_event(item):
+    event_id = event_id_of(data)
+    for item in find_items(data, "sessionSpeakers", "speaker", speaker_id):
+        if is_codemash_event(item, event_id=event_id):
             session = find_matching_id(data, "sessions", item.get("session"))
             session_translations = find_matching_id(
                 data, "sessionTranslations", item.get("session"), "session"
@@ -92,6 +130,7 @@ def map_to_speaker(data, speaker):
             sessions.append(
                 SpeakerSession(
                     {
+                        "id": item.get("session", ""),
                         "title": session_translations.get("title", "Untitled"),
                         "description": session_translations.get("description", ""),
                         "type": session.get("sessionType", ""),
@@ -102,8 +141,11 @@ def map_to_speaker(data, speaker):
                     }
                 )
             )
-    return Speaker(
+            if not include_descriptions:
+                del sessions[-1]["description"]
+    mapped = Speaker(
         {
+            "id": speaker_id,
             "name": user_profile.get("name", "Unknown"),
             "last_name": user_profile.get("lastName", "Unknown"),
             "company": user_profile.get("company"),
@@ -114,6 +156,9 @@ def map_to_speaker(data, speaker):
             "sessions": sessions,
         }
     )
+    if not include_descriptions:
+        del mapped["description"]
+    return mapped
 
 
 # --- Session helper functions ---
@@ -136,10 +181,11 @@ def sessions_validations(start_time_range, end_time_range):
 
 def sessions_find_speakers(data, session):
     speakers = []
-    for session_speaker in data.get("sessionSpeakers", []):
-        if session_speaker.get("session") == session.get("id") and is_codemash_event(
-            session_speaker
-        ):
+    event_id = event_id_of(data)
+    for session_speaker in find_items(
+        data, "sessionSpeakers", "session", session.get("id")
+    ):
+        if is_codemash_event(session_speaker, event_id=event_id):
             speaker = find_matching_id(
                 data, "speakers", session_speaker.get("speaker"), "id"
             )
@@ -148,6 +194,7 @@ def sessions_find_speakers(data, session):
             )
             speakers.append(
                 Speaker(
+                    id=session_speaker.get("speaker", ""),
                     name=user_profile.get("name", ""),
                     last_name=user_profile.get("lastName", ""),
                 )
@@ -155,12 +202,41 @@ def sessions_find_speakers(data, session):
     return speakers
 
 
+# The collections the speakers of a session are found in
+SPEAKER_INPUTS = ["sessionSpeakers", "speakers", "userProfiles"]
+
+
+def speakers_changed_in(data, delta: SnapshotDelta) -> set:
+    """The ids of speakers whose own record, or user profile, changed in `delta`."""
+    speakers = set()
+    if (changes := delta.get("speakers")) is not None:
+        speakers |= changes.keys("id")
+    if (changes := delta.get("userProfiles")) is not None:
+        for profile in changes.keys("id"):
+            for speaker in find_items(data, "speakers", "userProfile", profile):
+                speakers.add(speaker.get("id"))
+    return speakers
+
+
+def sessions_linked_to(data, delta: SnapshotDelta) -> set:
+    """The ids of sessions whose speakers changed in `delta`, whether the links to them,
+    the speakers themselves or their profiles."""
+    sessions = set()
+    if (changes := delta.get("sessionSpeakers")) is not None:
+        sessions |= changes.keys("session")
+    for speaker in speakers_changed_in(data, delta):
+        for item in find_items(data, "sessionSpeakers", "speaker", speaker):
+            sessions.add(item.get("session"))
+    return sessions
+
+
 # Individual filter functions for session filtering
 def sessions_filter_by_day_of_week(data: Any, session: Any, **kwargs):
     day_of_week = kwargs.get("day_of_week")
     if not day_of_week:
         return True
-    return session.get("agenda") == CONFERENCE_DAY_AGENDA_MAP[day_of_week]
+    agenda = agenda_map_of(data).get(day_of_week)
+    return agenda is not None and session.get("agenda") == agenda
 
 
 def sessions_filter_by_time_range(data: Any, session: Any, **kwargs):
@@ -186,7 +262,7 @@ def sessions_filter_by_room(data: Any, session: Any, **kwargs):
         session_venue = find_matching_id(
             data, "sessionVenues", session.get("venue"), "id"
         )
-        if not is_codemash_event(session_venue):
+        if not is_codemash_event(session_venue, event_id=event_id_of(data)):
             return False
 
         # filter by the room name
@@ -221,7 +297,7 @@ def sessions_filter_by_speaker(data: Any, session: Any, **kwargs):
     return True
 
 
-def map_to_session(data, session: Any) -> Session:
+def map_to_session(data, session: Any, include_descriptions: bool = True) -> Session:
     session_translation = find_matching_id(
         data, "sessionTranslations", session.get("id"), "session"
     )
@@ -232,8 +308,9 @@ def map_to_session(data, session: Any) -> Session:
         data, "sessionVenueTranslations", session.get("venue"), "sessionVenue"
     )
     speakers = sessions_find_speakers(data, session)
-    return Session(
+    mapped = Session(
         {
+            "id": session.get("id"),
             "title": session_translation.get("title", "Untitled"),
             "description": session_translation.get("description", ""),
             "type": session.get("sessionType", ""),
@@ -244,6 +321,9 @@ def map_to_session(data, session: Any) -> Session:
             "speakers": speakers,
         }
     )
+    if not include_descriptions:
+        del mapped["description"]
+    return mapped
 
 
 filters = [
@@ -254,3 +334,112 @@ filters = [
     sessions_filter_by_track,
     sessions_filter_by_speaker,
 ]
+
+
+# --- Event helper functions ---
+def map_event(data) -> Event | None:
+    for item in data.get("events", []):
+        if not is_codemash_event(item, "id", event_id=event_id_of(data)):
+            continue
+
+        event_translation = find_matching_id(
+            data, "eventTranslations", item.get("id"), "event"
+        )
+        portal = find_matching_id(data, "portals", item.get("portal"))
+        socials = find_matching_id(
+            data, "eventSocialHandles", item.get("eventSocialHandle")
+        )
+        return Event(
+            {
+                "name": event_translation.get("name", "Unknown"),
+                "description": event_translation.get("description", ""),
+                "summary": event_translation.get("summary", ""),
+                "start_date": item.get("startDate", ""),
+                "end_date": item.get("endDate", ""),
+                "timezone": item.get("timezone", ""),
+                "domain": portal.get("domain", ""),
+                "twitter": socials.get("twitter", ""),
+                "facebook": socials.get("facebook", ""),
+                "linkedin": socials.get("linkedIn", ""),
+                "youtube": socials.get("youtube", ""),
+                "instagram": socials.get("instagram", ""),
+                "website": socials.get("website", ""),
+            }
+        )
+    return None
+
+
+def map_venue(data) -> Venue | None:
+    for venue in data.get("venues", []):
+        if not is_codemash_event(venue, event_id=event_id_of(data)):
+            continue
+
+        venue_translation = find_matching_id(
+            data, "venueTranslations", venue.get("id"), "venue"
+        )
+        return Venue(
+            {
+                "name": venue_translation.get("name", "Unknown"),
+                "street": venue_translation.get("street", ""),
+                "city": venue_translation.get("townOrCity", ""),
+                "state": venue_translation.get("state", ""),
+                "latitude": float(venue.get("latitude")),
+                "longitude": float(venue.get("longitude")),
+                "zipcode": venue.get("zipcode"),
+                "country": venue.get("country"),
+            }
+        )
+    return None
+
+
+def map_hotels(data) -> list[Hotel]:
+    hotel_list = []
+    for hotel in data.get("hotels", []):
+        if not is_codemash_event(hotel, event_id=event_id_of(data)):
+            continue
+
+        hotel_translation = find_matching_id(
+            data, "hotelTranslations", hotel.get("id"), "hotel"
+        )
+        hotel_list.append(
+            Hotel(
+                {
+                    "name": hotel_translation.get("name", ""),
+                    "address": hotel_translation.get("address", ""),
+                    "website": hotel.get("websiteUrl", ""),
+                }
+            )
+        )
+    return hotel_list
+
+
+def map_tracks(data) -> list[Track]:
+    track_list = []
+    for track in data.get("tracks", []):
+        if not is_codemash_event(track, event_id=event_id_of(data)):
+            continue
+
+        track_translation = find_matching_id(
+            data, "trackTranslations", track.get("id"), "track"
+        )
+        track_list.append(
+            Track(
+                {
+                    "name": track_translation.get("title", "Unknown"),
+                }
+            )
+        )
+    return track_list
+
+
+def map_rooms(data) -> list[str]:
+    room_list = []
+    for venue in data.get("sessionVenues", []):
+        if not is_codemash_event(venue, event_id=event_id_of(data)):
+            continue
+
+        venue_translation = find_matching_id(
+            data, "sessionVenueTranslations", venue.get("id"), "sessionVenue"
+        )
+        room_list.append(venue_translation.get("name", "Unknown"))
+    return room_list
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from codemash_mcp.snapshot import (
+    Snapshot,
+    SnapshotValidationError,
+    _file_signature,
+    validate_snapshot,
+)
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+    from codemash_mcp.codemash import CodeMashDataReader
+
+logger = logging.getLogger(__name__)
+
+# Arguments to call each tool with when warming up, by tool name. A function of the
+# snapshot for tools that need something in it, and None for tools left cold.
+WarmUpArguments = dict[
+    str, dict[str, Any] | Callable[[Snapshot], dict[str, Any] | None] | None
+]
+
+
+class Readiness:
+    """Whether the server should be sent traffic, and if not, why not."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._reason = "starting"
+        self._version = ""
+        self._since = time.time()
+        self._warm_up_failures: dict[str, str] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self, version: str, warm_up_failures: dict[str, str] | None = None):
+        with self._lock:
+            self._ready.set()
+            self._reason = ""
+            self._version = version
+            self._since = time.time()
+            self._warm_up_failures = warm_up_failures or {}
+
+    def mark_not_ready(self, reason: str):
+        with self._lock:
+            self._ready.clear()
+            self._reason = reason
+            self._since = time.time()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self._ready.is_set(),
+                "reason": self._reason,
+                "version": self._version,
+                "since": self._since,
+                "warm_up_failures": dict(self._warm_up_failures),
+            }
+
+
+def warm_up_arguments_for(
+    arguments: WarmUpArguments, name: str, data: Snapshot
+) -> dict[str, Any] | None:
+    """The arguments to warm tool `name` up with on `data`, or None to leave it cold."""
+    tool_arguments = arguments.get(name, {})
+    return tool_arguments(data) if callable(tool_arguments) else tool_arguments
+
+
+async def warm_up(
+    mcp: "FastMCP", arguments: WarmUpArguments, data: Snapshot
+) -> dict[str, str]:
+    """Call every registered tool once, priming caches, indexes and serializers.
+
+    Tools run through the same path as client calls, including the tool executor and
+    result serialization. `arguments` holds representative arguments per tool name, or
+    None for a tool that's left for its first call to warm up. A tool that fails is left
+    for its first call too, and the error is returned by tool name, so arguments that
+    don't suit a snapshot don't keep it from being served.
+    """
+    timings = {}
+    failures = {}
+    for name, tool in (await mcp.get_tools()).items():
+        start = time.perf_counter()
+        try:
+            tool_arguments = warm_up_arguments_for(arguments, name, data)
+            if tool_arguments is None:
+                continue
+            await tool.run(tool_arguments)
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            failures[name] = str(e)
+            continue
+        timings[name] = round((time.perf_counter() - start) * 1000, 3)
+    logger.info(f"Warm-up finished: {timings}")
+    return failures
+
+
+class SnapshotLifecycle:
+    """Takes a snapshot from loaded to serving, and back again on a hot reload.
+
+    The server is ready once the snapshot is valid, indexed and every tool has been
+    warmed up, or failed to be, which readiness reports. When `reload_interval` is set, the data file is polled for changes and
+    reloaded in place. A reload that fails validation keeps serving the old snapshot but
+    drops readiness, so traffic moves to healthy instances until the file is fixed.
+    """
+
+    def __init__(
+        self,
+        mcp: "FastMCP",
+        reader: "CodeMashDataReader",
+        readiness: Readiness,
+        warm_up_arguments: WarmUpArguments,
+        reload_interval: float = 0,
+    ):
+        self.mcp = mcp
+        self.reader = reader
+        self.readiness = readiness
+        self.warm_up_arguments = warm_up_arguments
+        self.reload_interval = reload_interval
+        self.reload_listeners: list[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._prepared = threading.Event()
+        self._reload_lock = threading.Lock()
+        self._signature = _file_signature(reader.data_directory)
+
+    def start(self):
+        """Validate and warm up the current snapshot, then start watching for changes.
+
+        This runs on background threads, because the server may be built from inside a
+        running event loop (i.e. by the uvicorn factory).
+        """
+        threading.Thread(
+            target=self._prepare, name="codemash-warm-up", daemon=True
+        ).start()
+        if self.reload_interval > 0:
+            threading.Thread(
+                target=self._watch, name="codemash-reload", daemon=True
+            ).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_prepared(self, timeout: float | None = None) -> bool:
+        """Wait for the first snapshot to be validated and warmed up, or to fail to be.
+
+        Returns False if it hadn't been within `timeout`. Whether it's ready is up to
+        `readiness`.
+        """
+        return self._prepared.wait(timeout)
+
+    def _prepare(self):
+        try:
+            self._validate_and_warm_up()
+        finally:
+            self._prepared.set()
+
+    def _validate_and_warm_up(self):
+        snapshot = self.reader.data
+        try:
+            validate_snapshot(snapshot)
+            failures = asyncio.run(warm_up(self.mcp, self.warm_up_arguments, snapshot))
+        except SnapshotValidationError as e:
+            logger.error(f"Snapshot {snapshot.version} failed validation: {e}")
+            self.readiness.mark_not_ready(f"invalid snapshot: {e}")
+            return
+        except Exception as e:
+            logger.exception("Warm-up failed")
+            self.readiness.mark_not_ready(f"warm-up failed: {e}")
+            return
+        self.readiness.mark_ready(snapshot.version, warm_up_failures=failures)
+
+    def reload(self) -> bool:
+        """Reload the data file now. Returns True if the new snapshot was swapped in."""
+        with self._reload_lock:
+            previous = self.reader.data.version
+            try:
+                snapshot = self.reader.reload()
+            except (ValueError, OSError) as e:
+                # bad JSON and failed validation are both ValueErrors
+                logger.error(f"Reload of {self.reader.data_directory} failed: {e}")
+                self.readiness.mark_not_ready(f"invalid snapshot: {e}")
+                return False
+            except Exception as e:
+                # i.e. a bug carrying indexes over, the current snapshot keeps serving
+                # and the watcher keeps watching for the next change
+                logger.exception(f"Reload of {self.reader.data_directory} failed")
+                self.readiness.mark_not_ready(f"reload failed: {e}")
+                return False
+
+            logger.info(f"Reloaded snapshot {previous} -> {snapshot.version}")
+            for listener in self.reload_listeners:
+                try:
+                    listener()
+                except Exception:
+                    logger.exception("Reload listener failed")
+            self._prepare()
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            signature = _file_signature(self.reader.data_directory)
+            if signature != self._signature:
+                self._signature = signature
+                self.reload()
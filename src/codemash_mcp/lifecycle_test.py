@@ -0,0 +1,163 @@
+import json
+import time
+
+import pytest
+from fastmcp import FastMCP
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.lifecycle import Readiness, SnapshotLifecycle
+from codemash_mcp.snapshot import REQUIRED_COLLECTIONS
+
+
+def _write_export(path, title="Session 1"):
+    export = {name: [] for name in REQUIRED_COLLECTIONS}
+    export["events"] = [{"id": "e1"}]
+    export["sessions"] = [{"id": "s1"}]
+    export["sessionTranslations"] = [{"session": "s1", "title": title}]
+    path.write_text(json.dumps(export))
+
+
+@pytest.fixture
+def lifecycle(tmp_path):
+    data_file = tmp_path / "data.json"
+    _write_export(data_file)
+    reader = CodeMashDataReader(data_file)
+    calls = []
+
+    def sessions() -> list[str]:
+        calls.append("sessions")
+        return [reader.data["sessionTranslations"][0]["title"]]
+
+    mcp = FastMCP("test")
+    mcp.tool(sessions)
+    lifecycle = SnapshotLifecycle(mcp, reader, Readiness(), {})
+    lifecycle.calls = calls  # pyright: ignore[reportAttributeAccessIssue]
+    return lifecycle
+
+
+class TestReadiness:
+    def test_should_start_not_ready(self):
+        readiness = Readiness()
+        assert not readiness.ready
+        assert readiness.status()["reason"] == "starting"
+
+    def test_should_track_transitions(self):
+        readiness = Readiness()
+        readiness.mark_ready("v1")
+        assert readiness.wait(0)
+        assert readiness.status()["version"] == "v1"
+        readiness.mark_not_ready("reloading")
+        assert not readiness.wait(0)
+        assert readiness.status()["reason"] == "reloading"
+
+
+class TestSnapshotLifecycle:
+    def test_should_be_ready_after_warm_up(self, lifecycle):
+        lifecycle.start()
+        assert lifecycle.readiness.wait(5)
+        assert lifecycle.calls == ["sessions"]
+        assert lifecycle.readiness.status()["version"] == lifecycle.reader.data.version
+
+    def test_should_warm_up_with_arguments_of_the_snapshot(self, lifecycle):
+        warmed_up_on = []
+
+        def session_of(data):
+            warmed_up_on.append(data.version)
+            return None
+
+        lifecycle.warm_up_arguments = {"sessions": session_of}
+        lifecycle._prepare()
+        previous = lifecycle.reader.data.version
+        _write_export(lifecycle.reader.data_directory, title="Session 2")
+        assert lifecycle.reload()
+        assert warmed_up_on == [previous, lifecycle.reader.data.version]
+        # None leaves the tool cold
+        assert lifecycle.calls == []
+
+    def test_should_be_ready_when_a_tool_fails_to_warm_up(self, lifecycle):
+        def rooms(room_name: str) -> list[str]:
+            raise ValueError(f"Unknown room '{room_name}'")
+
+        lifecycle.mcp.tool(rooms)
+        lifecycle.warm_up_arguments = {"rooms": {"room_name": "salon a"}}
+        lifecycle._prepare()
+        assert lifecycle.readiness.ready
+        assert lifecycle.calls == ["sessions"]
+        assert lifecycle.readiness.status()["warm_up_failures"] == {
+            "rooms": "Unknown room 'salon a'"
+        }
+
+    def test_should_not_be_ready_with_invalid_snapshot(self, tmp_path):
+        data_file = tmp_path / "data.json"
+        data_file.write_text("{}")
+        lifecycle = SnapshotLifecycle(
+            FastMCP("test"), CodeMashDataReader(data_file), Readiness(), {}
+        )
+        lifecycle._prepare()
+        assert not lifecycle.readiness.ready
+        assert "missing collection" in lifecycle.readiness.status()["reason"]
+
+    def test_should_swap_in_valid_reload(self, lifecycle):
+        lifecycle._prepare()
+        previous = lifecycle.reader.data.version
+        reloaded = []
+        lifecycle.reload_listeners.append(lambda: reloaded.append(True))
+
+        _write_export(lifecycle.reader.data_directory, title="Session 2")
+        assert lifecycle.reload()
+        assert lifecycle.reader.data.version != previous
+        assert lifecycle.readiness.status()["version"] == lifecycle.reader.data.version
+        assert reloaded == [True]
+        assert lifecycle.calls == ["sessions", "sessions"]
+
+    def test_should_drop_readiness_on_invalid_reload(self, lifecycle):
+        lifecycle._prepare()
+        previous = lifecycle.reader.data
+
+        lifecycle.reader.data_directory.write_text('{"events": []}')
+        assert not lifecycle.reload()
+        assert not lifecycle.readiness.ready
+        # the old snapshot keeps serving
+        assert lifecycle.reader.data is previous
+
+        lifecycle.reader.data_directory.write_text("not json")
+        assert not lifecycle.reload()
+        assert lifecycle.reader.data is previous
+
+    def test_should_keep_serving_when_reload_fails_unexpectedly(
+        self, lifecycle, monkeypatch
+    ):
+        lifecycle._prepare()
+        previous = lifecycle.reader.data
+
+        def reload():
+            raise KeyError("id")
+
+        monkeypatch.setattr(lifecycle.reader, "reload", reload)
+        assert not lifecycle.reload()
+        assert lifecycle.reader.data is previous
+        assert lifecycle.readiness.status()["reason"] == "reload failed: 'id'"
+
+    def test_should_be_prepared_even_when_not_ready(self, tmp_path):
+        data_file = tmp_path / "data.json"
+        data_file.write_text("{}")
+        lifecycle = SnapshotLifecycle(
+            FastMCP("test"), CodeMashDataReader(data_file), Readiness(), {}
+        )
+        lifecycle.start()
+        assert lifecycle.wait_prepared(5)
+        assert not lifecycle.readiness.ready
+
+    def test_should_reload_when_file_changes(self, lifecycle):
+        lifecycle.reload_interval = 0.01
+        lifecycle.start()
+        assert lifecycle.readiness.wait(5)
+        previous = lifecycle.reader.data.version
+
+        _write_export(lifecycle.reader.data_directory, title="A much longer title")
+        for _ in range(500):
+            if lifecycle.reader.data.version != previous:
+                break
+            time.sleep(0.01)
+        lifecycle.stop()
+        assert lifecycle.reader.data.version != previous
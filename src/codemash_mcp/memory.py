@@ -0,0 +1,244 @@
+"""Memory accounting for a reader: its snapshots' collections, indexes and caches.
+
+Run `python -m codemash_mcp.memory` to load a data file the way a tool worker does,
+warm it up and print the report, optionally with the top allocation sites of the
+warm-up traced by tracemalloc.
+"""
+
+import argparse
+import json
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from types import FunctionType, MethodType, ModuleType
+from typing import TYPE_CHECKING, Any
+
+from codemash_mcp.lifecycle import WarmUpArguments, warm_up_arguments_for
+from codemash_mcp.snapshot import Snapshot
+
+if TYPE_CHECKING:
+    from codemash_mcp.codemash import CodeMashDataReader
+
+# Objects of other packages (locks, thread pools, connections) are counted shallowly
+TRAVERSED_MODULE_PREFIX = "codemash_mcp."
+
+# What `memory_report` can't size, because it isn't Python objects it can walk
+NOT_COUNTED = [
+    "compiled tool output validators (pydantic-core schemas)",
+    "module-level function caches (i.e. compiled keyword patterns)",
+]
+
+
+def deep_size(obj: Any, seen: set[int] | None = None) -> int:
+    """The bytes used by `obj` and everything it refers to that isn't in `seen`.
+
+    Objects are added to `seen` as they're counted, so sizing several structures with
+    one `seen` charges shared objects (i.e. the items an index points at) to the first
+    structure that holds them. Containers, numpy arrays and this package's objects are
+    followed. An object with an `external_bytes()` method adds memory that isn't Python
+    objects, like an SQLite database.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+        if _traversed(item):
+            stack.extend(vars(item).values())
+            external = getattr(item, "external_bytes", None)
+            if callable(external) and isinstance(bytes_used := external(), int):
+                size += bytes_used
+    return size
+
+
+def _traversed(item: Any) -> bool:
+    if isinstance(item, type | ModuleType | FunctionType | MethodType):
+        return False
+    return type(item).__module__.startswith(TRAVERSED_MODULE_PREFIX) and hasattr(
+        item, "__dict__"
+    )
+
+
+def _sizes(items: Iterable[tuple[str, Any]], seen: set[int]) -> dict[str, int]:
+    sizes = {name: deep_size(value, seen) for name, value in items}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def snapshot_report(snapshot: Snapshot, seen: set[int] | None = None) -> dict[str, Any]:
+    """The size of each collection, lookup, group and derived structure of a snapshot.
+
+    Collections are counted first, so an index is charged only for what it adds: its
+    own dictionaries and lists, not the items it points at.
+    """
+    seen = set() if seen is None else seen
+    # derived structures refer back to the snapshot, which must not pull in the rest
+    seen.add(id(snapshot))
+    collections = _sizes(snapshot.items(), seen)
+    lookups = _sizes(
+        ((f"{name}.{key}", index) for (name, key), index in snapshot._lookups.items()),
+        seen,
+    )
+    groups = _sizes(
+        ((f"{name}.{key}", index) for (name, key), index in snapshot._groups.items()),
+        seen,
+    )
+    derived = _sizes(snapshot._derived.items(), seen)
+    return {
+        "version": snapshot.version,
+        "total_bytes": sum(
+            sum(sizes.values()) for sizes in (collections, lookups, groups, derived)
+        ),
+        "collections": collections,
+        "lookups": lookups,
+        "groups": groups,
+        "derived": derived,
+    }
+
+
+def process_memory() -> dict[str, Any]:
+    """The interpreter's resident memory, now and at its peak, in bytes."""
+    status = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    status[key] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    peak = status.get(
+        "VmHWM", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    )
+    report: dict[str, Any] = {"rss_bytes": status.get("VmRSS"), "peak_rss_bytes": peak}
+    if tracemalloc.is_tracing():
+        current, traced_peak = tracemalloc.get_traced_memory()
+        report["traced_bytes"] = current
+        report["traced_peak_bytes"] = traced_peak
+    return report
+
+
+def memory_report(
+    reader: "CodeMashDataReader", caches: Mapping[str, Any] | None = None
+) -> dict[str, Any]:
+    """Everything the reader holds, by event, plus the process's resident memory.
+
+    The reader's change log and any other `caches` (i.e. the server's middleware) are
+    counted after the events, so they're charged only for what the snapshots don't
+    hold. `NOT_COUNTED` lists what the walk can't see.
+    """
+    # caches that refer back to the reader must not pull in the rest of it
+    seen: set[int] = {id(reader)}
+    events = {reader.event_name: snapshot_report(reader.data, seen)}
+    # other events are an LRU cache, only the ones loaded now are counted
+    for name, snapshot in reader.other_events.loaded().items():
+        events[name] = snapshot_report(snapshot, seen)
+    cache_sizes = _sizes([("changes", reader.changes), *(caches or {}).items()], seen)
+    return {
+        "process": process_memory(),
+        "backend": reader.backend,
+        "total_bytes": sum(event["total_bytes"] for event in events.values())
+        + sum(cache_sizes.values()),
+        "events": events,
+        "caches": cache_sizes,
+        "not_counted": NOT_COUNTED,
+    }
+
+
+def traced_allocations(
+    run: Callable[[], Any], top: int = 10, frames: int = 1
+) -> list[dict[str, Any]]:
+    """The `top` allocation sites still holding memory after `run()`, largest first."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        run()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    stats = after.compare_to(before, "traceback" if frames > 1 else "lineno")
+    return [
+        {
+            "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_bytes": stat.size_diff,
+            "count": stat.count_diff,
+        }
+        for stat in stats[:top]
+        if stat.size_diff > 0
+    ]
+
+
+def warm_up_reader(reader: "CodeMashDataReader", arguments: WarmUpArguments):
+    """Call each tool once on the reader itself, building its lazy indexes."""
+    for name in arguments:
+        kwargs = warm_up_arguments_for(arguments, name, reader.data)
+        if kwargs is not None:
+            getattr(reader, name)(**kwargs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from codemash_mcp.codemash import CodeMashDataReader
+    from codemash_mcp.config import Config
+    from codemash_mcp.server import WARM_UP_ARGUMENTS
+    from codemash_mcp.snapshot import load_snapshot
+
+    parser = argparse.ArgumentParser(
+        description="Report the memory a tool worker uses for the data, its indexes and caches."
+    )
+    parser.add_argument(
+        "--data-file", type=Path, help="Override the configured CODEMASH_DATA_FILE."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["python", "sqlite", "columnar"],
+        help="Override the configured CODEMASH_QUERY_BACKEND.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=int,
+        default=0,
+        metavar="TOP",
+        help="Trace the warm-up with tracemalloc and show its TOP allocation sites.",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=1, help="Frames per traced allocation site."
+    )
+    args = parser.parse_args(argv)
+    cfg = Config()  # pyright: ignore[reportCallIssue]
+    data_file = args.data_file or cfg.data_file
+
+    snapshot = load_snapshot(data_file)
+    snapshot.build_indexes()
+    reader = CodeMashDataReader(
+        data_file,
+        snapshot,
+        event_name=cfg.event_name,
+        backend=args.backend or cfg.query_backend,
+    )
+    report: dict[str, Any] = {}
+    if args.trace:
+        report["warm_up_allocations"] = traced_allocations(
+            lambda: warm_up_reader(reader, WARM_UP_ARGUMENTS), args.trace, args.frames
+        )
+    else:
+        warm_up_reader(reader, WARM_UP_ARGUMENTS)
+    print(json.dumps({**memory_report(reader), **report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
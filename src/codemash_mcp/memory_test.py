@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.memory import (
+    deep_size,
+    main,
+    memory_report,
+    snapshot_report,
+    traced_allocations,
+)
+from codemash_mcp.snapshot import Snapshot, load_snapshot
+from codemash_mcp.sqlite_engine import sqlite_of
+
+DATA_FILE = Path(__file__).parents[2] / "data" / "endpoint-3.json"
+
+
+class Holder:
+    def __init__(self, items):
+        self.items = items
+
+
+def test_deep_size_counts_shared_objects_once():
+    item = {"id": "x" * 1000}
+    seen: set[int] = set()
+    first = deep_size([item], seen)
+    second = deep_size([item], seen)
+    assert first > 1000
+    assert second < 100
+
+
+def test_deep_size_follows_package_objects_only():
+    items = ["x" * 1000]
+    # Holder is defined in this package, so its attributes are counted
+    assert deep_size(Holder(items)) > 1000
+    # objects from other packages are counted shallowly
+    assert deep_size(Path("x" * 1000)) < 1000
+
+
+def test_deep_size_adds_external_bytes():
+    engine = sqlite_of(load_snapshot(DATA_FILE))
+    seen = {id(engine._sessions), id(engine._speakers)}
+    assert deep_size(engine, seen) >= engine.external_bytes() > 0
+
+
+def test_snapshot_report_charges_indexes_for_what_they_add():
+    snapshot = Snapshot(
+        {"sessions": [{"id": str(i), "title": "x" * 100} for i in range(100)]}
+    )
+    snapshot.lookup("sessions")
+
+    report = snapshot_report(snapshot)
+    assert report["collections"]["sessions"] > 100 * 100
+    # the lookup's dict, not the sessions it points at
+    assert report["lookups"]["sessions.id"] < report["collections"]["sessions"] / 2
+    assert report["total_bytes"] == sum(
+        sum(report[part].values())
+        for part in ["collections", "lookups", "groups", "derived"]
+    )
+
+
+def test_snapshot_report_separates_derived_structures():
+    snapshot = load_snapshot(DATA_FILE)
+    reader = CodeMashDataReader(DATA_FILE, snapshot, backend="sqlite")
+    reader.sessions(day_of_week="THURSDAY")
+    reader.session_facets()
+
+    derived = snapshot_report(snapshot)["derived"]
+    assert derived["sqlite"] > 0
+    assert derived["facets"] > 0
+
+
+def test_memory_report_covers_loaded_events():
+    reader = CodeMashDataReader(
+        DATA_FILE,
+        load_snapshot(DATA_FILE),
+        event_files={"codemash-2025": DATA_FILE},
+    )
+    reader.sessions(event="codemash-2025", day_of_week="THURSDAY")
+
+    report = memory_report(reader, {"content": {"uri": "x" * 1000}})
+    assert set(report["events"]) == {"codemash-2026", "codemash-2025"}
+    assert report["process"]["rss_bytes"] > 0
+    assert report["caches"]["changes"] > 0
+    assert report["caches"]["content"] > 1000
+    assert report["total_bytes"] == sum(
+        event["total_bytes"] for event in report["events"].values()
+    ) + sum(report["caches"].values())
+    assert report["not_counted"]
+
+
+def test_traced_allocations_reports_sites_of_run():
+    kept = []
+    sites = traced_allocations(lambda: kept.append(["x" * 100 for _ in range(1000)]))
+    assert any("memory_test.py" in site["site"][0] for site in sites)
+    assert all(site["size_bytes"] > 0 for site in sites)
+
+
+@pytest.mark.parametrize("trace", [[], ["--trace", "3"]])
+def test_main_prints_report(monkeypatch, capsys, trace):
+    monkeypatch.setenv("CODEMASH_DATA_FILE", str(DATA_FILE))
+    assert main(trace) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["events"]["codemash-2026"]["collections"]["sessions"] > 0
+    assert ("warm_up_allocations" in report) == bool(trace)
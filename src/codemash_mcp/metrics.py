@@ -0,0 +1,20 @@
+from collections.abc import Callable
+from typing import Any
+
+
+class MetricsRegistry:
+    """Collects point-in-time counters from the components of a running server.
+
+    Components register a provider callable under a name, and the `/metrics` route
+    renders the result of every provider. Providers must be cheap and must not block,
+    because the route is expected to stay responsive while the server is saturated.
+    """
+
+    def __init__(self):
+        self._providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], dict[str, Any]]):
+        self._providers[name] = provider
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        return {name: provider() for name, provider in self._providers.items()}
@@ -0,0 +1,187 @@
+import re
+import unicodedata
+from typing import Any
+
+from codemash_mcp.helpers import event_id_of, find_matching_id, is_codemash_event
+from codemash_mcp.snapshot import Snapshot
+
+# Other names people use for tracks, on top of the parts of the track names themselves
+# (i.e. "AI/ML" can already be found as "ai" or "ml")
+TRACK_ALIASES = {
+    "artificial intelligence": "AI/ML",
+    "machine learning": "AI/ML",
+    "llm": "AI/ML",
+    "accessibility": "Design (UI/UX/CSS/a11y)",
+    "frontend": "Web/Front-End",
+    "internet of things": "Hardware/IoT",
+    "testing": "Software Quality",
+    "qa": "Software Quality",
+    "career": "Career Development",
+    "collaboration": "Teams & Collaboration",
+}
+ROOM_ALIASES: dict[str, str] = {}
+
+_PUNCTUATION = re.compile(r"[^\w]+")
+_PARTS = re.compile(r"[/()]")
+
+
+def normalize(name: str) -> str:
+    """Fold case, accents, punctuation and whitespace, i.e. "Salon-A " -> "salon a"."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = name.casefold().replace("&", " and ")
+    return " ".join(_PUNCTUATION.sub(" ", name).split())
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance between `a` and `b`, or `bound + 1` if it's over `bound`."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+
+class NameIndex:
+    """Resolves approximate room or track names to their canonical names.
+
+    A name resolves, in order, by:
+    - its normalized form, or that of an alias
+    - a unique name that starts with it, or contains it as whole words (or the reverse)
+    - the closest name within a small edit distance, if only one is closest
+
+    The vocabulary is small (tens of names), so every fallback is a scan over it.
+    """
+
+    def __init__(self, names: list[str], aliases: dict[str, str] | None = None):
+        self.names = list(dict.fromkeys(names))
+        self._keys = {normalize(name): name for name in self.names}
+
+        # the parts of multi-part names, when only one name has that part
+        owners: dict[str, set[str]] = {}
+        for name in self.names:
+            parts = _PARTS.split(name)
+            for part in parts if len(parts) > 1 else []:
+                if key := normalize(part):
+                    owners.setdefault(key, set()).add(name)
+        for key, names_with_part in owners.items():
+            if len(names_with_part) == 1:
+                self._keys.setdefault(key, names_with_part.pop())
+
+        for alias, name in (aliases or {}).items():
+            if name in self.names:
+                self._keys.setdefault(normalize(alias), name)
+
+    def resolve(self, name: str) -> str | None:
+        key = normalize(name)
+        if not key:
+            return None
+        if key in self._keys:
+            return self._keys[key]
+
+        padded = f" {key} "
+        containing = {
+            canonical
+            for k, canonical in self._keys.items()
+            if padded in f" {k} " or f" {k} " in padded or k.startswith(key)
+        }
+        if len(containing) == 1:
+            return containing.pop()
+
+        bound = min(3, len(key) // 4)
+        if bound == 0:
+            return None
+        best = bound + 1
+        closest = set()
+        for k, canonical in self._keys.items():
+            distance = edit_distance(key, k, bound)
+            if distance < best:
+                best, closest = distance, {canonical}
+            elif distance == best:
+                closest.add(canonical)
+        if best <= bound and len(closest) == 1:
+            return closest.pop()
+        return None
+
+
+def _room_names(data: Any) -> list[str]:
+    event_id = event_id_of(data)
+    return [
+        find_matching_id(
+            data, "sessionVenueTranslations", venue.get("id"), "sessionVenue"
+        ).get("name", "")
+        for venue in data.get("sessionVenues", [])
+        if is_codemash_event(venue, event_id=event_id)
+    ]
+
+
+def _track_names(data: Any) -> list[str]:
+    event_id = event_id_of(data)
+    return [
+        find_matching_id(data, "trackTranslations", track.get("id"), "track").get(
+            "title", ""
+        )
+        for track in data.get("tracks", [])
+        if is_codemash_event(track, event_id=event_id)
+    ]
+
+
+def build_room_index(data: Any) -> NameIndex:
+    return NameIndex([n for n in _room_names(data) if n], ROOM_ALIASES)
+
+
+def build_track_index(data: Any) -> NameIndex:
+    return NameIndex([n for n in _track_names(data) if n], TRACK_ALIASES)
+
+
+def _resolve(index: NameIndex, kind: str, name: str) -> str:
+    resolved = index.resolve(name)
+    if resolved is not None:
+        return resolved
+    if not index.names:
+        # an export without the collection, there's nothing to suggest
+        return name
+    raise ValueError(f"Unknown {kind} '{name}'. Use one of: {', '.join(index.names)}")
+
+
+def resolve_room(data: Any, name: str | None) -> str | None:
+    """The canonical room name for `name`.
+
+    Raises ValueError listing the event's rooms when `name` doesn't match one, so a
+    caller finds out why nothing matched rather than getting no sessions. Without any
+    rooms to match, `name` is used as it is.
+    """
+    if not name:
+        return name
+    if isinstance(data, Snapshot):
+        index = data.derived(
+            "room_names",
+            build_room_index,
+            inputs=["events", "sessionVenues", "sessionVenueTranslations"],
+        )
+    else:
+        index = build_room_index(data)
+    return _resolve(index, "room", name)
+
+
+def resolve_track(data: Any, name: str | None) -> str | None:
+    """The canonical track name for `name`, raising ValueError like `resolve_room`."""
+    if not name:
+        return name
+    if isinstance(data, Snapshot):
+        index = data.derived(
+            "track_names",
+            build_track_index,
+            inputs=["events", "tracks", "trackTranslations"],
+        )
+    else:
+        index = build_track_index(data)
+    return _resolve(index, "track", name)
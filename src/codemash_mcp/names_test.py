@@ -0,0 +1,79 @@
+import pytest
+
+from codemash_mcp.names import NameIndex, edit_distance, normalize, resolve_room
+from codemash_mcp.snapshot import Snapshot
+
+ROOMS = ["Salon A", "Salon B", "Aloeswood / Leopardwood", "Kilimanjaro", "Nile"]
+TRACKS = ["AI/ML", "Design (UI/UX/CSS/a11y)", "Teams & Collaboration", "Security"]
+
+
+def test_normalize():
+    assert normalize("  Salon-A ") == "salon a"
+    assert normalize("Teams & Collaboration") == "teams and collaboration"
+    assert normalize("Café") == "cafe"
+    assert normalize("!!") == ""
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "expected"),
+    [("nile", "nile", 0), ("zambesi", "zambezi", 1), ("ni", "", 2), ("", "", 0)],
+)
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b, bound=2) == expected
+
+
+def test_edit_distance_stops_at_bound():
+    assert edit_distance("kilimanjaro", "salon a", bound=2) == 3
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Salon A", "Salon A"),
+        ("salon-a", "Salon A"),
+        ("the salon a room", "Salon A"),
+        ("leopardwood", "Aloeswood / Leopardwood"),
+        ("Kilamanjaro", "Kilimanjaro"),
+        ("Salon", None),  # more than one
+        ("salon q", None),  # as close to Salon A as Salon B
+        ("Nle", None),  # too short to guess
+        ("", None),
+    ],
+)
+def test_resolve_rooms(query, expected):
+    assert NameIndex(ROOMS).resolve(query) == expected
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("ai", "AI/ML"),
+        ("machine learning", "AI/ML"),
+        ("ux", "Design (UI/UX/CSS/a11y)"),
+        ("Teams & Collab", "Teams & Collaboration"),
+        ("secuirty", "Security"),
+    ],
+)
+def test_resolve_tracks(query, expected):
+    aliases = {"machine learning": "AI/ML", "not a track": "Missing"}
+    assert NameIndex(TRACKS, aliases).resolve(query) == expected
+
+
+def test_resolve_room_from_snapshot():
+    snapshot = Snapshot(
+        {
+            "events": [{"id": "e1"}],
+            "sessionVenues": [{"id": "v1", "event": "e1"}, {"id": "v2", "event": "x"}],
+            "sessionVenueTranslations": [
+                {"sessionVenue": "v1", "name": "Salon A"},
+                {"sessionVenue": "v2", "name": "Salon B"},
+            ],
+        }
+    )
+    assert resolve_room(snapshot, "salon") == "Salon A"
+    with pytest.raises(
+        ValueError, match="Unknown room 'Grand Hall'. Use one of: Salon A"
+    ):
+        resolve_room(snapshot, "Grand Hall")
+    assert resolve_room(Snapshot({}), "Grand Hall") == "Grand Hall"
+    assert resolve_room(snapshot, None) is None
@@ -0,0 +1,125 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Collection, Iterator
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# The least time between two progress notifications for one call, in seconds
+DEFAULT_INTERVAL = 0.1
+
+# The reporter of the tool call running on this thread, if its client asked for progress
+_reporter: contextvars.ContextVar["ProgressReporter | None"] = contextvars.ContextVar(
+    "progress_reporter", default=None
+)
+
+
+class ProgressReporter:
+    """Sends MCP progress notifications for a tool call running on a worker thread.
+
+    It's created on the event loop, for a call whose client sent a `progressToken`,
+    and called from the worker as the call makes progress. `send` sends one
+    notification, on `loop`. Notifications are sent in order, at most every `interval`
+    seconds except for the last one, and only when the progress went up, as the spec
+    requires.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[float, float | None], Awaitable[None]],
+        loop: asyncio.AbstractEventLoop,
+        interval: float = DEFAULT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.send = send
+        self.interval = interval
+        self._loop = loop
+        self._clock = clock
+        self._last_time: float | None = None
+        self._last_progress: float | None = None
+        # sends one notification at a time, in the order they were reported
+        self._lock = asyncio.Lock()
+        self._sent: list[concurrent.futures.Future] = []
+
+    def __call__(self, progress: float, total: float | None = None, last=False):
+        if self._last_progress is not None and progress <= self._last_progress:
+            return
+        now = self._clock()
+        if (
+            not last
+            and self._last_time is not None
+            and now - self._last_time < self.interval
+        ):
+            return
+        self._last_time, self._last_progress = now, progress
+        self._sent.append(
+            asyncio.run_coroutine_threadsafe(self._send(progress, total), self._loop)
+        )
+
+    async def _send(self, progress: float, total: float | None):
+        async with self._lock:
+            try:
+                await self.send(progress, total)
+            except Exception:
+                # i.e. the client went away, the call itself can still finish
+                logger.debug("Sending a progress notification failed", exc_info=True)
+
+    async def flush(self):
+        """Wait for the notifications reported so far to be sent."""
+        if self._sent:
+            await asyncio.gather(
+                *(asyncio.wrap_future(sent) for sent in self._sent),
+                return_exceptions=True,
+            )
+
+
+def progress_reporter(interval: float = DEFAULT_INTERVAL) -> ProgressReporter | None:
+    """A reporter for the tool call running on this event loop, if it asked for progress."""
+    from fastmcp.server.dependencies import get_context
+
+    try:
+        context = get_context()
+    except RuntimeError:
+        # not called as an MCP tool
+        return None
+    request = context.request_context
+    if request is None or request.meta is None or request.meta.progressToken is None:
+        return None
+    # bound here, the request isn't in the context the notifications are sent from
+    send = functools.partial(
+        request.session.send_progress_notification,
+        request.meta.progressToken,
+        related_request_id=str(request.request_id),
+    )
+    return ProgressReporter(send, asyncio.get_running_loop(), interval)
+
+
+def run_reported(reporter: ProgressReporter | None, fn: Callable[[], T]) -> T:
+    """Call `fn` with `reporter` as the reporter `reported` finds."""
+    context = contextvars.copy_context()
+    context.run(_reporter.set, reporter)
+    return context.run(fn)
+
+
+def reported(items: Collection[T]) -> Iterator[T]:
+    """Yield `items`, reporting how many have been through so far as the call's progress.
+
+    A pipeline over a collection of the snapshot, i.e. the sessions a filter scans,
+    reports how far the scan is. Without a reporter it's just the items.
+    """
+    reporter = _reporter.get()
+    if reporter is None:
+        yield from items
+        return
+    total = len(items)
+    reporter(0, total)
+    for done, item in enumerate(items, start=1):
+        yield item
+        reporter(done, total)
+    reporter(total, total, last=True)
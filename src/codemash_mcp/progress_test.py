@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.executor import ToolExecutor
+from codemash_mcp.progress import ProgressReporter, reported, run_reported
+
+DATA_FILE = Path(__file__).parents[2] / "data" / "endpoint-3.json"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_reported_without_a_reporter_is_the_items():
+    assert list(reported([1, 2, 3])) == [1, 2, 3]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "interval, expected",
+    [
+        # the first and last are always sent
+        (60, [(0, 4), (4, 4)]),
+        (0, [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)]),
+    ],
+)
+async def test_reporter_sends_progress_from_the_worker(interval, expected):
+    sent = []
+
+    async def send(progress, total):
+        sent.append((progress, total))
+
+    reporter = ProgressReporter(send, asyncio.get_running_loop(), interval=interval)
+
+    items = await asyncio.to_thread(
+        run_reported, reporter, lambda: list(reported("abcd"))
+    )
+    await reporter.flush()
+    assert items == list("abcd")
+    assert sent == expected
+
+
+@pytest.mark.anyio
+async def test_tools_report_progress_to_clients_that_ask():
+    reader = CodeMashDataReader(DATA_FILE)
+    executor = ToolExecutor(max_workers=1, max_queue=0)
+    mcp = FastMCP("test")
+    mcp.tool(executor.offload(reader.sessions))
+    notifications = []
+
+    async def progress(progress, total, message):
+        notifications.append((progress, total))
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("sessions", {}, progress_handler=progress)
+    executor.shutdown()
+
+    sessions = len(reader.data["sessions"])
+    assert notifications[0] == (0, sessions)
+    assert notifications[-1] == (sessions, sessions)
+    assert notifications == sorted(notifications)
+    # the result is the same as without progress
+    assert result.structured_content == {"result": reader.sessions()}
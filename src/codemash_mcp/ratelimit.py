@@ -0,0 +1,301 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Container
+from typing import Any
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Tokens a tool call takes from its client's bucket. Unfiltered listings map hundreds of
+# sessions or speakers, static lookups a handful of records.
+LISTING_TOOLS = {"sessions", "speakers"}
+UNFILTERED_LISTING_COST = 10
+FILTERED_LISTING_COST = 2
+TOOL_COSTS = {
+    "build_schedule": 4,
+    "session_facets": 2,
+    "now_and_next": 2,
+}
+# Any other request, i.e. a static lookup, initialize or tools/list
+DEFAULT_COST = 1
+EXPORT_COST = UNFILTERED_LISTING_COST
+# Arguments that don't narrow a listing
+UNFILTERING_ARGUMENTS = {"include_descriptions", "event"}
+# Bodies bigger than this aren't parsed, they're charged as unfiltered listings
+MAX_PARSED_BODY = 64 * 1024
+# Bodies bigger than this are rejected with a 413 rather than read into memory
+MAX_BODY = 1024 * 1024
+# How many sessions' worth of tokens the sessions from one address share, so clients
+# behind one NAT aren't limited as one, but opening sessions doesn't buy fresh buckets
+SESSIONS_PER_ADDRESS = 4
+
+
+def tool_cost(name: str, arguments: dict[str, Any] | None) -> int:
+    if name in LISTING_TOOLS:
+        filters = [
+            key
+            for key, value in (arguments or {}).items()
+            if key not in UNFILTERING_ARGUMENTS and value not in (None, "")
+        ]
+        return FILTERED_LISTING_COST if filters else UNFILTERED_LISTING_COST
+    return TOOL_COSTS.get(name, DEFAULT_COST)
+
+
+def request_cost(body: bytes) -> tuple[int, list[str]]:
+    """The cost of a JSON-RPC request or batch, and the tools it calls."""
+    if len(body) > MAX_PARSED_BODY:
+        return UNFILTERED_LISTING_COST, []
+    try:
+        message = json.loads(body)
+    except ValueError:
+        return DEFAULT_COST, []
+    messages = message if isinstance(message, list) else [message]
+    cost, tools = 0, []
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        params = message.get("params") or {}
+        if message.get("method") == "tools/call" and isinstance(params, dict):
+            name = str(params.get("name", ""))
+            arguments = params.get("arguments")
+            cost += tool_cost(name, arguments if isinstance(arguments, dict) else None)
+            tools.append(name)
+        else:
+            cost += DEFAULT_COST
+    return max(cost, DEFAULT_COST), tools
+
+
+class RateLimiter:
+    """Token buckets per client, refilled at `rate` tokens a second up to `burst`.
+
+    A bucket is two floats, updated lazily when its client makes a request, so there is
+    no timer and the cost per request is a dict lookup. A request can also be charged to
+    a shared bucket, `shared_scale` times bigger and refilled as much faster, and is only
+    admitted if both have the tokens. Only the `max_clients` most recently seen buckets
+    are remembered. A forgotten bucket starts again full, which is where an idle
+    client's bucket would be anyway.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+        shared_scale: int = SESSIONS_PER_ADDRESS,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.shared_scale = shared_scale
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._admitted = 0
+        self._rejected = 0
+        self._tokens_spent = 0
+        self._rejected_tools: dict[str, int] = {}
+
+    def take(
+        self,
+        client: str,
+        cost: int,
+        tools: list[str] | None = None,
+        shared: str | None = None,
+    ) -> float:
+        """Take `cost` tokens from `client`'s bucket, and the `shared` one if given.
+
+        Returns 0 if they were taken, else the seconds until the buckets will have them.
+        A cost bigger than the bucket is charged as a full bucket.
+        """
+        cost = min(cost, self.burst)
+        now = self._clock()
+        buckets = [(client, 1)] + ([(shared, self.shared_scale)] if shared else [])
+        with self._lock:
+            tokens = []
+            for key, scale in buckets:
+                left, updated = self._buckets.pop(key, (self.burst * scale, now))
+                tokens.append(
+                    min(self.burst * scale, left + (now - updated) * self.rate * scale)
+                )
+            wait = max(
+                max(cost - left, 0) / (self.rate * scale)
+                for left, (_, scale) in zip(tokens, buckets)
+            )
+            if wait == 0:
+                tokens = [left - cost for left in tokens]
+                self._admitted += 1
+                self._tokens_spent += cost
+            else:
+                self._rejected += 1
+                for tool in tools or []:
+                    self._rejected_tools[tool] = self._rejected_tools.get(tool, 0) + 1
+            for (key, _), left in zip(buckets, tokens):
+                self._buckets[key] = (left, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "clients": len(self._buckets),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "tokens_spent": self._tokens_spent,
+                "rejected_tools": dict(self._rejected_tools),
+            }
+
+
+def address_key(scope: Scope) -> str:
+    """The client's address. Uvicorn's proxy headers support has already replaced it
+    with the one in X-Forwarded-For, when the request came through a trusted proxy."""
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def client_key(scope: Scope, sessions: Container[str] | None = None) -> str:
+    """The MCP session id, or the client's address for requests outside a session.
+
+    Only ids in `sessions`, the server's live sessions, count, so a client can't get a
+    fresh bucket by making one up.
+    """
+    session = Headers(scope=scope).get("mcp-session-id")
+    if session and sessions is not None and session in sessions:
+        return f"session:{session}"
+    return address_key(scope)
+
+
+class RateLimitMiddleware:
+    """Admission control for the MCP endpoint and the bulk exports.
+
+    MCP requests are charged by what they call (see `tool_cost`), which means reading
+    the JSON-RPC body before the app does; it's handed on unchanged, and one over
+    `MAX_BODY` gets a 413 instead. Requests in a session are also charged to the
+    sessions of their address together. Over-limit requests get a 429 with
+    `Retry-After` and a JSON-RPC error saying when to retry. Other routes, like the
+    health checks, are never limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        mcp_path: str = "/mcp",
+        sessions: Container[str] | None = None,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.mcp_path = mcp_path
+        self.sessions = sessions
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].rstrip("/")
+        if path.startswith("/export/"):
+            cost, tools, body = EXPORT_COST, [], None
+        elif path == self.mcp_path and scope["method"] == "POST":
+            body = await _read_body(scope, receive)
+            if body is None:
+                await _too_large()(scope, receive, send)
+                return
+            cost, tools = request_cost(body)
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope, self.sessions)
+        # sessions share their address's bucket, so a new session isn't a fresh burst
+        shared = None
+        if client.startswith("session:"):
+            shared = f"sessions@{address_key(scope)}"
+        wait = self.limiter.take(client, cost, tools, shared=shared)
+        if wait > 0:
+            await _rejection(body, wait)(scope, receive, send)
+            return
+        if body is not None:
+            receive = _replay(body, receive)
+        await self.app(scope, receive, send)
+
+
+async def _read_body(scope: Scope, receive: Receive) -> bytes | None:
+    """The request body, or None if it's over `MAX_BODY`, without reading past it."""
+    length = Headers(scope=scope).get("content-length")
+    if length is not None and length.isdigit() and int(length) > MAX_BODY:
+        return None
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _too_large() -> JSONResponse:
+    return JSONResponse(
+        {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": -32600,
+                "message": f"Request body is over {MAX_BODY} bytes.",
+            },
+        },
+        status_code=413,
+    )
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+def _rejection(body: bytes | None, wait: float) -> JSONResponse:
+    retry_after = math.ceil(wait)
+    message = f"Rate limit exceeded. Retry in {retry_after} seconds."
+    headers = {"Retry-After": str(retry_after)}
+    if body is None:
+        return JSONResponse({"error": message}, status_code=429, headers=headers)
+    try:
+        request = json.loads(body)
+        request_id = request.get("id") if isinstance(request, dict) else None
+    except ValueError:
+        request_id = None
+    return JSONResponse(
+        {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {
+                "code": -32000,
+                "message": message,
+                "data": {"retry_after": retry_after},
+            },
+        },
+        status_code=429,
+        headers=headers,
+    )
@@ -0,0 +1,208 @@
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from codemash_mcp.ratelimit import (
+    DEFAULT_COST,
+    FILTERED_LISTING_COST,
+    MAX_BODY,
+    UNFILTERED_LISTING_COST,
+    RateLimiter,
+    RateLimitMiddleware,
+    request_cost,
+    tool_cost,
+)
+
+
+def _call(name, arguments=None, request_id=1):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments or {}},
+    }
+
+
+@pytest.mark.parametrize(
+    ("name", "arguments", "expected"),
+    [
+        ("sessions", {}, UNFILTERED_LISTING_COST),
+        ("sessions", {"include_descriptions": False}, UNFILTERED_LISTING_COST),
+        ("sessions", {"track_name": None}, UNFILTERED_LISTING_COST),
+        ("sessions", {"track_name": "AI/ML"}, FILTERED_LISTING_COST),
+        ("speakers", {"speaker_name": "an"}, FILTERED_LISTING_COST),
+        ("venue", {}, DEFAULT_COST),
+        ("build_schedule", {}, 4),
+    ],
+)
+def test_tool_cost(name, arguments, expected):
+    assert tool_cost(name, arguments) == expected
+
+
+def test_request_cost():
+    assert request_cost(json.dumps(_call("sessions")).encode()) == (
+        UNFILTERED_LISTING_COST,
+        ["sessions"],
+    )
+    batch = [_call("venue"), {"jsonrpc": "2.0", "method": "tools/list", "id": 2}]
+    assert request_cost(json.dumps(batch).encode()) == (2, ["venue"])
+    assert request_cost(b"not json") == (DEFAULT_COST, [])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_buckets_refill_over_time():
+    clock = Clock()
+    limiter = RateLimiter(rate=2, burst=10, clock=clock)
+    assert limiter.take("a", 10) == 0
+    assert limiter.take("a", 1) == pytest.approx(0.5)
+    # other clients have their own bucket
+    assert limiter.take("b", 1) == 0
+    clock.now = 2.0
+    assert limiter.take("a", 4) == 0
+    assert limiter.take("a", 1) == pytest.approx(0.5)
+    assert limiter.as_dict()["admitted"] == 3
+    assert limiter.as_dict()["rejected"] == 2
+
+
+def test_costs_beyond_the_burst_take_a_full_bucket():
+    limiter = RateLimiter(rate=1, burst=5, clock=Clock())
+    assert limiter.take("a", 50) == 0
+    assert limiter.take("a", 50) == pytest.approx(5)
+
+
+def test_least_recently_seen_clients_are_forgotten():
+    limiter = RateLimiter(rate=1, burst=5, max_clients=2, clock=Clock())
+    for client in ["a", "b", "c"]:
+        limiter.take(client, 5)
+    assert limiter.as_dict()["clients"] == 2
+    # "a" was forgotten, so it has a full bucket again
+    assert limiter.take("a", 5) == 0
+    assert limiter.take("c", 5) > 0
+
+
+def test_shared_buckets_limit_clients_together():
+    limiter = RateLimiter(rate=1, burst=5, clock=Clock(), shared_scale=2)
+    assert limiter.take("a", 5, shared="both") == 0
+    assert limiter.take("b", 5, shared="both") == 0
+    # "c" has tokens of its own, but the shared bucket is empty
+    assert limiter.take("c", 5, shared="both") == pytest.approx(2.5)
+    assert limiter.take("c", 5) == 0
+
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(rate=1, burst=10, clock=Clock())
+
+
+@pytest.fixture
+def client(limiter):
+    async def mcp(request: Request):
+        return JSONResponse({"echo": await request.json()})
+
+    app = Starlette(
+        routes=[
+            Route("/mcp", mcp, methods=["POST"]),
+            Route("/health", lambda request: JSONResponse({"status": "UP"})),
+            Route("/export/sessions.ndjson", lambda request: JSONResponse([])),
+        ]
+    )
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, sessions={"one"})
+    return TestClient(app)
+
+
+def test_requests_reach_the_app_unchanged(client):
+    response = client.post("/mcp", json=_call("venue"))
+    assert response.status_code == 200
+    assert response.json() == {"echo": _call("venue")}
+
+
+def test_over_limit_calls_are_rejected_with_a_retry_hint(client, limiter):
+    assert client.post("/mcp", json=_call("sessions")).status_code == 200
+    response = client.post("/mcp", json=_call("sessions", request_id=7))
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "10"
+    assert response.json()["id"] == 7
+    assert response.json()["error"]["data"] == {"retry_after": 10}
+    assert limiter.as_dict()["rejected_tools"] == {"sessions": 1}
+
+
+def test_clients_are_told_apart_by_session(client):
+    headers = {"mcp-session-id": "one"}
+    assert (
+        client.post("/mcp", json=_call("sessions"), headers=headers).status_code == 200
+    )
+    assert (
+        client.post("/mcp", json=_call("sessions"), headers=headers).status_code == 429
+    )
+    assert client.post("/mcp", json=_call("sessions")).status_code == 200
+
+
+def test_unknown_sessions_are_told_apart_by_address(client):
+    assert (
+        client.post(
+            "/mcp", json=_call("sessions"), headers={"mcp-session-id": "made-up"}
+        ).status_code
+        == 200
+    )
+    assert (
+        client.post(
+            "/mcp", json=_call("sessions"), headers={"mcp-session-id": "another"}
+        ).status_code
+        == 429
+    )
+
+
+def test_exports_are_limited_and_health_checks_are_not(client):
+    assert client.get("/export/sessions.ndjson").status_code == 200
+    response = client.get("/export/sessions.ndjson")
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    for _ in range(20):
+        assert client.get("/health").status_code == 200
+
+
+def test_new_sessions_share_their_address_bucket(limiter):
+    app = Starlette(
+        routes=[Route("/mcp", lambda r: JSONResponse({}), methods=["POST"])]
+    )
+    sessions = {f"s{i}" for i in range(10)}
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, sessions=sessions)
+    client = TestClient(app)
+    statuses = [
+        client.post(
+            "/mcp", json=_call("sessions"), headers={"mcp-session-id": session}
+        ).status_code
+        for session in sorted(sessions)
+    ]
+    # each session has a full bucket, but the address only has four sessions' worth
+    assert statuses == [200] * 4 + [429] * 6
+
+
+def test_oversized_bodies_are_rejected_unread(client, limiter):
+    response = client.post(
+        "/mcp",
+        content=b" " * (MAX_BODY + 1),
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == -32600
+
+    def chunks():
+        for _ in range(MAX_BODY // 1024 + 1):
+            yield b" " * 1024
+
+    # without a Content-Length, reading stops once the body is over the limit
+    assert client.post("/mcp", content=chunks()).status_code == 413
+    assert limiter.as_dict()["admitted"] == 0
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from pydantic import AnyUrl
+
+from codemash_mcp.helpers import map_event, map_hotels, map_rooms, map_tracks, map_venue
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+    from mcp.server.session import ServerSession
+
+    from codemash_mcp.codemash import CodeMashDataReader
+    from codemash_mcp.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# (name, URI, description) of the conference data that only changes when the export
+# does
+STATIC_RESOURCES = [
+    (
+        "event",
+        "codemash://event",
+        "The CodeMash 2026 event: dates, description and links.",
+    ),
+    ("venue", "codemash://venue", "The CodeMash 2026 venue and its address."),
+    ("hotels", "codemash://hotels", "Hotels for CodeMash 2026 attendees."),
+    ("tracks", "codemash://tracks", "The session tracks at CodeMash 2026."),
+    (
+        "rooms",
+        "codemash://rooms",
+        "The session rooms at CodeMash 2026. These are the names to filter sessions by.",
+    ),
+]
+# The collections each resource is read from
+RESOURCE_INPUTS = {
+    "event": ["events", "eventTranslations", "portals", "eventSocialHandles"],
+    "venue": ["events", "venues", "venueTranslations"],
+    "hotels": ["events", "hotels", "hotelTranslations"],
+    "tracks": ["events", "tracks", "trackTranslations"],
+    "rooms": ["events", "sessionVenues", "sessionVenueTranslations"],
+}
+# How each resource is mapped from a snapshot, as its tool does
+RESOURCE_MAPPINGS: dict[str, Callable[[Any], Any]] = {
+    "event": map_event,
+    "venue": map_venue,
+    "hotels": map_hotels,
+    "tracks": map_tracks,
+    "rooms": map_rooms,
+}
+
+
+class ResourceSubscribers:
+    """Remembers which sessions subscribed to which resources.
+
+    Sessions are held weakly, so a client that goes away is forgotten without a
+    disconnect hook. Notifications are sent on the event loop the session was seen on,
+    because reloads happen on a background thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: weakref.WeakKeyDictionary[
+            ServerSession, tuple[asyncio.AbstractEventLoop, set[str]]
+        ] = weakref.WeakKeyDictionary()
+        self._sent = 0
+        self._failed = 0
+
+    def add(self, session: "ServerSession", uri: str):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            _, uris = self._sessions.setdefault(session, (loop, set()))
+            uris.add(uri)
+
+    def remove(self, session: "ServerSession", uri: str):
+        with self._lock:
+            entry = self._sessions.get(session)
+            if entry is not None:
+                entry[1].discard(uri)
+
+    def uris(self) -> set[str]:
+        """The resources at least one session is subscribed to."""
+        with self._lock:
+            return {uri for _, uris in self._sessions.values() for uri in uris}
+
+    def notify(self, uris: list[str]):
+        """Tell every session subscribed to one of `uris` that it has changed."""
+        with self._lock:
+            targets = [
+                (session, loop, uri)
+                for session, (loop, subscribed) in self._sessions.items()
+                for uri in subscribed
+                if uri in uris
+            ]
+        for session, loop, uri in targets:
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    session.send_resource_updated(AnyUrl(uri)), loop
+                )
+            except RuntimeError:
+                # the loop is closed, so is the session
+                self._count(failed=True)
+                continue
+            future.add_done_callback(
+                lambda f: self._count(failed=f.cancelled() or f.exception() is not None)
+            )
+
+    def _count(self, failed: bool):
+        with self._lock:
+            if failed:
+                self._failed += 1
+            else:
+                self._sent += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "subscriptions": sum(len(uris) for _, uris in self._sessions.values()),
+                "notifications_sent": self._sent,
+                "notifications_failed": self._failed,
+            }
+
+
+class ConferenceResources:
+    """Serves the static conference data as MCP resources that clients can cache.
+
+    Each resource's content and listing carry the snapshot version. Its JSON is built
+    once per snapshot. After a reload, every session subscribed to a resource whose
+    content changed gets a `notifications/resources/updated` for it.
+    """
+
+    def __init__(self, mcp: "FastMCP", reader: "CodeMashDataReader"):
+        self.mcp = mcp
+        self.reader = reader
+        self.subscribers = ResourceSubscribers()
+        # the JSON of each resource a client is subscribed to, as of its last update
+        self._sent: dict[str, str] = {}
+        self._names = {uri: name for name, uri, _ in STATIC_RESOURCES}
+        self.resources = [
+            mcp.resource(
+                uri,
+                name=name,
+                description=description,
+                mime_type="application/json",
+                meta={"version": reader.data.version},
+            )(self._reader_for(name))
+            for name, uri, description in STATIC_RESOURCES
+        ]
+        self._enable_subscriptions()
+
+    def _enable_subscriptions(self):
+        """Handle resource subscriptions and advertise them to this server's clients.
+
+        FastMCP has no API for subscriptions, so the handlers are registered with the
+        MCP SDK server's own decorators. The SDK always advertises `subscribe: false`,
+        so the initialization options of this server, which carry its capabilities to
+        every session, are amended to say it supports them.
+        """
+        lowlevel = self.mcp._mcp_server
+
+        @lowlevel.subscribe_resource()
+        async def subscribe(uri: AnyUrl):
+            if (name := self._names.get(str(uri))) is not None:
+                self._sent.setdefault(name, self._content(self.reader.data, name))
+            self.subscribers.add(lowlevel.request_context.session, str(uri))
+
+        @lowlevel.unsubscribe_resource()
+        async def unsubscribe(uri: AnyUrl):
+            self.subscribers.remove(lowlevel.request_context.session, str(uri))
+
+        create_initialization_options = lowlevel.create_initialization_options
+
+        def create_initialization_options_with_subscribe(*args, **kwargs):
+            options = create_initialization_options(*args, **kwargs)
+            if options.capabilities.resources is not None:
+                options.capabilities.resources.subscribe = True
+            return options
+
+        lowlevel.create_initialization_options = (  # pyright: ignore[reportAttributeAccessIssue]
+            create_initialization_options_with_subscribe
+        )
+
+    def _content(self, data: "Snapshot", name: str) -> str:
+        """The JSON of resource `name` in `data`, without its version."""
+        # the version is added on read, so the JSON of a resource whose collections
+        # didn't change carries over a reload
+        return data.derived(
+            f"resource:{name}",
+            lambda snapshot: json.dumps(RESOURCE_MAPPINGS[name](snapshot)),
+            inputs=RESOURCE_INPUTS[name],
+        )
+
+    def _reader_for(self, name: str):
+        def read() -> str:
+            data = self.reader.data
+            content = self._content(data, name)
+            return f'{{"version": {json.dumps(data.version)}, "{name}": {content}}}'
+
+        read.__name__ = name
+        return read
+
+    def on_reload(self):
+        """Update the listed versions and tell subscribers about the resources that
+        changed. Resources no client is subscribed to aren't built."""
+        data = self.reader.data
+        for resource in self.resources:
+            resource.meta = {**(resource.meta or {}), "version": data.version}
+        subscribed = self.subscribers.uris()
+        changed = []
+        for name, uri, _ in STATIC_RESOURCES:
+            if uri not in subscribed:
+                self._sent.pop(name, None)
+                continue
+            if name not in self._sent:
+                # subscribed to while the reload swapped the snapshot in
+                self._sent[name] = self._content(data, name)
+                continue
+            content = self._content(data, name)
+            if content != self._sent[name]:
+                self._sent[name] = content
+                changed.append(uri)
+        self.subscribers.notify(changed)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "version": self.reader.data.version,
+            **self.subscribers.stats(),
+        }
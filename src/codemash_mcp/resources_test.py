@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import mcp.types
+import pytest
+from fastmcp import Client, FastMCP
+from pydantic import AnyUrl
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.resources import STATIC_RESOURCES, ConferenceResources
+from codemash_mcp.snapshot import REQUIRED_COLLECTIONS
+
+
+def _write_export(path, track="Track 1"):
+    export = {name: [] for name in REQUIRED_COLLECTIONS}
+    export["events"] = [{"id": "e1"}]
+    export["tracks"] = [{"id": "t1", "event": "e1"}]
+    export["trackTranslations"] = [{"track": "t1", "title": track}]
+    path.write_text(json.dumps(export))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def resources(tmp_path):
+    data_file = tmp_path / "data.json"
+    _write_export(data_file)
+    return ConferenceResources(FastMCP("test"), CodeMashDataReader(data_file))
+
+
+def _text(contents) -> dict:
+    assert isinstance(contents[0], mcp.types.TextResourceContents)
+    return json.loads(contents[0].text)
+
+
+class TestConferenceResources:
+    @pytest.mark.anyio
+    async def test_should_list_resources_with_version(self, resources):
+        version = resources.reader.data.version
+        async with Client(resources.mcp) as client:
+            listed = {str(r.uri): r for r in await client.list_resources()}
+        assert set(listed) == {uri for _, uri, _ in STATIC_RESOURCES}
+        assert listed["codemash://tracks"].mimeType == "application/json"
+        assert listed["codemash://tracks"].meta["version"] == version  # pyright: ignore[reportOptionalSubscript]
+
+    @pytest.mark.anyio
+    async def test_should_read_versioned_content(self, resources):
+        async with Client(resources.mcp) as client:
+            tracks = _text(await client.read_resource("codemash://tracks"))
+            rooms = _text(await client.read_resource("codemash://rooms"))
+        assert tracks == {
+            "version": resources.reader.data.version,
+            "tracks": [{"name": "Track 1"}],
+        }
+        assert rooms["rooms"] == []
+
+    @pytest.mark.anyio
+    async def test_should_notify_subscribers_of_changed_resources_on_reload(
+        self, resources
+    ):
+        updated = []
+
+        async def handler(message):
+            if isinstance(message, mcp.types.ServerNotification) and isinstance(
+                message.root, mcp.types.ResourceUpdatedNotification
+            ):
+                updated.append(str(message.root.params.uri))
+
+        async with Client(resources.mcp, message_handler=handler) as client:
+            await client.read_resource("codemash://tracks")
+            await client.session.subscribe_resource(AnyUrl("codemash://tracks"))
+            await client.session.subscribe_resource(AnyUrl("codemash://venue"))
+            previous = resources.reader.data.version
+
+            _write_export(resources.reader.data_directory, track="Track 2")
+            resources.reader.reload()
+            # reloads happen on the lifecycle's watch thread
+            await asyncio.to_thread(resources.on_reload)
+            for _ in range(50):
+                if updated:
+                    break
+                await asyncio.sleep(0.01)
+            # the venue didn't change, so its subscriber isn't told it did
+            await asyncio.sleep(0.05)
+
+            tracks = _text(await client.read_resource("codemash://tracks"))
+            listed = {str(r.uri): r for r in await client.list_resources()}
+
+        assert updated == ["codemash://tracks"]
+        assert tracks["version"] != previous
+        assert tracks["tracks"] == [{"name": "Track 2"}]
+        assert listed["codemash://tracks"].meta["version"] == tracks["version"]  # pyright: ignore[reportOptionalSubscript]
+        assert resources.stats()["notifications_sent"] == 1
+
+    @pytest.mark.anyio
+    async def test_should_notify_subscribers_without_a_read(self, resources):
+        updated = []
+
+        async def handler(message):
+            if isinstance(message, mcp.types.ServerNotification) and isinstance(
+                message.root, mcp.types.ResourceUpdatedNotification
+            ):
+                updated.append(str(message.root.params.uri))
+
+        async with Client(resources.mcp, message_handler=handler) as client:
+            await client.session.subscribe_resource(AnyUrl("codemash://tracks"))
+            _write_export(resources.reader.data_directory, track="Track 2")
+            resources.reader.reload()
+            await asyncio.to_thread(resources.on_reload)
+            for _ in range(50):
+                if updated:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert updated == ["codemash://tracks"]
+
+    @pytest.mark.anyio
+    async def test_should_not_notify_sessions_that_only_read(self, resources):
+        updated = []
+
+        async def handler(message):
+            if isinstance(message, mcp.types.ServerNotification) and isinstance(
+                message.root, mcp.types.ResourceUpdatedNotification
+            ):
+                updated.append(str(message.root.params.uri))
+
+        async with Client(resources.mcp, message_handler=handler) as client:
+            await client.read_resource("codemash://tracks")
+            _write_export(resources.reader.data_directory, track="Track 2")
+            resources.reader.reload()
+            await asyncio.to_thread(resources.on_reload)
+            await asyncio.sleep(0.05)
+
+        assert updated == []
+        assert resources.stats()["subscriptions"] == 0
+
+    @pytest.mark.anyio
+    async def test_should_advertise_subscriptions(self, resources):
+        async with Client(resources.mcp) as client:
+            initialized = client.initialize_result
+        assert initialized is not None
+        resources_capability = initialized.capabilities.resources
+        assert resources_capability is not None
+        assert resources_capability.subscribe is True
+
+    @pytest.mark.anyio
+    async def test_should_advertise_subscriptions_only_for_this_server(self, resources):
+        async with Client(FastMCP("other")) as client:
+            initialized = client.initialize_result
+        assert initialized is not None
+        resources_capability = initialized.capabilities.resources
+        assert resources_capability is None or not resources_capability.subscribe
@@ -0,0 +1,170 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from codemash_mcp.helpers import find_matching_id, sessions_find_speakers
+
+# How much each kind of match adds to a session's score when building a schedule
+TRACK_WEIGHT = 3
+SPEAKER_WEIGHT = 3
+TITLE_KEYWORD_WEIGHT = 2
+DESCRIPTION_KEYWORD_WEIGHT = 1
+DURATION_WEIGHT = 1
+
+
+class Candidate(NamedTuple):
+    """A session that could go on a schedule, with its time span in minutes."""
+
+    start: int
+    end: int
+    score: float
+    session: Any
+
+
+def parse_hhmm(value: str) -> int:
+    """Convert a 'HHMM' time into minutes since midnight."""
+    return int(value[:2]) * 60 + int(value[2:4])
+
+
+@lru_cache(maxsize=1024)
+def keyword_pattern(keyword: str) -> re.Pattern[str]:
+    """Match `keyword` as a whole word or phrase, so "ai" doesn't match "email".
+
+    Word characters can't come right before or after it, which unlike `\\b` also works
+    for keywords starting or ending in punctuation, like "c#" or ".net".
+    """
+    return re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)")
+
+
+def best_schedule(candidates: list[Candidate]) -> list[Candidate]:
+    """Pick the non-overlapping candidates with the highest total score.
+
+    This is the weighted interval scheduling algorithm: sort by end time, then for each
+    candidate either skip it or take it along with the best schedule that ends before it
+    starts. Runs in O(n log n). Sessions that touch (one ends as the next starts) don't
+    overlap.
+    """
+    ordered = sorted(candidates, key=lambda c: (c.end, c.start))
+    ends = [c.end for c in ordered]
+    best = [0.0] * (len(ordered) + 1)
+    for i, candidate in enumerate(ordered, start=1):
+        previous = bisect_right(ends, candidate.start, hi=i - 1)
+        best[i] = max(best[i - 1], best[previous] + candidate.score)
+
+    chosen = []
+    i = len(ordered)
+    while i > 0:
+        candidate = ordered[i - 1]
+        previous = bisect_right(ends, candidate.start, hi=i - 1)
+        if best[previous] + candidate.score >= best[i - 1]:
+            chosen.append(candidate)
+            i = previous
+        else:
+            i -= 1
+    chosen.reverse()
+    return chosen
+
+
+def alternates_for(
+    chosen: Candidate, candidates: list[Candidate], limit: int
+) -> list[Candidate]:
+    """The best scoring candidates that overlap `chosen`, i.e. the other options for its slot."""
+    overlapping = [
+        c
+        for c in candidates
+        if c is not chosen and c.start < chosen.end and chosen.start < c.end
+    ]
+    overlapping.sort(key=lambda c: (-c.score, c.start))
+    return overlapping[:limit]
+
+
+class Interests(NamedTuple):
+    """What an attendee is interested in, lowercased, to score sessions by."""
+
+    tracks: list[str]
+    speakers: list[str]
+    keywords: list[str]
+    preferred_durations: list[int]
+
+    def score(
+        self,
+        title: str,
+        description: str,
+        track: str,
+        speakers: list[str],
+        duration: int,
+    ) -> float:
+        """How well a session matches, 0 if it matches none of the interests.
+
+        Tracks and speakers match if they contain one of the interests, keywords count
+        for each one found as a whole word in the title and the description. With no interests at all, every
+        session is worth 1. A preferred duration adds to a session that already scores.
+        """
+        if not (self.tracks or self.speakers or self.keywords):
+            score = 1.0
+        else:
+            score = 0.0
+            score += TRACK_WEIGHT * any(t in track for t in self.tracks)
+            score += SPEAKER_WEIGHT * any(
+                s in name for s in self.speakers for name in speakers
+            )
+            score += TITLE_KEYWORD_WEIGHT * sum(
+                keyword_pattern(k).search(title) is not None for k in self.keywords
+            )
+            score += DESCRIPTION_KEYWORD_WEIGHT * sum(
+                keyword_pattern(k).search(description) is not None
+                for k in self.keywords
+            )
+            if score == 0:
+                return 0.0
+        if duration in self.preferred_durations:
+            score += DURATION_WEIGHT
+        return score
+
+
+def schedule_candidates(
+    data: Any,
+    agenda_days: dict[str, str],
+    interests: Interests,
+    window_start: int = 0,
+    window_end: int = 24 * 60,
+) -> dict[str, list[Candidate]]:
+    """The scheduled sessions that could go on an attendee's schedule, by day.
+
+    Those are the sessions on `agenda_days` (agenda id to day name) that fit between
+    `window_start` and `window_end` (minutes since midnight) and score above 0 for
+    `interests`.
+    """
+    candidates_by_day: dict[str, list[Candidate]] = {}
+    for session in data.get("sessions", []):
+        day = agenda_days.get(session.get("agenda"))
+        if day is None or not session.get("startTime"):
+            continue
+        start = parse_hhmm(session["startTime"])
+        duration = int(session.get("duration", "0"))
+        end = start + duration
+        if start < window_start or end > window_end:
+            continue
+
+        translation = find_matching_id(
+            data, "sessionTranslations", session.get("id"), "session"
+        )
+        track = find_matching_id(
+            data, "trackTranslations", session.get("track", ""), "track"
+        )
+        score = interests.score(
+            title=(translation.get("title") or "").lower(),
+            description=(translation.get("description") or "").lower(),
+            track=track.get("title", "").lower(),
+            speakers=[
+                f"{s['name']} {s['last_name']}".lower()
+                for s in sessions_find_speakers(data, session)
+            ],
+            duration=duration,
+        )
+        if score:
+            candidates_by_day.setdefault(day, []).append(
+                Candidate(start, end, score, session)
+            )
+    return candidates_by_day
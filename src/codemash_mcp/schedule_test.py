@@ -0,0 +1,109 @@
+import itertools
+import random
+
+from codemash_mcp.schedule import (
+    Candidate,
+    Interests,
+    alternates_for,
+    best_schedule,
+    parse_hhmm,
+)
+
+
+def overlaps(a: Candidate, b: Candidate) -> bool:
+    return a.start < b.end and b.start < a.end
+
+
+def brute_force(candidates: list[Candidate]) -> float:
+    best = 0.0
+    for size in range(len(candidates) + 1):
+        for subset in itertools.combinations(candidates, size):
+            if all(not overlaps(a, b) for a, b in itertools.combinations(subset, 2)):
+                best = max(best, sum(c.score for c in subset))
+    return best
+
+
+def test_parse_hhmm():
+    assert parse_hhmm("0000") == 0
+    assert parse_hhmm("0830") == 510
+    assert parse_hhmm("2359") == 1439
+
+
+def test_best_schedule_matches_brute_force():
+    rng = random.Random(2026)
+    for _ in range(200):
+        candidates = []
+        for i in range(rng.randint(0, 9)):
+            start = rng.randrange(0, 600, 15)
+            end = start + rng.choice([30, 45, 60, 120])
+            candidates.append(Candidate(start, end, rng.randint(1, 6), i))
+
+        chosen = best_schedule(candidates)
+        assert all(not overlaps(a, b) for a, b in itertools.combinations(chosen, 2))
+        assert sum(c.score for c in chosen) == brute_force(candidates)
+        assert chosen == sorted(chosen, key=lambda c: c.start)
+
+
+def test_touching_sessions_do_not_overlap():
+    first = Candidate(0, 60, 1, "first")
+    second = Candidate(60, 120, 1, "second")
+    assert best_schedule([second, first]) == [first, second]
+
+
+def test_alternates_for():
+    chosen = Candidate(60, 120, 5, "chosen")
+    candidates = [
+        chosen,
+        Candidate(0, 60, 9, "before"),
+        Candidate(90, 150, 2, "low"),
+        Candidate(60, 120, 4, "high"),
+        Candidate(30, 90, 4, "early"),
+    ]
+    assert [a.session for a in alternates_for(chosen, candidates, 2)] == [
+        "early",
+        "high",
+    ]
+    assert alternates_for(chosen, candidates, 0) == []
+
+
+def test_interests_score():
+    interests = Interests(
+        tracks=["ai"], speakers=["smith"], keywords=["rust"], preferred_durations=[60]
+    )
+    session = {
+        "title": "more rust",
+        "description": "rust and more",
+        "track": "ai/ml",
+        "speakers": ["jane smith"],
+        "duration": 30,
+    }
+    assert interests.score(**session) == 3 + 3 + 2 + 1
+    assert interests.score(**{**session, "duration": 60}) == 3 + 3 + 2 + 1 + 1
+    # the preferred duration alone doesn't make a session worth scheduling
+    assert (
+        interests.score(title="", description="", track="", speakers=[], duration=60)
+        == 0
+    )
+    # without interests every session is worth the same
+    assert Interests([], [], [], [60]).score(**session) == 1
+    assert Interests([], [], [], [60]).score(**{**session, "duration": 60}) == 2
+
+
+def test_interests_keywords_match_whole_words():
+    interests = Interests([], [], ["ai", "c#"], [])
+    assert (
+        interests.score(
+            title="maintaining email pipelines",
+            description="retraining models on bedrock",
+            track="",
+            speakers=[],
+            duration=60,
+        )
+        == 0
+    )
+    assert (
+        interests.score(
+            title="ai agents, in c#", description="", track="", speakers=[], duration=60
+        )
+        == 2 + 2
+    )
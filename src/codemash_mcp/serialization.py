@@ -0,0 +1,118 @@
+import functools
+import inspect
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+import pydantic_core
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware
+from pydantic import TypeAdapter, ValidationError
+
+if TYPE_CHECKING:
+    from fastmcp.tools import FunctionTool
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+
+def encoder() -> str:
+    """The name of the JSON encoder `encode` uses."""
+    return "orjson" if orjson is not None else "pydantic-core"
+
+
+def encode(data: Any) -> str:
+    """Tool results as compact JSON, for the text content of a tool call.
+
+    orjson when it's installed, else pydantic-core, which is what FastMCP uses. Both
+    write the same JSON for the plain dictionaries the tools return.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode()
+        except TypeError:
+            pass
+    return pydantic_core.to_json(data, fallback=str).decode()
+
+
+@functools.cache
+def output_adapter(return_type: Any) -> TypeAdapter:
+    """A validator for a tool's return type, compiled once per type."""
+    return TypeAdapter(return_type)
+
+
+def _return_type(tool: "FunctionTool") -> Any:
+    # follows __wrapped__, so it sees through the tool executor's wrapper
+    return inspect.signature(tool.fn).return_annotation
+
+
+class ToolOutputs(Middleware):
+    """Checks tool results against their return types without the SDK's JSON Schema pass.
+
+    The SDK validates the structured content of every tool call against the tool's
+    output schema with `jsonschema`, in pure Python, which takes longer than the tool
+    itself for a listing of hundreds of sessions. Instead, results are validated with
+    a pydantic adapter compiled once per return type, and results of `prebuilt` tools,
+    which are records mapped from the snapshot and already known to be valid, aren't
+    validated at all. Results then carry the version of the snapshot they were read
+    from, i.e. of their `event` argument, as metadata.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable["FunctionTool"],
+        prebuilt: Iterable[str],
+        version: Callable[[str | None], str],
+    ):
+        tools = list(tools)
+        self.prebuilt = set(prebuilt)
+        self.version = version
+        # compiled up front, so no client call pays for it
+        self._adapters = {
+            tool.name: output_adapter(_return_type(tool))
+            for tool in tools
+            if tool.output_schema is not None
+        }
+        self._wrapped = {
+            tool.name
+            for tool in tools
+            if tool.output_schema and tool.output_schema.get("x-fastmcp-wrap-result")
+        }
+        self._lock = threading.Lock()
+        self._outcomes = {"validated": 0, "trusted": 0, "rejected": 0}
+
+    async def on_call_tool(self, context, call_next):
+        result = await call_next(context)
+        name = context.message.name
+        adapter = self._adapters.get(name)
+        if adapter is None or result.structured_content is None:
+            # not a tool this knows the return type of, leave it to the SDK
+            return result
+        if name in self.prebuilt:
+            self._count("trusted")
+        else:
+            output = result.structured_content
+            if name in self._wrapped:
+                output = output.get("result")
+            try:
+                adapter.validate_python(output)
+            except ValidationError as e:
+                self._count("rejected")
+                raise ToolError(f"Output validation error: {e}") from None
+            self._count("validated")
+        # Setting meta is also what skips the SDK's check: FastMCP turns a result with
+        # meta into a CallToolResult, which the SDK's call_tool handler returns without
+        # validating it. serialization_test pins this.
+        event = (context.message.arguments or {}).get("event")
+        result.meta = {**(result.meta or {}), "version": self.version(event)}
+        return result
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self._outcomes[outcome] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"encoder": encoder(), **self._outcomes}
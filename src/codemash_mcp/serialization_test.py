@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+from typing import Annotated
+
+import jsonschema
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.tools.tool import ToolResult, default_serializer
+from mcp.types import CallToolResult
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.serialization import ToolOutputs, encode, output_adapter
+from codemash_mcp.server import PREBUILT_OUTPUTS
+from codemash_mcp.snapshot import load_snapshot
+from codemash_mcp.types import Session
+
+DATA_DIRECTORY = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_encode_matches_fastmcp():
+    data = [{"id": "1", "title": "Café ☕", "speakers": [], "duration": 60}]
+    assert encode(data) == default_serializer(data)
+
+
+def test_output_adapters_are_compiled_once_per_type():
+    assert output_adapter(list[Session]) is output_adapter(list[Session])
+
+
+def _server(prebuilt: set[str]) -> tuple[FastMCP, ToolOutputs]:
+    mcp = FastMCP("test", tool_serializer=encode)
+
+    def sessions(event: str | None = None) -> Annotated[list[Session], "Sessions"]:
+        return [Session({"id": "s1", "title": "Title"})]
+
+    def broken() -> Annotated[list[Session], "Sessions"]:
+        return [{"id": "s1", "title": ["not", "a", "string"]}]  # pyright: ignore[reportReturnType]
+
+    def untyped():
+        return "text"
+
+    tools = [mcp.tool(sessions), mcp.tool(broken), mcp.tool(untyped)]
+    versions = {None: "v1", "codemash-2025": "v0"}
+    outputs = ToolOutputs(tools, prebuilt, version=versions.__getitem__)
+    mcp.add_middleware(outputs)
+    return mcp, outputs
+
+
+@pytest.mark.anyio
+async def test_results_carry_the_snapshot_version():
+    mcp, outputs = _server(prebuilt=set())
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("sessions", {})
+    assert not result.isError
+    assert result.meta == {"version": "v1"}
+    assert result.structuredContent == {"result": [{"id": "s1", "title": "Title"}]}
+    assert json.loads(result.content[0].text) == [{"id": "s1", "title": "Title"}]  # pyright: ignore[reportAttributeAccessIssue]
+    assert outputs.stats()["validated"] == 1
+
+
+@pytest.mark.anyio
+async def test_results_carry_the_version_of_their_event():
+    mcp, _ = _server(prebuilt=set())
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("sessions", {"event": "codemash-2025"})
+    assert result.meta == {"version": "v0"}
+
+
+def test_results_with_meta_bypass_the_sdk_output_validation():
+    # ToolOutputs relies on this to skip the SDK's JSON Schema pass: the SDK returns a
+    # CallToolResult from a tool handler as it is, and FastMCP only builds one when the
+    # result has meta. If this fails, every result is validated twice again.
+    result = ToolResult(structured_content={"result": []}, meta={"version": "v1"})
+    assert isinstance(result.to_mcp_result(), CallToolResult)
+    assert not isinstance(
+        ToolResult(structured_content={}).to_mcp_result(), CallToolResult
+    )
+
+
+@pytest.mark.anyio
+async def test_invalid_results_are_rejected():
+    mcp, outputs = _server(prebuilt=set())
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("broken", {})
+    assert result.isError
+    assert "Output validation error" in result.content[0].text  # pyright: ignore[reportAttributeAccessIssue]
+    assert outputs.stats()["rejected"] == 1
+
+
+@pytest.mark.anyio
+async def test_prebuilt_results_are_not_validated():
+    mcp, outputs = _server(prebuilt={"broken"})
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("broken", {})
+    assert not result.isError
+    assert outputs.stats()["trusted"] == 1
+
+
+@pytest.mark.anyio
+async def test_tools_without_output_schema_are_left_to_the_sdk():
+    mcp, outputs = _server(prebuilt=set())
+    async with Client(mcp) as client:
+        result = await client.call_tool_mcp("untyped", {})
+    assert result.content[0].text == "text"  # pyright: ignore[reportAttributeAccessIssue]
+    assert result.meta is None
+    assert outputs.stats() == {
+        "encoder": outputs.stats()["encoder"],
+        "validated": 0,
+        "trusted": 0,
+        "rejected": 0,
+    }
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("data_file", ["endpoint-1.json", "endpoint-3.json"])
+async def test_prebuilt_records_match_the_output_schemas(data_file):
+    # what makes skipping their validation safe: every record the prebuilt tools can
+    # return, checked against the schema clients are given
+    path = DATA_DIRECTORY / data_file
+    reader = CodeMashDataReader(path, load_snapshot(path))
+    mcp = FastMCP("test")
+    for name in PREBUILT_OUTPUTS:
+        mcp.tool(getattr(reader, name))
+    tools = await mcp.get_tools()
+
+    session_ids = [session.get("id", "") for session in reader.sessions()]
+    speaker_ids = [speaker.get("id", "") for speaker in reader.speakers()]
+    results = {
+        "sessions": [reader.sessions(), reader.sessions(include_descriptions=False)],
+        "speakers": [reader.speakers(), reader.speakers(include_descriptions=False)],
+        "get_session": [reader.get_session(session_ids)],
+        "get_speaker": [reader.get_speaker(speaker_ids)],
+    }
+    assert set(results) == PREBUILT_OUTPUTS
+    for name, outputs in results.items():
+        output_schema = tools[name].output_schema
+        assert output_schema is not None
+        for output in outputs:
+            assert output
+            jsonschema.validate({"result": output}, output_schema)
@@ -1,48 +1,165 @@
 import logging
-import os
-from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from codemash_mcp.startup import StartupReport
 
-from codemash_mcp.codemash import CodeMashDataReader
+if TYPE_CHECKING:
+    from codemash_mcp.lifecycle import WarmUpArguments
 
-from .utils import (
-    McpRunner,
-    _force_json_logging,
-)
+logger = logging.getLogger(__name__)
 
-_force_json_logging()
 
-from fastmcp import FastMCP  # noqa: E402
-from starlette.responses import JSONResponse  # noqa: E402
+def _sample_session(data: Any) -> dict[str, Any] | None:
+    """A scheduled session of the snapshot being warmed up, with its day, date, room,
+    track and speakers, so tools are warmed up with filters that snapshot has, whatever
+    the year or however its rooms and tracks are named."""
+    from codemash_mcp.helpers import agenda_map_of, map_to_session
 
+    days = {agenda: day for day, agenda in agenda_map_of(data).items()}
+    dates = {agenda: day for day, agenda in getattr(data, "agenda_dates", {}).items()}
+    for session in data.get("sessions", []):
+        day = days.get(session.get("agenda", ""))
+        if day is None or not session.get("startTime"):
+            continue
+        mapped = map_to_session(data, session, include_descriptions=False)
+        if "Unknown" in (mapped.get("venue"), mapped.get("track")):
+            continue
+        return {
+            "id": session.get("id"),
+            "day": day,
+            "date": dates.get(session["agenda"]),
+            "start_time": session["startTime"],
+            "room": mapped.get("venue"),
+            "track": mapped.get("track"),
+            "speakers": [speaker.get("id") for speaker in mapped.get("speakers", [])],
+        }
+    return None
 
-logger = logging.getLogger(__name__)
 
+def _sessions_arguments(data: Any) -> dict[str, Any]:
+    sample = _sample_session(data)
+    if sample is None:
+        return {}
+    return {
+        "day_of_week": sample["day"],
+        "start_time_range": "0800",
+        "end_time_range": "1700",
+        "room_name": sample["room"],
+        "track_name": sample["track"],
+    }
 
-class Config(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_prefix="codemash_",
-        env_file=os.getenv("CODEMASH_ENV_FILE", ".env.codemash"),
-        env_file_encoding="utf-8",
-    )
 
-    data_file: Path = Field(
-        default=Path("data/endpoint-3.json"),
-        description="The location of the CodeMash data file to use.",
-    )
+def _get_session_arguments(data: Any) -> dict[str, Any] | None:
+    sample = _sample_session(data)
+    return {"ids": [sample["id"]]} if sample else None
+
+
+def _get_speaker_arguments(data: Any) -> dict[str, Any] | None:
+    sample = _sample_session(data)
+    return {"ids": sample["speakers"]} if sample and sample["speakers"] else None
+
+
+def _session_facets_arguments(data: Any) -> dict[str, Any]:
+    sample = _sample_session(data)
+    if sample is None:
+        return {}
+    return {"day_of_week": sample["day"], "track_name": sample["track"]}
+
+
+def _build_schedule_arguments(data: Any) -> dict[str, Any]:
+    sample = _sample_session(data)
+    return {"keywords": ["ai"], "days": [sample["day"]] if sample else None}
+
+
+def _now_and_next_arguments(data: Any) -> dict[str, Any]:
+    sample = _sample_session(data)
+    if sample is None or sample["date"] is None:
+        return {}
+    start_time = sample["start_time"]
+    return {
+        "at": f"{sample['date'].isoformat()}T{start_time[:2]}:{start_time[2:]}",
+        "room_name": sample["room"],
+    }
+
+
+def _similar_sessions_arguments(data: Any) -> dict[str, Any] | None:
+    for session in data.get("sessions", []):
+        if session.get("id"):
+            return {"session_id": session["id"]}
+    return None
+
+
+# Representative arguments used to call each tool once before reporting ready, or None
+# for tools left cold until a client calls them. Arguments naming a day, room, track or
+# record are taken from the snapshot being warmed up.
+WARM_UP_ARGUMENTS: "WarmUpArguments" = {
+    "speakers": {"speaker_name": "a"},
+    "sessions": _sessions_arguments,
+    "get_session": _get_session_arguments,
+    "get_speaker": _get_speaker_arguments,
+    "session_facets": _session_facets_arguments,
+    "build_schedule": _build_schedule_arguments,
+    "now_and_next": _now_and_next_arguments,
+    "changes_since": {"since": "2026-01-01T00:00:00Z"},
+    # rarely asked for, their indexes are built by the first call that needs them
+    "sponsors": None,
+    "expo_booths": None,
+    # its index is built before the snapshot is served rather than on the first call
+    "similar_sessions": _similar_sessions_arguments,
+}
+
+# Tools whose results are records mapped from the snapshot, which the tests check
+# against the output schemas, so they aren't validated again on every call
+PREBUILT_OUTPUTS = {"sessions", "speakers", "get_session", "get_speaker"}
 
 
 def _init_mcp_server():
-    cfg = Config()  # pyright: ignore[reportCallIssue]
-    logger.debug(f"Loaded configuration: {cfg.model_dump_json()}")
+    report = StartupReport()
+
+    # heavy modules are imported here rather than at module import, so importing this
+    # module (or the package) stays cheap until the server is actually needed
+    with report.phase("imports"):
+        from .utils import _force_json_logging
+
+        _force_json_logging()
+
+        import functools
+
+        from fastmcp import FastMCP
+        from starlette.concurrency import run_in_threadpool
+        from starlette.responses import JSONResponse
+
+        from codemash_mcp.codemash import CodeMashDataReader
+        from codemash_mcp.config import Config
+        from codemash_mcp.executor import ToolExecutor
+        from codemash_mcp.export import export_response
+        from codemash_mcp.lifecycle import Readiness, SnapshotLifecycle
+        from codemash_mcp.memory import memory_report
+        from codemash_mcp.metrics import MetricsRegistry
+        from codemash_mcp.ratelimit import RateLimiter
+        from codemash_mcp.resources import ConferenceResources
+        from codemash_mcp.serialization import ToolOutputs, encode
+        from codemash_mcp.snapshot import load_snapshot
+
+        from .utils import McpRunner, logging_stats
+
+    with report.phase("config"):
+        cfg = Config()  # pyright: ignore[reportCallIssue]
+        logger.debug(f"Loaded configuration: {cfg.model_dump_json()}")
+
+    with report.phase("data_load"):
+        snapshot = load_snapshot(cfg.data_file)
+
+    with report.phase("index_build"):
+        snapshot.build_indexes()
 
     # STEP: 1 - Init FastMCP & provide base instructions
     # create & register tools
-    mcp = FastMCP(
-        name="CodeMash 2026 Conference MCP",
-        instructions="""A set of tools that can be used for retrieving information about the CodeMash 2026 conference,
+    with report.phase("tool_registration"):
+        mcp = FastMCP(
+            name="CodeMash 2026 Conference MCP",
+            tool_serializer=encode,
+            instructions="""A set of tools that can be used for retrieving information about the CodeMash 2026 conference,
             including sessions, speakers, and schedules.
         
             CodeMash is a unique event that educates developers on current practices, methodologies and technology
@@ -62,24 +179,141 @@ def _init_mcp_server():
             career skills, software development processes, and so much more! There are also two days worth of
             hands-on workshops covering everything from test driven development to improving your communication
             skills to augment the two basic days of sessions.""",
-    )
+        )
 
-    # STEP: 4 - Register tools
-    code_mash = CodeMashDataReader(cfg.data_file)
-    mcp.tool(code_mash.event)
-    mcp.tool(code_mash.hotels)
-    mcp.tool(code_mash.speakers)
-    mcp.tool(code_mash.sessions)
-    mcp.tool(code_mash.rooms)
-    mcp.tool(code_mash.tracks)
-    mcp.tool(code_mash.venue)
+        # STEP: 4 - Register tools
+        # tools are CPU-bound, so they run on a bounded worker pool to keep the event loop free
+        metrics = MetricsRegistry()
+        metrics.register("logging", logging_stats)
+        events = {
+            "event_name": cfg.event_name,
+            "event_files": cfg.event_files,
+            "event_memory_budget": cfg.event_memory_budget_mb * 1024 * 1024,
+            "backend": cfg.query_backend,
+            "shadow_sample_rate": cfg.shadow_sample_rate,
+            "change_log_size": cfg.change_log_size,
+        }
+        code_mash = CodeMashDataReader(cfg.data_file, snapshot, **events)
+        executor = ToolExecutor(
+            kind=cfg.tool_executor,
+            max_workers=cfg.tool_workers,
+            max_queue=cfg.tool_queue_depth,
+            target_factory=functools.partial(
+                CodeMashDataReader, cfg.data_file, **events
+            ),
+        )
+        metrics.register("tool_executor", executor.stats)
+        metrics.register("events", code_mash.other_events.stats)
+        metrics.register("changes", code_mash.changes.stats)
+        if code_mash.shadow is not None:
+            metrics.register("shadow", code_mash.shadow.stats)
 
-    # register health check
-    @mcp.custom_route("/health", ["GET"])
-    async def health_check(response):
-        return JSONResponse({"status": "OK"})
+        tools = [
+            mcp.tool(executor.offload(code_mash.event_names)),
+            mcp.tool(executor.offload(code_mash.event)),
+            mcp.tool(executor.offload(code_mash.hotels)),
+            mcp.tool(executor.offload(code_mash.speakers)),
+            mcp.tool(executor.offload(code_mash.sessions)),
+            mcp.tool(executor.offload(code_mash.get_session)),
+            mcp.tool(executor.offload(code_mash.get_speaker)),
+            mcp.tool(executor.offload(code_mash.session_facets)),
+            mcp.tool(executor.offload(code_mash.build_schedule)),
+            mcp.tool(executor.offload(code_mash.now_and_next)),
+            mcp.tool(executor.offload(code_mash.similar_sessions)),
+            # answered from this process's change log, which worker processes don't
+            # have, and only merges records built at reload time
+            mcp.tool(code_mash.changes_since),
+            mcp.tool(executor.offload(code_mash.rooms)),
+            mcp.tool(executor.offload(code_mash.tracks)),
+            mcp.tool(executor.offload(code_mash.venue)),
+            mcp.tool(executor.offload(code_mash.sponsors)),
+            mcp.tool(executor.offload(code_mash.expo_booths)),
+        ]
+        # results are checked against compiled return types rather than by the SDK's
+        # JSON Schema pass, which is most of the cost of a large listing
+        outputs = ToolOutputs(
+            tools,
+            PREBUILT_OUTPUTS,
+            version=lambda event: code_mash.snapshot(event).version,
+        )
+        mcp.add_middleware(outputs)
+        metrics.register("tool_outputs", outputs.stats)
 
-    return McpRunner(mcp)
+        # the data that only changes with the export is also served as resources
+        resources = ConferenceResources(mcp, code_mash)
+        metrics.register("resources", resources.stats)
+
+        readiness = Readiness()
+        lifecycle = SnapshotLifecycle(
+            mcp,
+            code_mash,
+            readiness,
+            WARM_UP_ARGUMENTS,
+            reload_interval=cfg.reload_interval,
+        )
+        lifecycle.reload_listeners.append(executor.restart_workers)
+        lifecycle.reload_listeners.append(resources.on_reload)
+        metrics.register("readiness", readiness.status)
+
+        # register health check, a cheap liveness check that never touches the data
+        @mcp.custom_route("/health", ["GET"])
+        async def health_check(response):
+            return JSONResponse({"status": "OK"})
+
+        # register readiness check, only OK once the snapshot is loaded & warmed up
+        @mcp.custom_route("/ready", ["GET"])
+        async def readiness_check(response):
+            status = readiness.status()
+            if status["ready"]:
+                return JSONResponse({"status": "READY", "version": status["version"]})
+            return JSONResponse(
+                {"status": "NOT_READY", "reason": status["reason"]}, status_code=503
+            )
+
+        # register bulk exports, NDJSON streamed from the snapshot for partners mirroring the data
+        @mcp.custom_route("/export/{name}.ndjson", ["GET"])
+        async def export(request):
+            return await export_response(request, code_mash)
+
+        # register metrics, these never touch the tool executor so they answer under load
+        @mcp.custom_route("/metrics", ["GET"])
+        async def metrics_report(response):
+            return JSONResponse(metrics.collect())
+
+        # register memory diagnostics, a walk of everything the reader holds, so it's
+        # kept off the event loop and out of /metrics
+        @mcp.custom_route("/diagnostics/memory", ["GET"])
+        async def memory_diagnostics(response):
+            report = await run_in_threadpool(
+                memory_report,
+                code_mash,
+                {"tool_outputs": outputs, "resources": resources},
+            )
+            return JSONResponse(report)
+
+    report.log(budget_ms=cfg.startup_budget_ms)
+    metrics.register("startup", report.as_dict)
+    lifecycle.start()
+    return McpRunner(
+        mcp,
+        metrics=metrics,
+        lifecycle=lifecycle,
+        compression_min_bytes=cfg.compression_min_bytes if cfg.compression else None,
+        rate_limiter=(
+            RateLimiter(cfg.rate_limit_per_second, cfg.rate_limit_burst)
+            if cfg.rate_limit_per_second
+            else None
+        ),
+        max_sessions=cfg.max_sessions or None,
+        session_idle_timeout=cfg.session_idle_timeout or None,
+        stateless=cfg.stateless_http,
+    )
 
 
-server = _init_mcp_server()
+def __getattr__(name: str):
+    # build the server on first use rather than at import time
+    if name == "server":
+        global server
+        server = _init_mcp_server()
+        return server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from fastmcp import Client
 import pytest
 
@@ -5,6 +8,11 @@ from codemash_mcp.server import _init_mcp_server
 from starlette.routing import Route
 from starlette.testclient import TestClient
 
+IMPORT_PROBE = """
+import sys, codemash_mcp, codemash_mcp.server
+print('fastmcp' in sys.modules, 'pydantic_settings' in sys.modules)
+"""
+
 
 @pytest.fixture
 def anyio_backend():
@@ -18,7 +26,18 @@ def server(monkeypatch):
 
     # Import and create a custom server MCP object
     server = _init_mcp_server()
-    return server
+    assert server.lifecycle is not None
+    yield server
+    server.lifecycle.stop()
+
+
+@pytest.fixture
+def full_server(monkeypatch):
+    monkeypatch.setenv("CODEMASH_DATA_FILE", "data/endpoint-1.json")
+    server = _init_mcp_server()
+    assert server.lifecycle is not None
+    yield server
+    server.lifecycle.stop()
 
 
 class TestMcpServer:
@@ -51,3 +70,79 @@ class TestMcpServer:
         response = client.get("/health")
         assert response.status_code == 200
         assert response.json() == {"status": "OK"}
+
+    @pytest.mark.anyio
+    async def test_metrics_route_reports_tool_executor(self, server):
+        server_app = server.test().http_app()
+
+        client = TestClient(server_app)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        stats = response.json()["tool_executor"]
+        assert stats["kind"] == "thread"
+        assert stats["rejected"] == 0
+
+    @pytest.mark.anyio
+    async def test_should_call_tool_on_worker_pool(self, server):
+        mcp_client = Client(server.test())
+        async with mcp_client as client:
+            result = await client.call_tool("sessions", {})
+            assert result.structured_content == {"result": []}
+
+    def test_ready_route_is_not_ready_with_invalid_data(self, server):
+        assert server.lifecycle.wait_prepared(10)
+        client = TestClient(server.test().http_app())
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "NOT_READY"
+        assert "missing collection 'events'" in response.json()["reason"]
+
+    def test_ready_route_is_ready_after_warm_up(self, full_server):
+        assert full_server.lifecycle.readiness.wait(10)
+        client = TestClient(full_server.test().http_app())
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "READY",
+            "version": full_server.lifecycle.reader.data.version,
+        }
+        assert full_server.lifecycle.readiness.status()["warm_up_failures"] == {}
+
+    def test_memory_route_reports_collections_and_indexes(self, full_server):
+        assert full_server.lifecycle.readiness.wait(10)
+        client = TestClient(full_server.test().http_app())
+        response = client.get("/diagnostics/memory")
+        assert response.status_code == 200
+        report = response.json()
+        assert report["process"]["rss_bytes"] > 0
+        event = report["events"]["codemash-2026"]
+        assert event["collections"]["sessions"] > 0
+        assert event["lookups"]["sessions.id"] > 0
+        assert "facets" in event["derived"]
+        assert "similar_sessions" in event["derived"]
+        assert set(report["caches"]) == {"changes", "tool_outputs", "resources"}
+
+    def test_metrics_report_startup_phases(self, server):
+        startup = server.metrics.collect()["startup"]
+        assert {
+            "imports",
+            "config",
+            "data_load",
+            "index_build",
+            "tool_registration",
+        } == set(startup["phases_ms"])
+
+
+def test_import_does_not_build_server():
+    # run in a fresh interpreter, the test session has already imported everything
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            IMPORT_PROBE,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False False"
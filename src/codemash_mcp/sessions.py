@@ -0,0 +1,256 @@
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable, Container
+from typing import TYPE_CHECKING, Any
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = "mcp-session-id"
+# The longest time between sweeps. Short idle timeouts sweep more often.
+SWEEP_INTERVAL = 30.0
+
+
+def find_session_manager(app: "Starlette") -> "StreamableHTTPSessionManager | None":
+    """The session manager behind FastMCP's streamable-http route.
+
+    FastMCP doesn't expose it, but the route's endpoint is a wrapper that holds it.
+    """
+    for route in app.routes:
+        manager = getattr(getattr(route, "endpoint", None), "session_manager", None)
+        if manager is not None:
+            return manager
+    return None
+
+
+def live_sessions(app: "Starlette") -> "Container[str] | None":
+    """The ids of the sessions a FastMCP streamable-http app has open, as they change.
+
+    None when the app keeps no sessions.
+    """
+    manager = find_session_manager(app)
+    if manager is None or manager.stateless:
+        return None
+    # the SDK has no API for this, so go to its table directly
+    return manager._server_instances
+
+
+class SessionReaper:
+    """Keeps the streamable-http session table bounded.
+
+    The SDK keeps a transport (and the task running its server session) for every
+    client that ever initialized, until the client sends a DELETE. Clients that just go
+    away are kept forever, and even DELETEd sessions stay in the table. This evicts:
+
+    - sessions with no request for `idle_timeout` seconds, on a periodic sweep
+    - the least recently used sessions, as soon as there are more than `max_sessions`
+    - terminated sessions, on the sweep
+
+    A session with a request in flight (i.e. an open server-push stream) is never idle.
+    Activity is recorded by `SessionActivityMiddleware`.
+    """
+
+    def __init__(
+        self,
+        manager: "StreamableHTTPSessionManager",
+        max_sessions: int | None = None,
+        idle_timeout: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.manager = manager
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        # session id to (last request, requests in flight), least recently used first
+        self._activity: dict[str, tuple[float, int]] = {}
+        self._evicted = {"idle": 0, "over_limit": 0, "terminated": 0}
+
+    @property
+    def _transports(self) -> dict[str, Any]:
+        # the SDK has no API for this, so go to its table directly
+        return self.manager._server_instances
+
+    def started(self, session_id: str):
+        if session_id not in self._transports:
+            return
+        _, in_flight = self._activity.pop(session_id, (0.0, 0))
+        self._activity[session_id] = (self._clock(), in_flight + 1)
+
+    def finished(self, session_id: str):
+        if session_id not in self._activity:
+            return
+        _, in_flight = self._activity.pop(session_id)
+        self._activity[session_id] = (self._clock(), max(in_flight - 1, 0))
+
+    async def _evict(self, session_id: str, reason: str):
+        self._activity.pop(session_id, None)
+        transport = self._transports.pop(session_id, None)
+        self._evicted[reason] += 1
+        if transport is not None and not transport.is_terminated:
+            logger.info(f"Evicting {reason} session {session_id}")
+            await transport.terminate()
+
+    async def enforce_limit(self):
+        """Evict the least recently used idle sessions until within `max_sessions`."""
+        if self.max_sessions is None:
+            return
+        excess = len(self._transports) - self.max_sessions
+        if excess <= 0:
+            return
+        # sessions that never made a request through the middleware are the oldest
+        untracked = [sid for sid in self._transports if sid not in self._activity]
+        idle = [sid for sid, (_, n) in self._activity.items() if n == 0]
+        for session_id in [*untracked, *idle][:excess]:
+            await self._evict(session_id, "over_limit")
+
+    async def sweep(self):
+        for session_id, transport in list(self._transports.items()):
+            if transport.is_terminated:
+                await self._evict(session_id, "terminated")
+        for session_id in list(self._activity):
+            if session_id not in self._transports:
+                del self._activity[session_id]
+        if self.idle_timeout is not None:
+            cutoff = self._clock() - self.idle_timeout
+            for session_id, (last, in_flight) in list(self._activity.items()):
+                if in_flight == 0 and last < cutoff:
+                    await self._evict(session_id, "idle")
+        await self.enforce_limit()
+
+    @property
+    def interval(self) -> float:
+        if self.idle_timeout is None:
+            return SWEEP_INTERVAL
+        return max(min(SWEEP_INTERVAL, self.idle_timeout / 2), 0.1)
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """Sweep every `interval` seconds while the app is running."""
+
+        async def sweep_forever():
+            while True:
+                await anyio.sleep(self.interval)
+                try:
+                    await self.sweep()
+                except Exception:
+                    logger.exception("Session sweep failed")
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(sweep_forever)
+            try:
+                yield
+            finally:
+                tg.cancel_scope.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active": len(self._transports),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            "evicted": dict(self._evicted),
+        }
+
+
+class SessionActivityMiddleware:
+    """Tells the reaper when each session's requests start and finish.
+
+    New sessions are seen in the response's session header, and the limit is enforced
+    once their initialize request is done.
+    """
+
+    def __init__(self, app: ASGIApp, reaper: SessionReaper, mcp_path: str = "/mcp"):
+        self.app = app
+        self.reaper = reaper
+        self.mcp_path = mcp_path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].rstrip("/") != self.mcp_path:
+            await self.app(scope, receive, send)
+            return
+
+        session_id = Headers(scope=scope).get(SESSION_HEADER)
+        created = None
+
+        async def send_with_session(message: Message):
+            nonlocal created
+            if message["type"] == "http.response.start" and session_id is None:
+                created = Headers(raw=message["headers"]).get(SESSION_HEADER)
+                if created:
+                    self.reaper.started(created)
+            await send(message)
+
+        if session_id:
+            self.reaper.started(session_id)
+        try:
+            await self.app(scope, receive, send_with_session)
+        finally:
+            if session_id or created:
+                self.reaper.finished(session_id or created)  # pyright: ignore[reportArgumentType]
+        if created:
+            await self.reaper.enforce_limit()
+
+
+class SharedSseShutdownMiddleware:
+    """Works around sse-starlette starting a shutdown watcher for every SSE response.
+
+    sse-starlette 3.1 keeps its "watcher started" flag in a context variable, and every
+    request runs in a fresh context, so each response starts another watcher task that
+    polls until the server exits, holding on to its request. With one shared state per
+    event loop there is one watcher, as intended.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        try:
+            from sse_starlette.sse import _shutdown_state, _ShutdownState
+        except ImportError:
+            # fixed or reworked upstream, nothing to do
+            self._var = None
+        else:
+            self._var, self._state_type = _shutdown_state, _ShutdownState
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if self._var is not None and scope["type"] == "http":
+            loop = asyncio.get_running_loop()
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = self._state_type()
+            self._var.set(state)
+        await self.app(scope, receive, send)
+
+
+def install_reaper(
+    app: "Starlette",
+    max_sessions: int | None = None,
+    idle_timeout: float | None = None,
+) -> SessionReaper | None:
+    """Add a session reaper to a FastMCP streamable-http app, running with its lifespan."""
+    manager = find_session_manager(app)
+    if manager is None or manager.stateless:
+        return None
+    reaper = SessionReaper(manager, max_sessions, idle_timeout)
+    app.add_middleware(
+        SessionActivityMiddleware, reaper=reaper, mcp_path=app.state.path.rstrip("/")
+    )
+    lifespan = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan_with_reaper(app: "Starlette") -> AsyncIterator[None]:
+        async with lifespan(app), reaper.run():
+            yield
+
+    app.router.lifespan_context = lifespan_with_reaper
+    return reaper
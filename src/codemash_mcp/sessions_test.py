@@ -0,0 +1,193 @@
+import pytest
+from fastmcp import FastMCP
+from starlette.testclient import TestClient
+
+from codemash_mcp.metrics import MetricsRegistry
+from codemash_mcp.ratelimit import RateLimiter
+from codemash_mcp.sessions import SessionReaper, find_session_manager, install_reaper
+from codemash_mcp.utils import McpRunner
+
+HEADERS = {
+    "accept": "application/json, text/event-stream",
+    "content-type": "application/json",
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _mcp() -> FastMCP:
+    mcp = FastMCP("test")
+
+    @mcp.tool
+    def venue() -> str:
+        return "Kalahari"
+
+    return mcp
+
+
+def _initialize(client: TestClient) -> str:
+    response = client.post(
+        "/mcp",
+        headers=HEADERS,
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "test", "version": "0"},
+            },
+        },
+    )
+    session_id = response.headers["mcp-session-id"]
+    client.post(
+        "/mcp",
+        headers={**HEADERS, "mcp-session-id": session_id},
+        json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+    )
+    return session_id
+
+
+def _call(client: TestClient, session_id: str) -> int:
+    return client.post(
+        "/mcp",
+        headers={**HEADERS, "mcp-session-id": session_id},
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "venue", "arguments": {}},
+        },
+    ).status_code
+
+
+@pytest.fixture
+def reaper_client():
+    clock = Clock()
+    app = _mcp().http_app(transport="streamable-http")
+    reaper = install_reaper(app, max_sessions=2, idle_timeout=60)
+    assert reaper is not None
+    reaper._clock = clock
+    with TestClient(app) as client:
+        yield reaper, client, clock
+
+
+def test_least_recently_used_sessions_are_evicted_over_the_limit(reaper_client):
+    reaper, client, clock = reaper_client
+    first = _initialize(client)
+    clock.now = 1
+    second = _initialize(client)
+    clock.now = 2
+    assert _call(client, first) == 200
+    clock.now = 3
+    third = _initialize(client)
+
+    assert reaper.stats()["active"] == 2
+    assert reaper.stats()["evicted"]["over_limit"] == 1
+    assert _call(client, first) == 200
+    assert _call(client, third) == 200
+    # the evicted session is unknown now, so the client has to initialize again
+    assert _call(client, second) == 400
+
+
+def test_idle_sessions_are_evicted_on_sweep(reaper_client):
+    reaper, client, clock = reaper_client
+    idle = _initialize(client)
+    clock.now = 50
+    busy = _initialize(client)
+    clock.now = 100
+    client.portal.call(reaper.sweep)  # pyright: ignore[reportOptionalMemberAccess]
+
+    assert reaper.stats()["evicted"]["idle"] == 1
+    assert _call(client, idle) == 400
+    assert _call(client, busy) == 200
+
+
+def test_closed_sessions_are_removed_on_sweep(reaper_client):
+    reaper, client, _ = reaper_client
+    session_id = _initialize(client)
+    client.delete("/mcp", headers={**HEADERS, "mcp-session-id": session_id})
+    # the SDK keeps terminated sessions in its table
+    assert reaper.stats()["active"] == 1
+    client.portal.call(reaper.sweep)  # pyright: ignore[reportOptionalMemberAccess]
+    assert reaper.stats()["active"] == 0
+    assert reaper.stats()["evicted"]["terminated"] == 1
+
+
+def test_sessions_with_requests_in_flight_are_not_idle():
+    clock = Clock()
+    app = _mcp().http_app(transport="streamable-http")
+    manager = find_session_manager(app)
+    assert manager is not None
+    reaper = SessionReaper(manager, idle_timeout=10, clock=clock)
+    manager._server_instances["s1"] = object()  # pyright: ignore[reportArgumentType]
+    reaper.started("s1")
+    clock.now = 100
+    assert [sid for sid, (_, n) in reaper._activity.items() if n == 0] == []
+    reaper.finished("s1")
+    assert reaper._activity["s1"] == (100, 0)
+
+
+def test_runner_adds_the_reaper_and_its_metrics():
+    metrics = MetricsRegistry()
+    runner = McpRunner(_mcp(), metrics=metrics, max_sessions=10)
+    with TestClient(runner.host()) as client:
+        _initialize(client)
+    assert metrics.collect()["sessions"]["max_sessions"] == 10
+
+
+def test_runner_limits_live_sessions_by_session():
+    limiter = RateLimiter(rate=1, burst=100)
+    runner = McpRunner(_mcp(), rate_limiter=limiter)
+    with TestClient(runner.host()) as client:
+        session_id = _initialize(client)
+        assert _call(client, session_id) == 200
+        _call(client, "made-up")
+    assert set(limiter._buckets) == {
+        "ip:testclient",
+        f"session:{session_id}",
+        "sessions@ip:testclient",
+    }
+
+
+def test_stateless_runner_keeps_no_sessions():
+    metrics = MetricsRegistry()
+    runner = McpRunner(_mcp(), metrics=metrics, max_sessions=10, stateless=True)
+    with TestClient(runner.host()) as client:
+        response = client.post(
+            "/mcp",
+            headers=HEADERS,
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "venue", "arguments": {}},
+            },
+        )
+        assert response.status_code == 200
+        assert "mcp-session-id" not in response.headers
+    assert "sessions" not in metrics.collect()
+
+
+def test_sse_responses_share_one_shutdown_watcher():
+    import asyncio
+
+    async def watchers() -> int:
+        return sum(
+            getattr(task.get_coro(), "__name__", None) == "_shutdown_watcher"
+            for task in asyncio.all_tasks()
+        )
+
+    runner = McpRunner(_mcp())
+    with TestClient(runner.host()) as client:
+        session_id = _initialize(client)
+        for _ in range(5):
+            assert _call(client, session_id) == 200
+        assert client.portal.call(watchers) <= 1  # pyright: ignore[reportOptionalMemberAccess]
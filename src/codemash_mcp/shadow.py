@@ -0,0 +1,164 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Reference runs waiting or running at once. Samples beyond this are dropped rather
+# than queued, so a burst of calls can't build up a backlog of comparisons.
+MAX_PENDING = 2
+# Differing results named in a mismatch log line, per side
+MAX_LOGGED = 5
+
+
+def _canonical(item: Any) -> str:
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def diff(primary: list, reference: list) -> tuple[list, list]:
+    """The results only in `primary` and only in `reference`, ignoring order."""
+    primary_counts = Counter(_canonical(item) for item in primary)
+    reference_counts = Counter(_canonical(item) for item in reference)
+    return (
+        list((primary_counts - reference_counts).elements()),
+        list((reference_counts - primary_counts).elements()),
+    )
+
+
+def _describe(items: list[str]) -> str:
+    names = []
+    for item in items[:MAX_LOGGED]:
+        value = json.loads(item)
+        names.append(str(value.get("id", item)) if isinstance(value, dict) else item)
+    more = f" and {len(items) - MAX_LOGGED} more" if len(items) > MAX_LOGGED else ""
+    return ", ".join(names) + more
+
+
+class ShadowComparator:
+    """Checks a query backend against the reference (python) one on live calls.
+
+    A `sample_rate` fraction of calls also runs the reference path, on a background
+    thread after the backend's result has been returned, and compares the two results
+    as multisets (order is ignored). Mismatches are logged with the call's arguments and
+    the ids of the differing results. Both paths' latencies are recorded per tool.
+
+    The reference runs on one thread, with at most `MAX_PENDING` runs outstanding, so
+    under load samples are dropped instead of competing with tool calls for the workers.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        backend: str,
+        sample: Callable[[], float] = random.random,
+    ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.backend = backend
+        self._sample = sample
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="codemash-shadow"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._dropped = 0
+        self._failed = 0
+        # tool name to its compared, mismatched and latency counters
+        self._tools: dict[str, dict[str, float]] = {}
+
+    def sampled(self) -> bool:
+        return self.sample_rate > 0 and self._sample() < self.sample_rate
+
+    def submit(
+        self,
+        tool: str,
+        arguments: dict[str, Any],
+        result: list,
+        seconds: float,
+        reference: Callable[[], list],
+    ):
+        """Compare `result`, which took `seconds`, with `reference()` in the background."""
+        with self._lock:
+            if self._pending >= MAX_PENDING:
+                self._dropped += 1
+                return
+            self._pending += 1
+        self._pool.submit(self._compare, tool, arguments, result, seconds, reference)
+
+    def _compare(
+        self,
+        tool: str,
+        arguments: dict[str, Any],
+        result: list,
+        seconds: float,
+        reference: Callable[[], list],
+    ):
+        try:
+            start = time.perf_counter()
+            expected = reference()
+            reference_seconds = time.perf_counter() - start
+            only_primary, only_reference = diff(result, expected)
+        except Exception:
+            logger.exception(f"Shadow comparison of {tool} failed")
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            return
+
+        mismatch = bool(only_primary or only_reference)
+        if mismatch:
+            logger.warning(
+                f"Shadow mismatch in {tool}({_canonical(arguments)}):"
+                f" {self.backend} returned {len(result)} results, python {len(expected)}."
+                f" Only in {self.backend}: {_describe(only_primary) or 'none'}."
+                f" Only in python: {_describe(only_reference) or 'none'}."
+            )
+        with self._lock:
+            self._pending -= 1
+            counters = self._tools.setdefault(
+                tool,
+                {
+                    "compared": 0,
+                    "mismatched": 0,
+                    "primary_seconds": 0.0,
+                    "reference_seconds": 0.0,
+                },
+            )
+            counters["compared"] += 1
+            counters["mismatched"] += mismatch
+            counters["primary_seconds"] += seconds
+            counters["reference_seconds"] += reference_seconds
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            tools = {
+                tool: {
+                    "compared": int(counters["compared"]),
+                    "mismatched": int(counters["mismatched"]),
+                    "primary_mean_ms": round(
+                        counters["primary_seconds"] * 1000 / counters["compared"], 3
+                    ),
+                    "reference_mean_ms": round(
+                        counters["reference_seconds"] * 1000 / counters["compared"], 3
+                    ),
+                }
+                for tool, counters in self._tools.items()
+            }
+            return {
+                "backend": self.backend,
+                "sample_rate": self.sample_rate,
+                "pending": self._pending,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "tools": tools,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
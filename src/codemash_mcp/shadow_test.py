@@ -0,0 +1,157 @@
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.shadow import MAX_PENDING, ShadowComparator, diff
+from codemash_mcp.snapshot import load_snapshot
+
+DATA_FILE = Path(__file__).parents[2] / "data" / "endpoint-3.json"
+
+
+@pytest.fixture
+def comparator():
+    shadow = ShadowComparator(1.0, "sqlite")
+    yield shadow
+    shadow.shutdown()
+
+
+def test_diff_ignores_order():
+    assert diff([{"id": "a"}, {"id": "b"}], [{"id": "b"}, {"id": "a"}]) == ([], [])
+
+
+def test_diff_counts_duplicates():
+    only_primary, only_reference = diff([{"id": "a"}, {"id": "a"}], [{"id": "a"}])
+    assert only_primary == ['{"id": "a"}']
+    assert only_reference == []
+
+
+def test_diff_compares_whole_results():
+    only_primary, only_reference = diff(
+        [{"id": "a", "title": "New"}], [{"id": "a", "title": "Old"}]
+    )
+    assert len(only_primary) == len(only_reference) == 1
+
+
+def test_sample_rate_must_be_a_fraction():
+    with pytest.raises(ValueError):
+        ShadowComparator(1.5, "sqlite")
+
+
+def test_sampled():
+    assert ShadowComparator(0.5, "sqlite", sample=lambda: 0.2).sampled()
+    assert not ShadowComparator(0.5, "sqlite", sample=lambda: 0.7).sampled()
+    assert not ShadowComparator(0, "sqlite", sample=lambda: 0.0).sampled()
+
+
+def test_matching_results_are_counted(comparator):
+    comparator.submit("sessions", {}, [{"id": "a"}], 0.001, lambda: [{"id": "a"}])
+    comparator.shutdown()
+
+    stats = comparator.stats()
+    assert stats["tools"]["sessions"]["compared"] == 1
+    assert stats["tools"]["sessions"]["mismatched"] == 0
+    assert stats["tools"]["sessions"]["primary_mean_ms"] == 1.0
+    assert stats["pending"] == 0
+
+
+def test_mismatches_are_logged(comparator, caplog):
+    with caplog.at_level(logging.WARNING, logger="codemash_mcp.shadow"):
+        comparator.submit(
+            "sessions",
+            {"track_name": "AI/ML"},
+            [{"id": "a"}, {"id": "b"}],
+            0.001,
+            lambda: [{"id": "a"}, {"id": "c"}],
+        )
+        comparator.shutdown()
+
+    assert comparator.stats()["tools"]["sessions"]["mismatched"] == 1
+    assert "Shadow mismatch in sessions" in caplog.text
+    assert '"track_name": "AI/ML"' in caplog.text
+    assert "Only in sqlite: b." in caplog.text
+    assert "Only in python: c." in caplog.text
+
+
+def test_failed_reference_is_counted(comparator):
+    def reference():
+        raise RuntimeError("boom")
+
+    comparator.submit("sessions", {}, [], 0.001, reference)
+    comparator.shutdown()
+
+    assert comparator.stats()["failed"] == 1
+    assert comparator.stats()["pending"] == 0
+
+
+def test_samples_are_dropped_while_comparisons_are_pending(comparator):
+    release = threading.Event()
+
+    def reference():
+        release.wait(5)
+        return []
+
+    for _ in range(MAX_PENDING + 3):
+        comparator.submit("sessions", {}, [], 0.001, reference)
+    release.set()
+    comparator.shutdown()
+
+    stats = comparator.stats()
+    assert stats["dropped"] == 3
+    assert stats["tools"]["sessions"]["compared"] == MAX_PENDING
+
+
+def test_reader_shadows_sampled_calls():
+    reader = CodeMashDataReader(
+        DATA_FILE,
+        load_snapshot(DATA_FILE),
+        backend="sqlite",
+        shadow_sample_rate=1.0,
+    )
+    assert reader.shadow is not None
+
+    sessions = reader.sessions(day_of_week="THURSDAY", include_descriptions=False)
+    reader.speakers(speaker_name="an")
+    reader.shadow.shutdown()
+
+    assert sessions
+    stats = reader.shadow.stats()
+    assert stats["backend"] == "sqlite"
+    assert stats["tools"]["sessions"]["compared"] == 1
+    assert stats["tools"]["sessions"]["mismatched"] == 0
+    assert stats["tools"]["speakers"]["mismatched"] == 0
+
+
+def test_reader_does_not_shadow_the_python_backend():
+    reader = CodeMashDataReader(
+        DATA_FILE,
+        load_snapshot(DATA_FILE),
+        backend="python",
+        shadow_sample_rate=1.0,
+    )
+    assert reader.shadow is None
+
+
+def test_reader_reports_a_backend_drift(monkeypatch, caplog):
+    reader = CodeMashDataReader(
+        DATA_FILE,
+        load_snapshot(DATA_FILE),
+        backend="sqlite",
+        shadow_sample_rate=1.0,
+    )
+    assert reader.shadow is not None
+    original = reader._sessions
+
+    def drifting(backend, *args, **kwargs):
+        found = original(backend, *args, **kwargs)
+        return found[1:] if backend == "sqlite" else found
+
+    monkeypatch.setattr(reader, "_sessions", drifting)
+    with caplog.at_level(logging.WARNING, logger="codemash_mcp.shadow"):
+        reader.sessions(day_of_week="THURSDAY")
+        reader.shadow.shutdown()
+
+    assert reader.shadow.stats()["tools"]["sessions"]["mismatched"] == 1
+    assert "Only in python" in caplog.text
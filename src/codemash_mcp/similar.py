@@ -0,0 +1,230 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any
+
+from codemash_mcp.helpers import event_id_of, find_matching_id, is_codemash_event
+from codemash_mcp.schedule import parse_hhmm
+from codemash_mcp.snapshot import Snapshot, find_items
+
+try:
+    import numpy as np  # pyright: ignore[reportMissingImports]
+except ImportError:
+    np = None
+
+# How many neighbors are kept for each session. Leaving out conflicting sessions can
+# only drop some of these, so it's well over the most a call may ask for.
+NEIGHBORS = 30
+MAX_SIMILAR = 10
+
+# How many times a title's words count, against once for its description's
+TITLE_WEIGHT = 2
+# Rows of the similarity matrix computed at once by the numpy path
+BLOCK_ROWS = 512
+
+# The collections a session's terms are read from
+SIMILAR_INPUTS = [
+    "events",
+    "sessions",
+    "sessionTranslations",
+    "trackTranslations",
+    "sessionSpeakers",
+]
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# fmt: off
+STOP_WORDS = frozenset({
+    "a", "about", "all", "also", "an", "and", "are", "as", "at", "be", "but", "by",
+    "can", "do", "for", "from", "get", "has", "have", "how", "i", "if", "in", "into",
+    "is", "it", "its", "more", "my", "not", "of", "on", "one", "or", "our", "out", "so",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this", "to",
+    "up", "us", "use", "using", "was", "we", "what", "when", "which", "will", "with",
+    "you", "your",
+})
+# fmt: on
+
+
+def session_terms(data: Any, session: dict) -> Counter[str]:
+    """The terms of a session: the words of its title and description, its track and
+    its speakers. Tracks and speakers are a term each, so they only match exactly."""
+    translation = find_matching_id(
+        data, "sessionTranslations", session.get("id"), "session"
+    )
+    terms: Counter[str] = Counter()
+    for field, weight in [("title", TITLE_WEIGHT), ("description", 1)]:
+        for word in _WORD.findall((translation.get(field) or "").lower()):
+            if word not in STOP_WORDS and len(word) > 1:
+                terms[word] += weight
+    track = find_matching_id(
+        data, "trackTranslations", session.get("track", ""), "track"
+    ).get("title")
+    if track:
+        terms[f"track:{track.lower()}"] += 1
+    event_id = event_id_of(data)
+    for session_speaker in find_items(
+        data, "sessionSpeakers", "session", session.get("id")
+    ):
+        if is_codemash_event(session_speaker, event_id=event_id):
+            terms[f"speaker:{session_speaker.get('speaker')}"] += 1
+    return terms
+
+
+def tf_idf(documents: list[Counter[str]]) -> list[dict[str, float]]:
+    """Unit length TF-IDF vectors of `documents`, without the terms only one has.
+
+    Term frequencies are dampened (1 + log) and weighted by smoothed inverse document
+    frequencies. A term only one document has can't add to its similarity with another,
+    so it's dropped once the vector is normalized.
+    """
+    frequencies: Counter[str] = Counter()
+    for terms in documents:
+        frequencies.update(terms.keys())
+    n = len(documents)
+    idf = {
+        term: math.log((1 + n) / (1 + frequency)) + 1
+        for term, frequency in frequencies.items()
+    }
+    vectors = []
+    for terms in documents:
+        vector = {
+            term: (1 + math.log(count)) * idf[term] for term, count in terms.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append(
+            {
+                term: weight / norm
+                for term, weight in vector.items()
+                if frequencies[term] > 1
+            }
+        )
+    return vectors
+
+
+def _python_neighbors(
+    vectors: list[dict[str, float]], k: int
+) -> list[list[tuple[int, float]]]:
+    """The `k` most similar documents to each one, by walking an inverted index."""
+    postings: dict[str, list[tuple[int, float]]] = {}
+    for pos, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((pos, weight))
+    neighbors = []
+    for pos, vector in enumerate(vectors):
+        scores: dict[int, float] = {}
+        for term, weight in vector.items():
+            for other, other_weight in postings[term]:
+                scores[other] = scores.get(other, 0.0) + weight * other_weight
+        scores.pop(pos, None)
+        top = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        neighbors.append([(other, score) for other, score in top if score > 0])
+    return neighbors
+
+
+def _numpy_neighbors(
+    vectors: list[dict[str, float]], k: int
+) -> list[list[tuple[int, float]]]:
+    """The `k` most similar documents to each one, from blocks of the similarity matrix.
+
+    The vectors are the rows of a dense matrix over the terms more than one document
+    has, and each block of rows is multiplied by the whole matrix at once.
+    """
+    assert np is not None
+    columns: dict[str, int] = {}
+    for vector in vectors:
+        for term in vector:
+            columns.setdefault(term, len(columns))
+    matrix = np.zeros((len(vectors), len(columns)), dtype=np.float64)
+    for pos, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            matrix[pos, columns[term]] = weight
+
+    neighbors = []
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = matrix[start : start + BLOCK_ROWS] @ matrix.T
+        rows = np.arange(block.shape[0])
+        block[rows, rows + start] = 0
+        # the k-th highest score of each row, so ties with it are all candidates
+        kth = -np.partition(-block, min(k, block.shape[1]) - 1, axis=1)[
+            :, min(k, block.shape[1]) - 1
+        ]
+        for row, threshold in zip(block, kth):
+            candidates = np.flatnonzero((row >= threshold) & (row > 0))
+            scores = row[candidates]
+            # by score, then by position, as the python path orders them
+            order = np.lexsort((candidates, -scores))[:k]
+            neighbors.append(
+                list(zip(candidates[order].tolist(), scores[order].tolist()))
+            )
+    return neighbors
+
+
+class SimilarityIndex:
+    """The most similar sessions to each session, by the cosine of their TF-IDF vectors.
+
+    Every session's `NEIGHBORS` nearest are found once, when the index is built, with
+    numpy when it's installed and an inverted index otherwise, so a lookup only goes
+    through those. Sessions are kept by id, so the index doesn't hold on to the snapshot
+    it was built from.
+    """
+
+    def __init__(self, data: Any):
+        sessions = data.get("sessions", [])
+        self.ids = [session.get("id") for session in sessions]
+        self.positions = {session_id: pos for pos, session_id in enumerate(self.ids)}
+        # the agenda and time span of each session, None if it isn't scheduled yet
+        self.spans: list[tuple[str, int, int] | None] = []
+        for session in sessions:
+            if session.get("agenda") and session.get("startTime"):
+                start = parse_hhmm(session["startTime"])
+                end = start + int(session.get("duration", "0"))
+                self.spans.append((session["agenda"], start, end))
+            else:
+                self.spans.append(None)
+        vectors = tf_idf([session_terms(data, session) for session in sessions])
+        find = _numpy_neighbors if np is not None else _python_neighbors
+        self.neighbors = find(vectors, NEIGHBORS)
+
+    def _conflicts(self, pos: int, others: list[int]) -> bool:
+        span = self.spans[pos]
+        if span is None:
+            return False
+        agenda, start, end = span
+        for other in others:
+            other_span = self.spans[other]
+            if (
+                other_span is not None
+                and other_span[0] == agenda
+                and other_span[1] < end
+                and start < other_span[2]
+            ):
+                return True
+        return False
+
+    def similar(
+        self, session_id: str, limit: int, conflicts_with: list[str] | None = None
+    ) -> list[tuple[str, float]]:
+        """Ids and similarities of up to `limit` sessions most like `session_id`, most
+        similar first, leaving out any that overlap the sessions in `conflicts_with`."""
+        pos = self.positions.get(session_id)
+        if pos is None:
+            raise ValueError(f"Unknown session id '{session_id}'")
+        others = []
+        for other_id in conflicts_with or []:
+            other = self.positions.get(other_id)
+            if other is None:
+                raise ValueError(f"Unknown session id '{other_id}'")
+            others.append(other)
+        similar = []
+        for neighbor, score in self.neighbors[pos]:
+            if len(similar) == limit:
+                break
+            if not self._conflicts(neighbor, others):
+                similar.append((self.ids[neighbor], score))
+        return similar
+
+
+def similarity_of(data: Any) -> SimilarityIndex:
+    if isinstance(data, Snapshot):
+        return data.derived("similar_sessions", SimilarityIndex, inputs=SIMILAR_INPUTS)
+    return SimilarityIndex(data)
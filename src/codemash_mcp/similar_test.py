@@ -0,0 +1,106 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp import similar
+from codemash_mcp.codemash import CodeMashDataReader
+from codemash_mcp.schedule import parse_hhmm
+from codemash_mcp.similar import SimilarityIndex, tf_idf
+from codemash_mcp.snapshot import load_snapshot
+
+DATA_DIR = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture(scope="module")
+def reader():
+    return CodeMashDataReader(DATA_DIR / "endpoint-3.json")
+
+
+def session_id(reader, title):
+    return next(
+        session["id"]
+        for session in reader.sessions(include_descriptions=False)
+        if session["title"] == title
+    )
+
+
+def test_similar_sessions_are_most_similar_first(reader):
+    similar_sessions = reader.similar_sessions(
+        session_id(reader, "Learn to solder (Tuesday)")
+    )
+    assert [s["session"]["title"] for s in similar_sessions[:3]] == [
+        "Learn to solder (Thursday)",
+        "Learn to solder (Wednesday)",
+        "Learn to solder (Friday)",
+    ]
+    similarities = [s["similarity"] for s in similar_sessions]
+    assert similarities == sorted(similarities, reverse=True)
+    assert all(0 < similarity <= 1 for similarity in similarities)
+    assert len(similar_sessions) == 5
+
+
+def test_similar_sessions_leave_out_the_session_itself(reader):
+    for session in reader.sessions(include_descriptions=False)[:20]:
+        similar_sessions = reader.similar_sessions(session["id"], limit=10)
+        assert session["id"] not in [s["session"]["id"] for s in similar_sessions]
+
+
+def test_similar_sessions_exclude_conflicts(reader):
+    sessions = {s["id"]: s for s in reader.data["sessions"]}
+
+    def span(session):
+        start = parse_hhmm(session["startTime"])
+        return session["agenda"], start, start + int(session["duration"])
+
+    conflicts = 0
+    for session_id in list(sessions)[:40]:
+        day, start, end = span(sessions[session_id])
+        similar_ids = [
+            s["session"]["id"] for s in reader.similar_sessions(session_id, limit=10)
+        ]
+        kept_ids = [
+            s["session"]["id"]
+            for s in reader.similar_sessions(
+                session_id, exclude_conflicts_with=session_id, limit=10
+            )
+        ]
+        for other_id in similar_ids:
+            other_day, other_start, other_end = span(sessions[other_id])
+            conflict = day == other_day and other_start < end and start < other_end
+            conflicts += conflict
+            assert conflict != (other_id in kept_ids)
+    assert conflicts
+
+
+def test_similar_sessions_unknown_id(reader):
+    with pytest.raises(ValueError, match="Unknown session id 'nope'"):
+        reader.similar_sessions("nope")
+    with pytest.raises(ValueError, match="Unknown session id 'nope'"):
+        reader.similar_sessions(
+            reader.data["sessions"][0]["id"], exclude_conflicts_with=["nope"]
+        )
+
+
+def test_tf_idf_drops_terms_only_one_document_has():
+    vectors = tf_idf([Counter({"ai": 1, "rust": 2}), Counter({"ai": 1})])
+    assert vectors[0].keys() == {"ai"}
+    # normalized before the term is dropped, so it still weighs against the rest
+    assert vectors[0]["ai"] < 1
+    assert vectors[1]["ai"] == pytest.approx(1)
+
+
+def test_numpy_and_python_neighbors_are_the_same(monkeypatch):
+    pytest.importorskip("numpy")
+    data = load_snapshot(DATA_DIR / "endpoint-3.json")
+    vectorized = SimilarityIndex(data)
+    monkeypatch.setattr(similar, "np", None)
+    scanned = SimilarityIndex(data)
+    for a, b in zip(vectorized.neighbors, scanned.neighbors, strict=True):
+        assert [pos for pos, _ in a] == [pos for pos, _ in b]
+        assert [score for _, score in a] == pytest.approx([score for _, score in b])
+
+
+def test_data_without_descriptions():
+    index = SimilarityIndex(load_snapshot(DATA_DIR / "test-data.json"))
+    assert len(index.neighbors) == len(index.ids)
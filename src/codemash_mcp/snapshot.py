@@ -0,0 +1,401 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Hashable
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from pathlib import Path
+from typing import Any, TypeVar
+from zoneinfo import ZoneInfo
+
+from codemash_mcp.delta import CollectionDelta, SnapshotDelta, diff_snapshots
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Updates a derived structure for a reload's changes, returning the updated structure,
+# or None to have it rebuilt from scratch the next time it's used
+Update = Callable[[T, "Snapshot", SnapshotDelta], T | None]
+
+# The lookups the tools use on every call. `build_indexes` builds these up front so the
+# first tool calls don't pay for them.
+DEFAULT_LOOKUPS = [
+    ("eventTranslations", "event"),
+    ("hotelTranslations", "hotel"),
+    ("portals", "id"),
+    ("eventSocialHandles", "id"),
+    ("sessions", "id"),
+    ("sessionTranslations", "session"),
+    ("sessionVenues", "id"),
+    ("sessionVenueTranslations", "sessionVenue"),
+    ("speakers", "id"),
+    ("trackTranslations", "track"),
+    ("userProfiles", "id"),
+    ("venueTranslations", "venue"),
+]
+DEFAULT_GROUPS = [
+    ("sessionSpeakers", "session"),
+    ("sessionSpeakers", "speaker"),
+]
+
+# Collections every export must have for the tools to work
+REQUIRED_COLLECTIONS = [
+    "events",
+    "sessions",
+    "sessionTranslations",
+    "sessionSpeakers",
+    "speakers",
+    "userProfiles",
+]
+
+
+class Snapshot(dict):
+    """The parsed CodeMash export, plus lookup indexes over its collections.
+
+    A snapshot behaves exactly like the dictionary loaded from the export file, so the
+    helpers can take either. Indexes are built on first use and cached for the lifetime
+    of the snapshot, which is treated as read-only once loaded.
+    """
+
+    def __init__(self, data: dict, source: Path | None = None, version: str = ""):
+        super().__init__(data)
+        self.source = source
+        self.version = version
+        self._lookups: dict[tuple[str, str], dict[Hashable, dict]] = {}
+        self._groups: dict[tuple[str, str], dict[Hashable, list[dict]]] = {}
+        self._derived: dict[str, Any] = {}
+        # the inputs and update of each derived structure, for carrying it over
+        self._maintenance: dict[str, tuple[frozenset[str] | None, Update | None]] = {}
+
+    def lookup(self, list_name: str, item_key: str = "id") -> dict[Hashable, dict]:
+        """Map `item_key` values to the first item in `list_name` with that value."""
+        index = self._lookups.get((list_name, item_key))
+        if index is None:
+            index = {}
+            for item in self.get(list_name, []):
+                key = item.get(item_key)
+                if isinstance(key, Hashable):
+                    index.setdefault(key, item)
+            self._lookups[(list_name, item_key)] = index
+        return index
+
+    def group(self, list_name: str, item_key: str) -> dict[Hashable, list[dict]]:
+        """Map `item_key` values to every item in `list_name` with that value, in order."""
+        index = self._groups.get((list_name, item_key))
+        if index is None:
+            index = {}
+            for item in self.get(list_name, []):
+                key = item.get(item_key)
+                if isinstance(key, Hashable):
+                    index.setdefault(key, []).append(item)
+            self._groups[(list_name, item_key)] = index
+        return index
+
+    @cached_property
+    def event_id(self) -> str | None:
+        """The id of the event this export is for, the first in `events`."""
+        for event in self.get("events", []):
+            if event.get("id"):
+                return event["id"]
+        return None
+
+    def derived(
+        self,
+        name: str,
+        build: Callable[["Snapshot"], T],
+        inputs: Collection[str] | None = None,
+        update: Update[T] | None = None,
+    ) -> T:
+        """Return the structure `build` computes from this snapshot, building it once.
+
+        This is for indexes that are more than a lookup or group, i.e. a tool's own
+        search structures. `name` must be unique to `build`.
+
+        `inputs` are the collections `build` reads. A reload that doesn't change them
+        carries the structure over to the new snapshot as it is, so it mustn't refer to
+        the snapshot itself. When they change, `update` can bring the structure up to
+        date for just the changes, rather than it being built again. Without `inputs`,
+        any change to the export means a rebuild.
+        """
+        if name not in self._derived:
+            self._derived[name] = build(self)
+            self._maintenance[name] = (
+                frozenset(inputs) if inputs is not None else None,
+                update,
+            )
+        return self._derived[name]
+
+    def has_derived(self, name: str) -> bool:
+        """Whether the derived structure `name` has been built for this snapshot."""
+        return name in self._derived
+
+    @cached_property
+    def agenda_dates(self) -> dict[date, str]:
+        """Map each day of the event to the id of its agenda.
+
+        Agendas are numbered by `index` from the first day of the event, so the day is
+        the event's local start date plus the agenda index.
+        """
+        event = self.lookup("events").get(self.event_id)
+        start = _event_start_date(event) if event else None
+        if start is None:
+            return {}
+        dates = {}
+        for agenda in sorted(
+            self.group("agendas", "event").get(self.event_id, []),
+            key=lambda a: a.get("index", 0),
+        ):
+            dates[start + timedelta(days=agenda.get("index", 0))] = agenda["id"]
+        return dates
+
+    @cached_property
+    def agenda_days(self) -> dict[str, str]:
+        """Map day names (i.e. "MONDAY") to the agenda id for that day of the event."""
+        return {
+            day.strftime("%A").upper(): agenda
+            for day, agenda in self.agenda_dates.items()
+        }
+
+    def build_indexes(self):
+        for list_name, item_key in DEFAULT_LOOKUPS:
+            self.lookup(list_name, item_key)
+        for list_name, item_key in DEFAULT_GROUPS:
+            self.group(list_name, item_key)
+
+    def carry_over(self, previous: "Snapshot") -> SnapshotDelta:
+        """Take over what's still valid of the indexes of `previous`, the snapshot this
+        one replaces, and return what changed between them.
+
+        Collections and items that didn't change are shared with `previous` rather than
+        kept twice. Lookups and groups are patched for the items that changed, and
+        derived structures are carried over or updated as `derived` describes. What
+        can't be updated is left to be built again on first use.
+        """
+        delta = diff_snapshots(previous, self)
+        for indexes, previous_indexes, grouped in [
+            (self._lookups, previous._lookups, False),
+            (self._groups, previous._groups, True),
+        ]:
+            # copied first, calls still running on `previous` may be adding to them
+            for (list_name, item_key), index in list(previous_indexes.items()):
+                if list_name not in delta:
+                    indexes[(list_name, item_key)] = index
+                elif (changes := delta[list_name]) is not None:
+                    indexes[(list_name, item_key)] = _patched(
+                        index, self.get(list_name, []), item_key, changes, grouped
+                    )
+
+        for name, structure in list(previous._derived.items()):
+            inputs, update = previous._maintenance.get(name, (None, None))
+            if inputs is None:
+                if delta:
+                    continue
+            elif not inputs.isdisjoint(delta):
+                if update is None:
+                    continue
+                try:
+                    structure = update(structure, self, delta)
+                except Exception:
+                    logger.exception(f"Updating {name} failed, it will be rebuilt")
+                    continue
+                if structure is None:
+                    continue
+            self._derived[name] = structure
+            self._maintenance[name] = (inputs, update)
+        return delta
+
+
+def _patched(
+    index: dict,
+    items: list[dict],
+    item_key: str,
+    changes: CollectionDelta,
+    grouped: bool,
+) -> dict:
+    """A copy of a lookup or group with the entries `changes` touch built again."""
+    patched = dict(index)
+    keys = changes.keys(item_key)
+    for key in keys:
+        patched.pop(key, None)
+    if item_key == "id":
+        # ids are unique in a collection with a delta, the new items are the entries
+        for item in changes.new_items():
+            patched[item["id"]] = [item] if grouped else item
+        return patched
+    if keys:
+        for item in items:
+            try:
+                if (key := item.get(item_key)) not in keys:
+                    continue
+            except TypeError:
+                # an unhashable value, which no index has
+                continue
+            if grouped:
+                patched.setdefault(key, []).append(item)
+            else:
+                patched.setdefault(key, item)
+    return patched
+
+
+def _event_start_date(event: dict) -> date | None:
+    local = (event.get("startDateTime") or {}).get("local")
+    if local:
+        return datetime.fromisoformat(local).date()
+    start = event.get("startDate")
+    if not start:
+        return None
+    start_time = datetime.fromisoformat(start)
+    if start_time.tzinfo is not None and event.get("timezone"):
+        start_time = start_time.astimezone(ZoneInfo(event["timezone"]))
+    return start_time.date()
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate the memory used by a JSON-like object graph, in bytes."""
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple):
+            stack.extend(item)
+    return size
+
+
+class SnapshotValidationError(ValueError):
+    """Raised when an export is not usable as a snapshot."""
+
+
+def validate_snapshot(snapshot: Snapshot):
+    """Check the shape of an export before it's put into service."""
+    for name in REQUIRED_COLLECTIONS:
+        if not isinstance(snapshot.get(name), list):
+            raise SnapshotValidationError(f"missing collection '{name}'")
+    if not snapshot["events"]:
+        raise SnapshotValidationError("the export has no events")
+    for name in ["events", "sessions", "speakers"]:
+        if any(
+            not isinstance(item, dict) or "id" not in item for item in snapshot[name]
+        ):
+            raise SnapshotValidationError(f"'{name}' has a record without an id")
+
+
+def load_snapshot(path: Path) -> Snapshot:
+    """Load an export file. The version is a digest of the file contents."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    return Snapshot(json.loads(raw), source=path, version=version)
+
+
+def find_items(data: Any, list_name: str, item_key: str, value: Any) -> list[dict]:
+    """Return every item in `list_name` whose `item_key` equals `value`, in order."""
+    if isinstance(data, Snapshot) and isinstance(value, Hashable):
+        return data.group(list_name, item_key).get(value, [])
+    return [item for item in data.get(list_name, []) if item.get(item_key) == value]
+
+
+class EventSnapshots:
+    """Lazily loaded snapshots for additional events, kept within a memory budget.
+
+    A snapshot is loaded the first time its event is asked for and reloaded if its file
+    changes. When the estimated size of the loaded snapshots goes over `budget_bytes`,
+    the least recently used ones are evicted, so events nobody asks about cost nothing.
+    """
+
+    def __init__(self, files: dict[str, Path], budget_bytes: int):
+        self.files = files
+        self.budget_bytes = budget_bytes
+        # guards the loaded snapshots and counters, never held while loading one
+        self._lock = threading.Lock()
+        # one per event, so a cold load only makes calls for the same event wait
+        self._load_locks = {name: threading.Lock() for name in files}
+        self._loaded: OrderedDict[str, tuple[Snapshot, int, Any]] = OrderedDict()
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def _cached(self, name: str, signature: Any) -> Snapshot | None:
+        with self._lock:
+            entry = self._loaded.get(name)
+            if entry is not None and entry[2] == signature:
+                self._loaded.move_to_end(name)
+                self._hits += 1
+                return entry[0]
+        return None
+
+    def get(self, name: str) -> Snapshot:
+        path = self.files.get(name)
+        if path is None:
+            raise KeyError(name)
+
+        signature = _file_signature(path)
+        snapshot = self._cached(name, signature)
+        if snapshot is not None:
+            return snapshot
+        with self._load_locks[name]:
+            # loaded by another call while this one waited
+            snapshot = self._cached(name, signature)
+            if snapshot is not None:
+                return snapshot
+            snapshot = load_snapshot(path)
+            validate_snapshot(snapshot)
+            snapshot.build_indexes()
+            size = estimate_size(snapshot)
+            with self._lock:
+                self._loaded[name] = (snapshot, size, signature)
+                # a reload of a stale event would otherwise keep its old place
+                self._loaded.move_to_end(name)
+                self._loads += 1
+                self._evict(keep=name)
+            logger.info(f"Loaded event {name} from {path} ({snapshot.version})")
+            return snapshot
+
+    def _evict(self, keep: str):
+        for name in [name for name in self._loaded if name != keep]:
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            del self._loaded[name]
+            self._evictions += 1
+            logger.info(f"Evicted event {name} to stay within the memory budget")
+
+    def loaded(self) -> dict[str, Snapshot]:
+        """The snapshots loaded now, by event, least recently used first."""
+        with self._lock:
+            return {name: snapshot for name, (snapshot, _, _) in self._loaded.items()}
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(size for _, size, _ in self._loaded.values())
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "events": sorted(self.files),
+                "loaded": list(self._loaded),
+                "resident_bytes": self.resident_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self._hits,
+                "loads": self._loads,
+                "evictions": self._evictions,
+            }
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,228 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from codemash_mcp import snapshot as snapshot_module
+from codemash_mcp.snapshot import (
+    REQUIRED_COLLECTIONS,
+    EventSnapshots,
+    Snapshot,
+    SnapshotValidationError,
+    find_items,
+    load_snapshot,
+    validate_snapshot,
+)
+
+DATA = {
+    "sessions": [{"id": "s1"}, {"id": "s2"}, {"id": "s1", "dup": True}, {}],
+    "sessionSpeakers": [
+        {"session": "s1", "speaker": "sp1"},
+        {"session": "s2", "speaker": "sp1"},
+        {"session": "s1", "speaker": "sp2"},
+    ],
+}
+
+
+def test_lookup_returns_first_match():
+    snapshot = Snapshot(DATA)
+    assert snapshot.lookup("sessions")["s1"] == {"id": "s1"}
+    assert snapshot.lookup("sessions")[None] == {}
+    assert snapshot.lookup("missing") == {}
+
+
+def test_lookup_is_cached():
+    snapshot = Snapshot(DATA)
+    assert snapshot.lookup("sessions") is snapshot.lookup("sessions")
+
+
+def test_group_keeps_order():
+    snapshot = Snapshot(DATA)
+    speakers = snapshot.group("sessionSpeakers", "session")["s1"]
+    assert [s["speaker"] for s in speakers] == ["sp1", "sp2"]
+
+
+def test_find_items_matches_plain_dict():
+    snapshot = Snapshot(DATA)
+    for value in ["s1", "s2", "nope"]:
+        assert find_items(snapshot, "sessionSpeakers", "session", value) == find_items(
+            DATA, "sessionSpeakers", "session", value
+        )
+
+
+def test_load_snapshot_versions_by_content(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(DATA))
+    first = load_snapshot(path)
+    assert first == DATA
+    assert first.source == path
+    assert len(first.version) == 16
+    assert load_snapshot(path).version == first.version
+
+    path.write_text(json.dumps({"sessions": []}))
+    assert load_snapshot(path).version != first.version
+
+
+def _valid_export():
+    export = {name: [] for name in REQUIRED_COLLECTIONS}
+    export["events"] = [{"id": "e1"}]
+    export["sessions"] = [{"id": "s1"}]
+    return export
+
+
+def test_validate_snapshot_accepts_export():
+    validate_snapshot(Snapshot(_valid_export()))
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        (lambda export: export.pop("sessions"), "missing collection 'sessions'"),
+        (lambda export: export.update(speakers={}), "missing collection 'speakers'"),
+        (lambda export: export["events"].clear(), "no events"),
+        (lambda export: export["sessions"].append({}), "'sessions' has a record"),
+    ],
+)
+def test_validate_snapshot_rejects_export(change, message):
+    export = _valid_export()
+    change(export)
+    with pytest.raises(SnapshotValidationError, match=message):
+        validate_snapshot(Snapshot(export))
+
+
+def test_event_id_and_agenda_days():
+    snapshot = Snapshot(
+        {
+            "events": [
+                {
+                    "id": "e1",
+                    "startDate": "2026-01-12T13:00:00.000Z",
+                    "timezone": "America/New_York",
+                }
+            ],
+            "agendas": [
+                {"id": "a1", "index": 1, "event": "e1"},
+                {"id": "a0", "index": 0, "event": "e1"},
+                {"id": "x", "index": 2, "event": "other"},
+            ],
+        }
+    )
+    assert snapshot.event_id == "e1"
+    assert snapshot.agenda_days == {"MONDAY": "a0", "TUESDAY": "a1"}
+
+
+def test_agenda_days_prefers_local_start_date():
+    snapshot = Snapshot(
+        {
+            # 01:00 UTC on Tuesday is still Monday evening in New York
+            "events": [
+                {
+                    "id": "e1",
+                    "startDate": "2026-01-13T01:00:00.000Z",
+                    "startDateTime": {"local": "2026-01-12T20:00:00"},
+                }
+            ],
+            "agendas": [{"id": "a0", "index": 0, "event": "e1"}],
+        }
+    )
+    assert snapshot.agenda_days == {"MONDAY": "a0"}
+
+
+def test_derived_is_built_once():
+    snapshot = Snapshot(DATA)
+    calls = []
+
+    def build(s):
+        calls.append(s)
+        return len(s["sessions"])
+
+    assert not snapshot.has_derived("count")
+    assert snapshot.derived("count", build) == 4
+    assert snapshot.derived("count", build) == 4
+    assert snapshot.has_derived("count")
+    assert calls == [snapshot]
+
+
+def test_agenda_days_without_events():
+    assert Snapshot({}).event_id is None
+    assert Snapshot({}).agenda_days == {}
+
+
+def _write_event(tmp_path, name, sessions=1):
+    export = _valid_export()
+    export["sessions"] = [{"id": f"{name}-{i}"} for i in range(sessions)]
+    path = tmp_path / f"{name}.json"
+    path.write_text(json.dumps(export))
+    return path
+
+
+def test_event_snapshots_load_lazily_and_cache(tmp_path):
+    events = EventSnapshots({"a": _write_event(tmp_path, "a")}, budget_bytes=10**9)
+    assert events.stats()["loaded"] == []
+    first = events.get("a")
+    assert events.get("a") is first
+    assert events.loaded() == {"a": first}
+    assert events.stats()["loads"] == 1
+    assert events.stats()["hits"] == 1
+    with pytest.raises(KeyError):
+        events.get("missing")
+
+
+def test_event_snapshots_reload_changed_files(tmp_path):
+    path = _write_event(tmp_path, "a")
+    events = EventSnapshots({"a": path}, budget_bytes=10**9)
+    first = events.get("a")
+    _write_event(tmp_path, "a", sessions=3)
+    assert events.get("a").version != first.version
+
+
+def test_event_snapshots_evict_least_recently_used(tmp_path):
+    files = {name: _write_event(tmp_path, name, 50) for name in ["a", "b", "c"]}
+    events = EventSnapshots(files, budget_bytes=0)
+    events.get("a")
+    events.get("b")
+    # over budget, only the most recently loaded event stays
+    assert events.stats()["loaded"] == ["b"]
+    assert events.stats()["evictions"] == 1
+
+    events.budget_bytes = 10**9
+    events.get("c")
+    events.get("b")
+    assert events.stats()["loaded"] == ["c", "b"]
+
+
+def test_event_snapshots_evict_others_when_reloading_the_oldest(tmp_path):
+    files = {name: _write_event(tmp_path, name, 50) for name in ["a", "b"]}
+    events = EventSnapshots(files, budget_bytes=10**9)
+    events.get("a")
+    events.get("b")
+
+    events.budget_bytes = 0
+    _write_event(tmp_path, "a", 60)
+    events.get("a")
+    # the reloaded event is the most recently used, so the other one goes
+    assert events.stats()["loaded"] == ["a"]
+    assert events.stats()["evictions"] == 1
+
+
+def test_event_snapshots_load_events_concurrently(tmp_path, monkeypatch):
+    files = {name: _write_event(tmp_path, name) for name in ["a", "b"]}
+    events = EventSnapshots(files, budget_bytes=10**9)
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_load(path):
+        if path == files["a"]:
+            loading.set()
+            assert release.wait(5)
+        return load_snapshot(path)
+
+    monkeypatch.setattr(snapshot_module, "load_snapshot", slow_load)
+    with ThreadPoolExecutor(2) as pool:
+        a = [pool.submit(events.get, "a") for _ in range(2)]
+        assert loading.wait(5)
+        # a cold load of one event doesn't hold up the others
+        assert events.get("b").version
+        release.set()
+        assert a[0].result() is a[1].result()
+    assert events.stats()["loads"] == 2
@@ -0,0 +1,458 @@
+import copy
+import sqlite3
+import threading
+from typing import Any
+
+from codemash_mcp.delta import CollectionDelta, SnapshotDelta
+from codemash_mcp.helpers import agenda_map_of, event_id_of
+from codemash_mcp.snapshot import Snapshot
+
+# Only the columns the filters need. Lookup tables keep the first item for a key, like
+# `Snapshot.lookup`, so a join finds the same row the dictionary helpers would.
+SCHEMA = """
+CREATE TABLE sessions (
+    pos INTEGER PRIMARY KEY,
+    id TEXT,
+    agenda TEXT,
+    start_time TEXT,
+    duration INTEGER,
+    track TEXT,
+    venue TEXT
+);
+CREATE INDEX sessions_agenda ON sessions (agenda);
+CREATE INDEX sessions_track ON sessions (track);
+CREATE INDEX sessions_venue ON sessions (venue);
+CREATE TABLE sessions_by_id (id TEXT PRIMARY KEY, track TEXT) WITHOUT ROWID;
+CREATE TABLE session_venues (id TEXT PRIMARY KEY, event TEXT) WITHOUT ROWID;
+CREATE TABLE session_venue_names (venue TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;
+CREATE TABLE track_titles (
+    track TEXT PRIMARY KEY,
+    title TEXT,
+    title_lower TEXT
+) WITHOUT ROWID;
+CREATE TABLE session_speakers (
+    pos INTEGER PRIMARY KEY,
+    session TEXT,
+    speaker TEXT,
+    event TEXT
+);
+CREATE INDEX session_speakers_session ON session_speakers (session, event);
+CREATE INDEX session_speakers_speaker ON session_speakers (speaker, event);
+CREATE TABLE speakers (pos INTEGER PRIMARY KEY, id TEXT, event TEXT, user_profile TEXT);
+CREATE INDEX speakers_event ON speakers (event);
+CREATE TABLE speakers_by_id (id TEXT PRIMARY KEY, user_profile TEXT) WITHOUT ROWID;
+CREATE TABLE user_profiles (id TEXT PRIMARY KEY, search_name TEXT) WITHOUT ROWID;
+"""
+
+# The lookup tables: (table, key column, collection, item key, the row for an item)
+LOOKUP_TABLES = [
+    ("sessions_by_id", "id", "sessions", "id", lambda s: (s["id"], s.get("track"))),
+    (
+        "session_venues",
+        "id",
+        "sessionVenues",
+        "id",
+        lambda venue: (venue["id"], venue.get("event")),
+    ),
+    (
+        "session_venue_names",
+        "venue",
+        "sessionVenueTranslations",
+        "sessionVenue",
+        lambda name: (name["sessionVenue"], name.get("name")),
+    ),
+    (
+        "track_titles",
+        "track",
+        "trackTranslations",
+        "track",
+        lambda title: (
+            title["track"],
+            title.get("title"),
+            (title.get("title") or "").lower(),
+        ),
+    ),
+    (
+        "speakers_by_id",
+        "id",
+        "speakers",
+        "id",
+        lambda speaker: (speaker["id"], speaker.get("userProfile")),
+    ),
+    (
+        "user_profiles",
+        "id",
+        "userProfiles",
+        "id",
+        lambda profile: (
+            profile["id"],
+            f"{profile.get('name', '')} {profile.get('lastName', '')}".lower(),
+        ),
+    ),
+]
+# Everything the tables are loaded from. A change to the event or its agendas changes
+# what the engine filters by, so the engine is built again.
+INPUTS = [
+    "sessionSpeakers",
+    *(collection for _, _, collection, _, _ in LOOKUP_TABLES),
+]
+REBUILT_BY = ["events", "agendas"]
+# How far apart the rows of consecutive sessions and speakers are numbered when loaded
+GAP = 1 << 16
+
+
+def _session_values(session: dict) -> tuple[Any, ...]:
+    return (
+        session.get("id"),
+        session.get("agenda"),
+        session.get("startTime"),
+        int(session.get("duration", "0")),
+        session.get("track", ""),
+        session.get("venue"),
+    )
+
+
+def _speaker_values(speaker: dict) -> tuple[Any, ...]:
+    return (speaker.get("id"), speaker.get("event"), speaker.get("userProfile"))
+
+
+def _link_values(item: dict) -> tuple[Any, ...]:
+    return (item.get("session"), item.get("speaker"), item.get("event"))
+
+
+def _positions_after(
+    positions: list[int], changes: CollectionDelta, length: int
+) -> list[int] | None:
+    """The rows' positions after `changes`, for a collection now `length` items long.
+
+    Retained items keep their position, and added ones take positions spread between
+    their neighbours'. None when there's no room left between two neighbours.
+    """
+    removed = {pos for pos, _ in changes.removed}
+    added = {pos for pos, _ in changes.added}
+    retained = (
+        position for pos, position in enumerate(positions) if pos not in removed
+    )
+    after: list[int | None] = [
+        None if pos in added else next(retained) for pos in range(length)
+    ]
+    for pos, _ in changes.added:
+        if after[pos] is not None:
+            continue
+        stop = pos
+        while stop < length and after[stop] is None:
+            stop += 1
+        # added items are listed in order, so `pos` starts a run of them
+        low = after[pos - 1] if pos else None
+        high = after[stop] if stop < length else None
+        count = stop - pos + 1
+        if high is None:
+            high = (low if low is not None else 0) + count * GAP
+        if low is None:
+            low = high - count * GAP
+        step = (high - low) // count
+        if not step:
+            return None
+        for i in range(pos, stop):
+            after[i] = low + step * (i - pos + 1)
+    return after  # type: ignore[return-value]
+
+
+class SqliteEngine:
+    """An in-memory SQLite copy of a snapshot, for answering sessions and speakers
+    filters with one query each.
+
+    Rows are numbered in the order of the export, so results come back in export order
+    and map straight back to the snapshot's items. The numbers are spaced GAP apart, so
+    a reload that adds items between two others numbers them in between, rather than
+    renumbering every row after them. Names are lower-cased with Python's `str.lower`
+    when loaded, since SQLite's `lower` only folds ASCII.
+    """
+
+    def __init__(self, data: Any):
+        self._bind(
+            data,
+            [pos * GAP for pos in range(len(data.get("sessions", [])))],
+            [pos * GAP for pos in range(len(data.get("speakers", [])))],
+        )
+        # one connection, shared by the worker threads; queries take well under a
+        # millisecond, so serializing them costs less than a connection per thread
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        with self._db:
+            self._db.executescript(SCHEMA)
+            self._load(data)
+        self._db.execute("ANALYZE")
+
+    def _bind(self, data: Any, sessions: list[int], speakers: list[int]):
+        self.event_id = event_id_of(data)
+        self.agendas = agenda_map_of(data)
+        # the items by their row's position, rather than the snapshot, so an engine
+        # carried over a reload doesn't keep the old snapshot alive
+        self._sessions = dict(zip(sessions, data.get("sessions", [])))
+        self._speakers = dict(zip(speakers, data.get("speakers", [])))
+
+    def _load(self, data: Any):
+        db = self._db
+        db.executemany(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (pos, *_session_values(session))
+                for pos, session in self._sessions.items()
+            ],
+        )
+        for table, _, collection, key, row in LOOKUP_TABLES:
+            _insert(
+                db,
+                table,
+                [
+                    row(item)
+                    for item in data.get(collection, [])
+                    if item.get(key) is not None
+                ],
+                conflict="OR IGNORE",
+            )
+        db.executemany(
+            "INSERT INTO session_speakers VALUES (?, ?, ?, ?)",
+            [
+                (pos, *_link_values(item))
+                for pos, item in enumerate(data.get("sessionSpeakers", []))
+            ],
+        )
+        db.executemany(
+            "INSERT INTO speakers VALUES (?, ?, ?, ?)",
+            [
+                (pos, *_speaker_values(speaker))
+                for pos, speaker in self._speakers.items()
+            ],
+        )
+
+    def updated(self, data: Snapshot, delta: SnapshotDelta) -> "SqliteEngine | None":
+        """A copy of the engine with just the rows `delta` changed written again.
+
+        None when the changes can't be applied row by row: the event or its agendas
+        changed, a collection couldn't be matched by id, sessions or speakers were
+        reordered, or there's no room to number the added ones between their neighbours.
+        """
+        if any(name in delta for name in REBUILT_BY):
+            return None
+        if any(name in delta and delta[name] is None for name in INPUTS):
+            return None
+        numbered = []
+        for name, rows in [("sessions", self._sessions), ("speakers", self._speakers)]:
+            positions: list[int] | None = list(rows)
+            if (changes := delta.get(name)) is not None:
+                if not changes.in_order:
+                    return None
+                positions = _positions_after(
+                    positions, changes, len(data.get(name, []))
+                )
+                if positions is None:
+                    return None
+            numbered.append(positions)
+
+        engine = copy.copy(self)
+        engine._bind(data, *numbered)
+        engine._lock = threading.Lock()
+        engine._db = sqlite3.connect(":memory:", check_same_thread=False)
+        # copying the pages is much faster than loading the rows again
+        with self._lock:
+            self._db.backup(engine._db)
+        with engine._db:
+            engine._apply(data, delta, list(self._sessions), list(self._speakers))
+        return engine
+
+    def _apply(
+        self,
+        data: Snapshot,
+        delta: SnapshotDelta,
+        sessions: list[int],
+        speakers: list[int],
+    ):
+        """Write `delta` to the rows, given the old positions of sessions and speakers."""
+        db = self._db
+        numbered = list(self._sessions)
+        if (changes := delta.get("sessions")) is not None:
+            db.executemany(
+                "DELETE FROM sessions WHERE pos = ?",
+                [(sessions[pos],) for pos, _ in changes.removed],
+            )
+            db.executemany(
+                "UPDATE sessions SET id = ?, agenda = ?, start_time = ?, duration = ?,"
+                " track = ?, venue = ? WHERE pos = ?",
+                [
+                    (*_session_values(session), numbered[pos])
+                    for _, _, pos, session in changes.updated
+                ],
+            )
+            _insert(
+                db,
+                "sessions",
+                [
+                    (numbered[pos], *_session_values(session))
+                    for pos, session in changes.added
+                ],
+            )
+
+        if (changes := delta.get("speakers")) is not None:
+            numbered = list(self._speakers)
+            db.executemany(
+                "DELETE FROM speakers WHERE pos = ?",
+                [(speakers[pos],) for pos, _ in changes.removed],
+            )
+            db.executemany(
+                "UPDATE speakers SET id = ?, event = ?, user_profile = ? WHERE pos = ?",
+                [
+                    (*_speaker_values(speaker), numbered[pos])
+                    for _, _, pos, speaker in changes.updated
+                ],
+            )
+            _insert(
+                db,
+                "speakers",
+                [
+                    (numbered[pos], *_speaker_values(speaker))
+                    for pos, speaker in changes.added
+                ],
+            )
+
+        if (changes := delta.get("sessionSpeakers")) is not None:
+            # links have no key of their own, any row with the same values will do
+            db.executemany(
+                "DELETE FROM session_speakers WHERE pos = (SELECT pos FROM"
+                " session_speakers WHERE session IS ? AND speaker IS ? AND event IS ?"
+                " LIMIT 1)",
+                [_link_values(item) for item in changes.old_items()],
+            )
+            db.executemany(
+                "INSERT INTO session_speakers (session, speaker, event) VALUES (?, ?, ?)",
+                [_link_values(item) for item in changes.new_items()],
+            )
+
+        for table, column, collection, key, row in LOOKUP_TABLES:
+            if (changes := delta.get(collection)) is None:
+                continue
+            keys = changes.keys(key)
+            lookup = data.lookup(collection, key)
+            db.executemany(
+                f"DELETE FROM {table} WHERE {column} = ?", [(k,) for k in keys]
+            )
+            _insert(db, table, [row(lookup[k]) for k in keys if k in lookup])
+
+    def _positions(self, sql: str, params: list[Any]) -> list[int]:
+        with self._lock:
+            return [pos for (pos,) in self._db.execute(sql, params)]
+
+    def sessions(
+        self,
+        day_of_week: str | None = None,
+        track_name: str | None = None,
+        room_name: str | None = None,
+        speaker_name: str | None = None,
+        start_time_range: str | None = None,
+        end_time_range: str | None = None,
+        duration: int | None = None,
+    ) -> list[dict]:
+        """The sessions that pass the same filters as the sessions tool, in order."""
+        joins, where, params = [], [], []
+        if day_of_week:
+            agenda = self.agendas.get(day_of_week)
+            if agenda is None:
+                return []
+            where.append("s.agenda = ?")
+            params.append(agenda)
+        if start_time_range:
+            where.append(
+                "(s.start_time IS NULL OR s.start_time = '' OR s.start_time BETWEEN ? AND ?)"
+            )
+            params += [start_time_range, end_time_range or "2400"]
+        if duration:
+            where.append("s.duration = ?")
+            params.append(duration)
+        if room_name:
+            joins.append(
+                "JOIN session_venues v ON v.id = s.venue"
+                " LEFT JOIN session_venue_names vn ON vn.venue = s.venue"
+            )
+            where += ["v.event = ?", "coalesce(vn.name, '') = ?"]
+            params += [self.event_id, room_name]
+        if track_name:
+            joins.append("LEFT JOIN track_titles t ON t.track = s.track")
+            where.append("coalesce(t.title, '') = ?")
+            params.append(track_name)
+        if speaker_name:
+            # a speaker or profile that's missing has the name " ", as in the helpers
+            where.append(
+                "EXISTS (SELECT 1 FROM session_speakers ss"
+                " LEFT JOIN speakers_by_id sp ON sp.id = ss.speaker"
+                " LEFT JOIN user_profiles up ON up.id = sp.user_profile"
+                " WHERE ss.session = s.id AND ss.event = ?"
+                " AND instr(coalesce(up.search_name, ' '), ?) > 0)"
+            )
+            params += [self.event_id, speaker_name.lower()]
+
+        sql = "SELECT s.pos FROM sessions s " + " ".join(joins)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return [
+            self._sessions[pos]
+            for pos in self._positions(sql + " ORDER BY s.pos", params)
+        ]
+
+    def speakers(
+        self, track_name: str | None = None, speaker_name: str | None = None
+    ) -> list[dict]:
+        """The event's speakers that pass the same filters as the speakers tool."""
+        joins, where, params = [], ["sp.event = ?"], [self.event_id]
+        if speaker_name:
+            joins.append("LEFT JOIN user_profiles up ON up.id = sp.user_profile")
+            where.append("instr(coalesce(up.search_name, ' '), ?) > 0")
+            params.append(speaker_name.lower())
+        if track_name:
+            where.append(
+                "EXISTS (SELECT 1 FROM session_speakers ss"
+                " LEFT JOIN sessions_by_id s ON s.id = ss.session"
+                " LEFT JOIN track_titles t ON t.track = coalesce(s.track, '')"
+                " WHERE ss.speaker = sp.id AND ss.event = ?"
+                " AND instr(coalesce(t.title_lower, ''), ?) > 0)"
+            )
+            params += [self.event_id, track_name.lower()]
+
+        sql = (
+            "SELECT sp.pos FROM speakers sp "
+            + " ".join(joins)
+            + " WHERE "
+            + " AND ".join(where)
+            + " ORDER BY sp.pos"
+        )
+        return [self._speakers[pos] for pos in self._positions(sql, params)]
+
+    def external_bytes(self) -> int:
+        """The size of the database, which isn't in Python objects."""
+        with self._lock:
+            (pages,) = self._db.execute("PRAGMA page_count").fetchone()
+            (page_size,) = self._db.execute("PRAGMA page_size").fetchone()
+        return pages * page_size
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _insert(db: sqlite3.Connection, table: str, rows: list[tuple], conflict: str = ""):
+    if rows:
+        db.executemany(
+            f"INSERT {conflict} INTO {table} VALUES ({', '.join('?' * len(rows[0]))})",
+            rows,
+        )
+
+
+def sqlite_of(data: Any) -> SqliteEngine:
+    if isinstance(data, Snapshot):
+        return data.derived(
+            "sqlite",
+            SqliteEngine,
+            inputs=[*INPUTS, *REBUILT_BY],
+            update=lambda engine, data, delta: engine.updated(data, delta),
+        )
+    return SqliteEngine(data)
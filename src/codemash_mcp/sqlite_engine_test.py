@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from codemash_mcp.codemash import CodeMashDataReader
+
+# The reader tests, run again with the sqlite backend
+from codemash_mcp.codemash_test import (  # noqa: F401
+    test_build_schedule_filters,
+    test_build_schedule_prefers_interests,
+    test_build_schedule_without_interests_fits_most_sessions,
+    test_columnar_backend_falls_back_without_numpy,
+    test_compact_listings,
+    test_event,
+    test_event_names,
+    test_get_session_and_speaker,
+    test_hotels,
+    test_list_results_have_ids,
+    test_now_and_next,
+    test_other_event_days_come_from_its_agendas,
+    test_other_event_is_loaded_on_first_use,
+    test_rooms,
+    test_sessions,
+    test_sessions_approximate_names,
+    test_sessions_duration,
+    test_sessions_time_range,
+    test_speakers,
+    test_tracks,
+    test_unknown_event,
+    test_venue,
+)
+from codemash_mcp.helpers_test import (  # noqa: F401
+    test_speakers_filter_by_both,
+    test_speakers_filter_by_speaker_name,
+    test_speakers_filter_by_track_name,
+)
+from codemash_mcp.snapshot import load_snapshot
+from codemash_mcp.sqlite_engine import SqliteEngine, sqlite_of
+
+DATA_DIRECTORY = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture(autouse=True)
+def sqlite_backend(monkeypatch):
+    monkeypatch.setattr(CodeMashDataReader, "backend", "sqlite")
+
+
+@pytest.fixture(scope="module", params=["endpoint-1.json", "endpoint-3.json"])
+def readers(request):
+    snapshot = load_snapshot(DATA_DIRECTORY / request.param)
+    path = DATA_DIRECTORY / request.param
+    return (
+        CodeMashDataReader(path, snapshot, backend="python"),
+        CodeMashDataReader(path, snapshot, backend="sqlite"),
+    )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"day_of_week": "THURSDAY"},
+        {"day_of_week": "FRIDAY", "track_name": "AI/ML"},
+        {"room_name": "Salon A", "include_descriptions": False},
+        {"speaker_name": "an", "start_time_range": "0900", "end_time_range": "1200"},
+        {"duration": 60, "day_of_week": "WEDNESDAY"},
+        {"track_name": "AI/ML", "speaker_name": "ZZZ"},
+        {"speaker_name": "ZZZ"},
+    ],
+)
+def test_sessions_match_python_backend(readers, filters):
+    python, sqlite = readers
+    assert sqlite.sessions(**filters) == python.sessions(**filters)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"track_name": "security"},
+        {"speaker_name": "an"},
+        {"speaker_name": "an", "track_name": "web", "include_descriptions": False},
+    ],
+)
+def test_speakers_match_python_backend(readers, filters):
+    python, sqlite = readers
+    assert sqlite.speakers(**filters) == python.speakers(**filters)
+
+
+def test_unknown_day_has_no_sessions():
+    engine = SqliteEngine({"sessions": [{"id": "s1", "agenda": "a1"}]})
+    assert engine.sessions(day_of_week="SUNDAY") == []
+
+
+def test_engine_is_built_once_per_snapshot():
+    snapshot = load_snapshot(DATA_DIRECTORY / "endpoint-1.json")
+    assert sqlite_of(snapshot) is sqlite_of(snapshot)
@@ -0,0 +1,149 @@
+"""Startup timing for the MCP server.
+
+`StartupReport` records how long each phase of building the server takes. Running
+this module checks the full cold start (interpreter imports plus server build) against
+the configured budget, and exits non-zero when it's over:
+
+    python -m codemash_mcp.startup --budget-ms 3000
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Run in a fresh interpreter under `-X importtime`, prints the startup report as JSON
+_STARTUP_PROBE = """
+import json
+from codemash_mcp.server import _init_mcp_server
+print(json.dumps(_init_mcp_server().metrics.collect()["startup"]))
+"""
+
+
+class StartupReport:
+    """Times the named phases of server startup."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.phases.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+        }
+
+    def log(self, budget_ms: int | None = None):
+        logger.info(f"Server startup report: {json.dumps(self.as_dict())}")
+        if budget_ms and self.total_ms > budget_ms:
+            logger.warning(
+                f"Server startup took {self.total_ms:.0f}ms, over the {budget_ms}ms budget"
+            )
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parse the stderr output of `python -X importtime`."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        imports.append(
+            ImportTime(
+                module=stripped,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return imports
+
+
+def measure_startup() -> tuple[list[ImportTime], dict[str, Any]]:
+    """Build the server in a fresh interpreter, returning import times and the report."""
+    env = {**os.environ, "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return parse_importtime(result.stderr), report
+
+
+def main(argv: list[str] | None = None) -> int:
+    from codemash_mcp.config import Config
+
+    parser = argparse.ArgumentParser(description="Check server startup time.")
+    parser.add_argument(
+        "--budget-ms",
+        type=int,
+        default=None,
+        help="Override the configured CODEMASH_STARTUP_BUDGET_MS.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to show.")
+    args = parser.parse_args(argv)
+    budget_ms = (
+        args.budget_ms if args.budget_ms is not None else Config().startup_budget_ms  # pyright: ignore[reportCallIssue]
+    )
+
+    imports, report = measure_startup()
+    # imports run inside the "imports" phase are already counted by the report
+    import_ms = sum(i.cumulative_us for i in imports if i.depth == 0) / 1000
+    server_ms = report["total_ms"] - report["phases_ms"].get("imports", 0)
+    total_ms = import_ms + server_ms
+
+    print(f"{'phase':<24}{'ms':>10}")
+    print(f"{'imports (all)':<24}{import_ms:>10.1f}")
+    for name, ms in report["phases_ms"].items():
+        if name != "imports":
+            print(f"{name:<24}{ms:>10.1f}")
+    print(f"{'total':<24}{total_ms:>10.1f}")
+
+    print(f"\n{'slowest imports':<48}{'ms':>10}")
+    top_level = [i for i in imports if i.depth == 0]
+    for item in sorted(top_level, key=lambda i: i.cumulative_us, reverse=True)[
+        : args.top
+    ]:
+        print(f"{item.module:<48}{item.cumulative_us / 1000:>10.1f}")
+
+    if total_ms > budget_ms:
+        print(f"\nFAIL: startup took {total_ms:.0f}ms, budget is {budget_ms}ms")
+        return 1
+    print(f"\nOK: startup took {total_ms:.0f}ms, budget is {budget_ms}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
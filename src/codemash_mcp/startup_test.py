@@ -0,0 +1,53 @@
+import logging
+
+from codemash_mcp.startup import StartupReport, parse_importtime
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:        50 |         50 |     json.decoder
+import time:       100 |        150 |   json
+import time:      1000 |       1150 | codemash_mcp
+not an import time line
+"""
+
+
+class TestStartupReport:
+    def test_should_time_phases(self):
+        report = StartupReport()
+        with report.phase("config"):
+            pass
+        with report.phase("data_load"):
+            pass
+        assert list(report.phases) == ["config", "data_load"]
+        assert report.as_dict()["total_ms"] >= 0
+
+    def test_should_record_phase_that_raises(self):
+        report = StartupReport()
+        try:
+            with report.phase("data_load"):
+                raise ValueError("bad data")
+        except ValueError:
+            pass
+        assert "data_load" in report.phases
+
+    def test_should_warn_when_over_budget(self, caplog):
+        report = StartupReport()
+        report.phases = {"imports": 200.0, "data_load": 50.0}
+        with caplog.at_level(logging.WARNING, logger="codemash_mcp.startup"):
+            report.log(budget_ms=100)
+        assert "over the 100ms budget" in caplog.text
+
+
+class TestParseImporttime:
+    def test_should_parse_lines_and_depth(self):
+        imports = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [(i.module, i.depth) for i in imports] == [
+            ("_io", 1),
+            ("io", 0),
+            ("json.decoder", 2),
+            ("json", 1),
+            ("codemash_mcp", 0),
+        ]
+        assert imports[-1].self_us == 1000
+        assert imports[-1].cumulative_us == 1150
@@ -0,0 +1,169 @@
+from bisect import bisect_right
+from datetime import date, datetime
+from operator import sub
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from codemash_mcp.delta import SnapshotDelta
+from codemash_mcp.helpers import agenda_map_of, event_id_of
+from codemash_mcp.schedule import parse_hhmm
+from codemash_mcp.snapshot import Snapshot
+
+# Used when the export doesn't say where its event is
+DEFAULT_TIMEZONE = "America/New_York"
+# Sessions longer than this (workshops, all-day events) are kept aside, so one of them
+# doesn't widen the range every in progress lookup goes through
+LONG_SESSION_MINUTES = 120
+
+
+class DayTimeline:
+    """The sessions of one agenda day, ordered by start time.
+
+    Sessions that start within a window are a range of the start times. Sessions in
+    progress at a minute either started at most `max_duration` minutes before it, so
+    they're a range too, checked against their end times, or are one of the few longer
+    than `LONG_SESSION_MINUTES`, which are checked one by one. So a lookup goes through
+    at most the sessions starting in `LONG_SESSION_MINUTES` and the long ones.
+    """
+
+    def __init__(self, sessions: list[dict]):
+        entries = []
+        for session in sessions:
+            start = parse_hhmm(session["startTime"])
+            entries.append((start, start + int(session.get("duration", "0")), session))
+        entries.sort(key=lambda e: (e[0], e[1]))
+        self.starts = [start for start, _, _ in entries]
+        self.ends = [end for _, end, _ in entries]
+        self.sessions = [session for _, _, session in entries]
+        self._index_durations()
+
+    def _index_durations(self):
+        durations = list(map(sub, self.ends, self.starts))
+        # positions of the long sessions, and the longest of the others
+        self.long = [i for i, d in enumerate(durations) if d > LONG_SESSION_MINUTES]
+        self.max_duration = max(
+            (d for d in durations if d <= LONG_SESSION_MINUTES), default=0
+        )
+
+    def in_progress(self, minute: int) -> list[dict]:
+        """Sessions that have started and not yet ended at `minute`."""
+        lo = bisect_right(self.starts, minute - self.max_duration)
+        hi = bisect_right(self.starts, minute)
+        # long sessions in the range are found by it, those before it are in order first
+        earlier = [i for i in self.long if i < lo and self.ends[i] > minute]
+        return [self.sessions[i] for i in earlier] + [
+            self.sessions[i] for i in range(lo, hi) if self.ends[i] > minute
+        ]
+
+    def starting(self, minute: int, window: int) -> list[dict]:
+        """Sessions that start after `minute` and within `window` minutes of it."""
+        lo = bisect_right(self.starts, minute)
+        hi = bisect_right(self.starts, minute + window)
+        return self.sessions[lo:hi]
+
+    def updated(
+        self, removed: set[int], added: list[dict], positions: dict[int, int]
+    ) -> "DayTimeline":
+        """A copy without the sessions whose `id()` is in `removed`, and with `added`.
+
+        `positions` has the export position of every session by `id()`, which orders
+        sessions with the same start and end, as the stable sort in `__init__` does.
+        """
+        timeline = DayTimeline([])
+        for start, end, session in zip(self.starts, self.ends, self.sessions):
+            if id(session) not in removed:
+                timeline.starts.append(start)
+                timeline.ends.append(end)
+                timeline.sessions.append(session)
+        for session in added:
+            start = parse_hhmm(session["startTime"])
+            end = start + int(session.get("duration", "0"))
+            i = bisect_right(
+                range(len(timeline.sessions)),
+                (start, end, positions[id(session)]),
+                key=lambda i: (
+                    timeline.starts[i],
+                    timeline.ends[i],
+                    positions[id(timeline.sessions[i])],
+                ),
+            )
+            timeline.starts.insert(i, start)
+            timeline.ends.insert(i, end)
+            timeline.sessions.insert(i, session)
+        timeline._index_durations()
+        return timeline
+
+
+def build_timelines(data: Any) -> dict[str, DayTimeline]:
+    """Build a timeline for every agenda day, keyed by agenda id."""
+    by_agenda: dict[str, list[dict]] = {}
+    for session in data.get("sessions", []):
+        if session.get("agenda") and session.get("startTime"):
+            by_agenda.setdefault(session["agenda"], []).append(session)
+    return {agenda: DayTimeline(sessions) for agenda, sessions in by_agenda.items()}
+
+
+def update_timelines(
+    timelines: dict[str, DayTimeline], data: Any, delta: SnapshotDelta
+) -> dict[str, DayTimeline] | None:
+    """Update the timelines of just the days with sessions that changed."""
+    changes = delta["sessions"]
+    if changes is None or not changes.in_order:
+        return None
+    removed = {id(session) for session in changes.old_items()}
+    added: dict[str, list[dict]] = {}
+    for session in changes.new_items():
+        if session.get("agenda") and session.get("startTime"):
+            added.setdefault(session["agenda"], []).append(session)
+    positions = {id(session): pos for pos, session in enumerate(data["sessions"])}
+
+    updated = dict(timelines)
+    for agenda in changes.keys("agenda"):
+        timeline = updated.pop(agenda, DayTimeline([]))
+        timeline = timeline.updated(removed, added.get(agenda, []), positions)
+        if timeline.sessions:
+            updated[agenda] = timeline
+    return updated
+
+
+def timelines_of(data: Any) -> dict[str, DayTimeline]:
+    if isinstance(data, Snapshot):
+        return data.derived(
+            "timelines", build_timelines, inputs=["sessions"], update=update_timelines
+        )
+    return build_timelines(data)
+
+
+def event_timezone(data: Any) -> ZoneInfo:
+    event_id = event_id_of(data)
+    for event in data.get("events", []):
+        if event.get("id") == event_id and event.get("timezone"):
+            return ZoneInfo(event["timezone"])
+    return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def agenda_for_date(data: Any, day: date) -> str | None:
+    """The id of the agenda for `day`, or None if the event isn't on that day."""
+    if isinstance(data, Snapshot) and data.agenda_dates:
+        return data.agenda_dates.get(day)
+    # exports without agendas only tell us the weekday
+    return agenda_map_of(data).get(day.strftime("%A").upper())
+
+
+def local_time(data: Any, at: str | None = None) -> datetime:
+    """Parse an ISO 8601 timestamp into the event's timezone, defaulting to now.
+
+    Timestamps without an offset are taken to be in the event's timezone already.
+    """
+    timezone = event_timezone(data)
+    if not at:
+        return datetime.now(timezone)
+    try:
+        moment = datetime.fromisoformat(at)
+    except ValueError as e:
+        raise ValueError(
+            f"'{at}' is not an ISO 8601 timestamp, i.e. 2026-01-15T10:30"
+        ) from e
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone)
+    return moment.astimezone(timezone)
@@ -0,0 +1,93 @@
+import random
+from datetime import date
+
+import pytest
+
+from codemash_mcp.snapshot import Snapshot
+from codemash_mcp.timeline import (
+    DayTimeline,
+    agenda_for_date,
+    local_time,
+    timelines_of,
+)
+
+
+def make_session(i: int, start: int, duration: int) -> dict:
+    return {
+        "id": f"s{i}",
+        "startTime": f"{start // 60:02d}{start % 60:02d}",
+        "duration": str(duration),
+        "agenda": "a1",
+    }
+
+
+def test_timeline_matches_scan():
+    rng = random.Random(2026)
+    sessions = [
+        make_session(i, rng.randrange(480, 1080, 15), rng.choice([15, 30, 60, 240]))
+        for i in range(60)
+    ]
+    timeline = DayTimeline(sessions)
+
+    def span(session):
+        start = int(session["startTime"][:2]) * 60 + int(session["startTime"][2:])
+        return start, start + int(session["duration"])
+
+    for minute in range(420, 1380, 7):
+        in_progress = [s for s in sessions if span(s)[0] <= minute < span(s)[1]]
+        starting = [s for s in sessions if minute < span(s)[0] <= minute + 30]
+        assert sorted(s["id"] for s in timeline.in_progress(minute)) == sorted(
+            s["id"] for s in in_progress
+        )
+        assert sorted(s["id"] for s in timeline.starting(minute, 30)) == sorted(
+            s["id"] for s in starting
+        )
+
+
+def test_long_sessions_do_not_widen_the_scan():
+    sessions = [make_session(0, 480, 600)] + [
+        make_session(i, 480 + 60 * i, 60) for i in range(1, 10)
+    ]
+    timeline = DayTimeline(sessions)
+    assert timeline.max_duration == 60
+    assert [timeline.sessions[i]["id"] for i in timeline.long] == ["s0"]
+    # in timeline order, the long session first as it started first
+    assert [s["id"] for s in timeline.in_progress(750)] == ["s0", "s4"]
+
+
+def test_empty_timeline():
+    timeline = DayTimeline([])
+    assert timeline.in_progress(600) == []
+    assert timeline.starting(600, 30) == []
+
+
+def test_timelines_are_built_once_per_snapshot():
+    snapshot = Snapshot({"sessions": [make_session(1, 540, 60), {"id": "no-time"}]})
+    timelines = timelines_of(snapshot)
+    assert list(timelines) == ["a1"]
+    assert timelines_of(snapshot) is timelines
+
+
+def test_local_time():
+    data = Snapshot({"events": [{"id": "e1", "timezone": "America/Chicago"}]})
+    assert local_time(data, "2026-01-15T10:30").isoformat() == (
+        "2026-01-15T10:30:00-06:00"
+    )
+    assert local_time(data, "2026-01-15T16:30Z").isoformat() == (
+        "2026-01-15T10:30:00-06:00"
+    )
+    assert local_time(data).utcoffset() is not None
+    with pytest.raises(ValueError):
+        local_time(data, "tomorrow")
+
+
+def test_agenda_for_date():
+    snapshot = Snapshot(
+        {
+            "events": [{"id": "e1", "startDate": "2026-01-12"}],
+            "agendas": [{"id": "a1", "index": 1, "event": "e1"}],
+        }
+    )
+    assert agenda_for_date(snapshot, date(2026, 1, 13)) == "a1"
+    # a Tuesday, but not in the event's week
+    assert agenda_for_date(snapshot, date(2026, 1, 20)) is None
@@ -1,4 +1,4 @@
-from typing import Literal, TypedDict
+from typing import Annotated, Literal, Required, TypedDict
 
 
 class Event(TypedDict, total=False):
@@ -24,6 +24,7 @@ class Hotel(TypedDict, total=False):
 
 
 class SpeakerSession(TypedDict, total=False):
+    id: str
     title: str
     description: str
     type: str
@@ -34,6 +35,7 @@ class SpeakerSession(TypedDict, total=False):
 
 
 class Speaker(TypedDict, total=False):
+    id: str
     name: str
     last_name: str
     company: str | None
@@ -45,11 +47,13 @@ class Speaker(TypedDict, total=False):
 
 
 class SessionSpeaker(TypedDict, total=False):
+    id: str
     name: str
     last_name: str
 
 
 class Session(TypedDict, total=False):
+    id: str
     title: str
     description: str | None
     type: str
@@ -60,10 +64,92 @@ class Session(TypedDict, total=False):
     speakers: list[SessionSpeaker]
 
 
+class ScheduleSlot(TypedDict, total=False):
+    session: Session
+    score: float
+    alternates: list[Session]
+
+
+class SimilarSession(TypedDict, total=False):
+    session: Session
+    similarity: float
+
+
+class ScheduleDay(TypedDict, total=False):
+    day: str
+    total_score: float
+    slots: list[ScheduleSlot]
+
+
+class RoomNowAndNext(TypedDict, total=False):
+    room: str
+    in_progress: list[Session]
+    up_next: list[Session]
+
+
+class NowAndNext(TypedDict, total=False):
+    at: str
+    day: str
+    rooms: list[RoomNowAndNext]
+
+
+class SessionFacets(TypedDict, total=False):
+    total: int
+    day: dict[str, int]
+    track: dict[str, int]
+    room: dict[str, int]
+    type: dict[str, int]
+    duration: dict[str, int]
+
+
+class SessionChanges(TypedDict, total=False):
+    added: list[Session]
+    modified: list[Session]
+    removed: list[str]
+
+
+class SpeakerChanges(TypedDict, total=False):
+    added: list[Speaker]
+    modified: list[Speaker]
+    removed: list[str]
+
+
+class Changes(TypedDict, total=False):
+    since: str
+    version: str
+    full_refresh: bool
+    sessions: SessionChanges
+    speakers: SpeakerChanges
+
+
 class Track(TypedDict, total=False):
     name: str
 
 
+class Sponsor(TypedDict, total=False):
+    id: str
+    company: Required[str]
+    sponsorship: Required[str]
+    website: str
+    description: str | None
+    booth: str | None
+
+
+class BoothFacility(TypedDict, total=False):
+    name: str
+    count: int
+
+
+class ExpoBooth(TypedDict, total=False):
+    id: str
+    name: Required[str]
+    price: float
+    size: str
+    sold_out: bool
+    sponsorship: str | None
+    includes: list[BoothFacility]
+
+
 class Venue(TypedDict, total=False):
     name: str
     street: str
@@ -76,3 +162,11 @@ class Venue(TypedDict, total=False):
 
 
 ConferenceDay = Literal["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+
+SessionDuration = Literal[30, 60, 90, 115, 120, 125, 145, 180, 210, 235, 240, 265, 295]
+
+
+EventName = Annotated[
+    str | None,
+    "The event to query, one of the names from the event_names tool. Defaults to CodeMash 2026.",
+]
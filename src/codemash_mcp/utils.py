@@ -1,14 +1,44 @@
+import atexit
+import copy
+import itertools
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-from fastmcp import FastMCP
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+    from codemash_mcp.lifecycle import SnapshotLifecycle
+    from codemash_mcp.metrics import MetricsRegistry
+    from codemash_mcp.ratelimit import RateLimiter
 
 
 class McpRunner:
-    def __init__(self, mcp: FastMCP):
+    def __init__(
+        self,
+        mcp: "FastMCP",
+        metrics: "MetricsRegistry | None" = None,
+        lifecycle: "SnapshotLifecycle | None" = None,
+        compression_min_bytes: int | None = None,
+        rate_limiter: "RateLimiter | None" = None,
+        max_sessions: int | None = None,
+        session_idle_timeout: float | None = None,
+        stateless: bool = False,
+    ):
         self._mcp = mcp
+        self.metrics = metrics
+        self.lifecycle = lifecycle
+        self.compression_min_bytes = compression_min_bytes
+        self.rate_limiter = rate_limiter
+        self.max_sessions = max_sessions
+        self.session_idle_timeout = session_idle_timeout
+        self.stateless = stateless
 
     def test(self):
         return self._mcp
@@ -17,12 +47,67 @@ class McpRunner:
         self._mcp.run(transport="streamable-http")
 
     def host(self):
-        return self._mcp.http_app(transport="streamable-http")
+        if self.stateless:
+            # a fresh transport per request, so no session state to bound
+            app = self._mcp.http_app(transport="streamable-http", stateless_http=True)
+        else:
+            app = self._mcp.http_app(transport="streamable-http")
+        from codemash_mcp.sessions import SharedSseShutdownMiddleware, install_reaper
+
+        # without this every tool result leaves a task behind, see the middleware
+        app.add_middleware(SharedSseShutdownMiddleware)
+        if not self.stateless and (
+            self.max_sessions is not None or self.session_idle_timeout is not None
+        ):
+            reaper = install_reaper(app, self.max_sessions, self.session_idle_timeout)
+            if reaper is not None and self.metrics is not None:
+                self.metrics.register("sessions", reaper.stats)
+        if self.compression_min_bytes is not None:
+            from codemash_mcp.compression import CompressionMiddleware, CompressionStats
+
+            stats = CompressionStats()
+            app.add_middleware(
+                CompressionMiddleware,
+                minimum_size=self.compression_min_bytes,
+                stats=stats,
+            )
+            if self.metrics is not None:
+                self.metrics.register("compression", stats.as_dict)
+        if self.rate_limiter is not None:
+            from codemash_mcp.ratelimit import RateLimitMiddleware
+            from codemash_mcp.sessions import live_sessions
+
+            # added last so it's outermost, rejecting before anything else does work
+            app.add_middleware(
+                RateLimitMiddleware,
+                limiter=self.rate_limiter,
+                sessions=live_sessions(app),
+            )
+            if self.metrics is not None:
+                self.metrics.register("rate_limit", self.rate_limiter.as_dict)
+        return app
+
+
+def _fast_json_encoder() -> Callable[[Any], str]:
+    """Return the fastest available JSON encoder, `orjson` if it's installed."""
+    try:
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        def encode(obj: Any) -> str:
+            return orjson.dumps(obj, default=str).decode("utf-8")
+
+        return encode
+    except ImportError:
+        return json.JSONEncoder(default=str).encode
 
 
 class JsonFormatter(logging.Formatter):
     converter = time.gmtime
 
+    def __init__(self, *args, encoder: Callable[[Any], str] = json.dumps, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encode = encoder
+
     def format(self, record):
         log_record = {
             "timestamp": self.formatTime(record),
@@ -35,7 +120,153 @@ class JsonFormatter(logging.Formatter):
 
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_record)
+        elif record.exc_text:
+            # rendered by DroppingQueueHandler before the record was queued
+            log_record["exception"] = record.exc_text
+        return self._encode(log_record)
+
+
+# Renders exceptions for queued records, which can't carry their traceback across
+_exception_formatter = logging.Formatter()
+
+
+def _parse_logger_settings(value: str | None) -> dict[str, float]:
+    """Parse settings like `httpx=0.1,fakeredis=0` into a logger name -> number map."""
+    settings = {}
+    for item in (value or "").split(","):
+        name, sep, number = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        settings[name.strip()] = float(number)
+    return settings
+
+
+def _match_logger(name: str, settings: dict[str, Any]) -> str | None:
+    """Find the most specific configured logger that `name` belongs to."""
+    while True:
+        if name in settings:
+            return name
+        if "." not in name:
+            return None
+        name = name.rsplit(".", 1)[0]
+
+
+class SamplingFilter(logging.Filter):
+    """Thin out chatty debug loggers before their records reach the log queue.
+
+    `sampling` maps a logger name to the fraction of its DEBUG records to keep, and
+    `rate_limits` maps a logger name to the most DEBUG records per second to keep. Both
+    apply to child loggers too. INFO and above always pass.
+    """
+
+    def __init__(
+        self,
+        sampling: dict[str, float] | None = None,
+        rate_limits: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.sampling = sampling or {}
+        self.rate_limits = rate_limits or {}
+        self._clock = clock
+        self._counters: dict[str, itertools.count] = {}
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def _sampled(self, name: str) -> bool:
+        rate = self.sampling[name]
+        if rate <= 0:
+            return False
+        if rate >= 1:
+            return True
+        counter = self._counters.setdefault(name, itertools.count())
+        every = round(1 / rate)
+        return next(counter) % every == 0
+
+    def _within_rate(self, name: str) -> bool:
+        limit = self.rate_limits[name]
+        second = int(self._clock())
+        window, seen = self._windows.get(name, (second, 0))
+        if window != second:
+            window, seen = second, 0
+        self._windows[name] = (window, seen + 1)
+        return seen < limit
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO:
+            return True
+
+        with self._lock:
+            sampled = _match_logger(record.name, self.sampling)
+            if sampled is not None and not self._sampled(sampled):
+                self.sampled_out += 1
+                return False
+
+            limited = _match_logger(record.name, self.rate_limits)
+            if limited is not None and not self._within_rate(limited):
+                self.rate_limited += 1
+                return False
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler that never blocks the thread that is logging.
+
+    A record's message is merged with its arguments and its exception rendered to text
+    before it's queued, as the arguments may change once the call returns, and the rest
+    is formatted by the listener thread. When the queue is full the record is dropped
+    and counted instead.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # a copy, as other handlers may still format the record from its arguments
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+_log_listener: logging.handlers.QueueListener | None = None
+_log_handler: DroppingQueueHandler | None = None
+_log_filter: SamplingFilter | None = None
+
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def logging_stats() -> dict[str, Any]:
+    """Counters for the logging pipeline, suitable for the metrics registry."""
+    if _log_handler is None or _log_filter is None:
+        return {"pipeline": "sync"}
+    log_queue = _log_handler.queue
+    return {
+        "pipeline": "queue",
+        "queued": log_queue.qsize() if isinstance(log_queue, queue.Queue) else 0,
+        "dropped": _log_handler.dropped,
+        "sampled_out": _log_filter.sampled_out,
+        "rate_limited": _log_filter.rate_limited,
+    }
 
 
 # This is all to force FastMCP to log as JSON
@@ -44,7 +275,12 @@ class JsonFormatter(logging.Formatter):
 # for what FastMCP does to set up its logging. If that changes, then we might need to
 # adapt this strategy for overriding it.
 #
+# Log records are put on a bounded queue and formatted & written by a background
+# thread, so request threads never wait on log I/O. Set LOG_PIPELINE=sync to log
+# directly from the calling thread instead.
+#
 def _force_json_logging():
+    global _log_handler, _log_filter, _log_listener
     default_log_level = os.environ.get("LOG_LEVEL", "DEBUG")
 
     """Force all loggers to use JSON formatting"""
@@ -52,11 +288,32 @@ def _force_json_logging():
 
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_log_listener()
 
     root_logger.setLevel(default_log_level)
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(JsonFormatter())
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(JsonFormatter(encoder=_fast_json_encoder()))
+
+    if os.environ.get("LOG_PIPELINE", "queue") == "sync":
+        _log_handler = _log_filter = None
+        root_logger.addHandler(console_handler)
+    else:
+        _log_filter = SamplingFilter(
+            sampling=_parse_logger_settings(os.environ.get("LOG_SAMPLING")),
+            rate_limits=_parse_logger_settings(os.environ.get("LOG_RATE_LIMITS")),
+        )
+        _log_handler = DroppingQueueHandler(
+            queue.Queue(maxsize=int(os.environ.get("LOG_QUEUE_SIZE", "10000")))
+        )
+        _log_handler.addFilter(_log_filter)
+        root_logger.addHandler(_log_handler)
+
+        _log_listener = logging.handlers.QueueListener(
+            _log_handler.queue, console_handler
+        )
+        _log_listener.start()
+        atexit.unregister(_stop_log_listener)
+        atexit.register(_stop_log_listener)
 
     # Reconfigure all existing loggers
     for logger in logging.getLogger().manager.loggerDict.values():
@@ -1,7 +1,21 @@
+import json
+import logging
+import queue
+import sys
 from logging import LogRecord
 from unittest.mock import Mock, patch
 
-from codemash_mcp.utils import JsonFormatter, McpRunner
+from codemash_mcp.metrics import MetricsRegistry
+from codemash_mcp.ratelimit import RateLimiter
+from codemash_mcp.sessions import SharedSseShutdownMiddleware
+from codemash_mcp.utils import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    McpRunner,
+    SamplingFilter,
+    _fast_json_encoder,
+    _parse_logger_settings,
+)
 
 
 class TestJsonFormatter:
@@ -74,3 +88,123 @@ class TestMcpRunner:
         runner.host()
 
         mock_fastmcp.http_app.assert_called_once_with(transport="streamable-http")
+        mock_fastmcp.http_app.return_value.add_middleware.assert_called_once_with(
+            SharedSseShutdownMiddleware
+        )
+
+    def test_host_should_add_compression(self):
+        mock_fastmcp = Mock()
+        metrics = MetricsRegistry()
+
+        add_middleware = mock_fastmcp.http_app.return_value.add_middleware
+
+        runner = McpRunner(mock_fastmcp, metrics=metrics, compression_min_bytes=512)
+        runner.host()
+
+        assert add_middleware.call_count == 2
+        assert add_middleware.call_args.kwargs["minimum_size"] == 512
+        assert metrics.collect()["compression"]["compressed"] == 0
+
+    def test_host_should_add_rate_limiting(self):
+        mock_fastmcp = Mock()
+        metrics = MetricsRegistry()
+        limiter = RateLimiter(rate=5, burst=60)
+
+        app = mock_fastmcp.http_app.return_value
+        app.routes = []
+
+        runner = McpRunner(mock_fastmcp, metrics=metrics, rate_limiter=limiter)
+        runner.host()
+
+        assert app.add_middleware.call_count == 2
+        assert app.add_middleware.call_args.kwargs["limiter"] is limiter
+        # without a session manager every client is told apart by address
+        assert app.add_middleware.call_args.kwargs["sessions"] is None
+        assert metrics.collect()["rate_limit"]["admitted"] == 0
+
+
+def _make_record(name="test-name", level=logging.DEBUG):
+    return LogRecord(name, level, "test-path", 123, "foo", (), None, None, None)
+
+
+class TestJsonFormatterEncoder:
+    def test_should_use_custom_encoder(self):
+        f = JsonFormatter(encoder=lambda obj: f"encoded:{obj['message']}")
+        assert f.format(_make_record()) == "encoded:foo"
+
+    def test_fast_encoder_should_produce_json(self):
+        encode = _fast_json_encoder()
+        assert json.loads(encode({"a": [1, "b"]})) == {"a": [1, "b"]}
+
+
+class TestParseLoggerSettings:
+    def test_should_parse_settings(self):
+        assert _parse_logger_settings("httpx=0.1, fakeredis=0,bad,=3") == {
+            "httpx": 0.1,
+            "fakeredis": 0.0,
+        }
+
+    def test_should_handle_missing_settings(self):
+        assert _parse_logger_settings(None) == {}
+
+
+class TestSamplingFilter:
+    def test_should_keep_info_and_above(self):
+        f = SamplingFilter(sampling={"noisy": 0})
+        assert f.filter(_make_record("noisy", logging.INFO))
+        assert f.sampled_out == 0
+
+    def test_should_sample_debug_records_of_child_loggers(self):
+        f = SamplingFilter(sampling={"noisy": 0.25})
+        kept = [f.filter(_make_record("noisy.child")) for _ in range(8)]
+        assert kept.count(True) == 2
+        assert f.sampled_out == 6
+        assert f.filter(_make_record("quiet"))
+
+    def test_should_rate_limit_debug_records(self):
+        now = [100.0]
+        f = SamplingFilter(rate_limits={"noisy": 2}, clock=lambda: now[0])
+        assert [f.filter(_make_record("noisy")) for _ in range(3)] == [
+            True,
+            True,
+            False,
+        ]
+        now[0] = 101.0
+        assert f.filter(_make_record("noisy"))
+        assert f.rate_limited == 1
+
+
+class TestDroppingQueueHandler:
+    def test_should_drop_when_queue_is_full(self):
+        log_queue: queue.Queue = queue.Queue(maxsize=1)
+        handler = DroppingQueueHandler(log_queue)
+        record = _make_record()
+        handler.handle(record)
+        handler.handle(_make_record())
+        assert handler.dropped == 1
+        assert log_queue.get_nowait().getMessage() == record.getMessage()
+
+    def test_should_merge_arguments_before_queueing(self):
+        log_queue: queue.Queue = queue.Queue()
+        handler = DroppingQueueHandler(log_queue)
+        versions = ["v1"]
+        handler.handle(
+            LogRecord(
+                "test-name", logging.WARNING, "", 1, "versions %s", (versions,), None
+            )
+        )
+        versions.append("v2")
+        try:
+            raise KeyError("id")
+        except KeyError:
+            exc_info = sys.exc_info()
+        handler.handle(
+            LogRecord("test-name", logging.ERROR, "", 1, "failed", (), exc_info)
+        )
+
+        queued = log_queue.get_nowait()
+        assert queued.getMessage() == "versions ['v1']"
+        assert queued.args is None
+        failed = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert failed["message"] == "failed"
+        assert "KeyError: 'id'" in failed["exception"]